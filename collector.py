@@ -3,172 +3,49 @@ from __future__ import annotations
 
 import os
 import time
+import argparse
 import shutil
+import asyncio
 import pathlib
+import functools
+import httpx
 import yaml
 from dotenv import load_dotenv
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 from datetime import datetime, timezone
-from storage.classifier import classify_job, enrich_location, normalize_contract_type
-
-# --- Imports fetchers
-from fetchers.workday import fetch as fetch_workday
-from fetchers.sg_proxy import fetch as fetch_sg
-from fetchers.bnp_paribas import fetch as fetch_bnp
-from fetchers.credit_agricole import fetch as fetch_ca
-from fetchers.bpce import fetch as fetch_bpce
-from fetchers.edr import fetch as fetch_edr
-from fetchers.hsbc import fetch as fetch_hsbc
-from fetchers.ubs import fetch as fetch_ubs
-from fetchers.rbc import fetch as fetch_rbc
-from fetchers.cic import fetch as fetch_cic
-from fetchers.kepler_cheuvreux import fetch as fetch_kc
-from fetchers.oddo_bhf import fetch as fetch_oddo
-from fetchers.ing import fetch as fetch_ing
-from fetchers.barclays import fetch as fetch_barclays
-from fetchers.morgan_stanley_eightfold import fetch as fetch_ms_eightfold
-from fetchers.morgan_stanley_students import fetch as fetch_ms_students
-from fetchers.citi import fetch as fetch_citi
-from fetchers.bofa_main import fetch as fetch_bofa_main
-from fetchers.bofa_students import fetch as fetch_bofa_students
-from fetchers.unicredit import fetch as fetch_unicredit
-from fetchers.rabobank import fetch as fetch_rabobank
-from fetchers.wellsfargo import fetch as fetch_wellsfargo
-from fetchers.blackrock import fetch as fetch_blackrock
-from fetchers.pictet import fetch as fetch_pictet
-from fetchers.goldmansachs import fetch as fetch_goldmansachs
-from fetchers.glencore import fetch as fetch_glencore
-from fetchers.jefferies import fetch as fetch_jefferies
-from fetchers.adm import fetch as fetch_adm
-from fetchers.ag2r import fetch as fetch_ag2r
-from fetchers.alantra import fetch as fetch_alantra
-from fetchers.amundi import fetch as fetch_amundi
-from fetchers.axaim import fetch as fetch_axaim
-from fetchers.berenberg import fetch as fetch_berenberg
-from fetchers.bgcpartners import fetch as fetch_bgcpartners
-from fetchers.bloomberg import fetch as fetch_bloomberg
-from fetchers.bptrading import fetch as fetch_bptrading
-from fetchers.bryangarnier import fetch as fetch_bryangarnier
-from fetchers.bunge import fetch as fetch_bunge
-from fetchers.caixabank import fetch as fetch_caixabank
-from fetchers.cargill import fetch as fetch_cargill
-from fetchers.dnca import fetch as fetch_dnca
-from fetchers.dzbank import fetch as fetch_dzbank
-from fetchers.engiegm import fetch as fetch_engiegm
-from fetchers.euronext import fetch as fetch_euronext
-from fetchers.fidelity import fetch as fetch_fidelity
-from fetchers.flowtraders import fetch as fetch_flowtraders
-from fetchers.generali import fetch as fetch_generali
-from fetchers.icbc import fetch as fetch_icbc
-from fetchers.imc import fetch as fetch_imc
-from fetchers.intesasanpaolo import fetch as fetch_intesasanpaolo
-from fetchers.janestreet import fetch as fetch_janestreet
-from fetchers.jpmorgan import fetch as fetch_jpmorgan
-from fetchers.kfw import fetch as fetch_kfw
-from fetchers.lbp import fetch as fetch_lbp
-from fetchers.lfde import fetch as fetch_lfde
-from fetchers.ldc import fetch as fetch_ldc
-from fetchers.marex import fetch as fetch_marex
-from fetchers.mirabaud import fetch as fetch_mirabaud
-from fetchers.mizuho import fetch as fetch_mizuho
-from fetchers.nomura import fetch as fetch_nomura
-from fetchers.optiver import fetch as fetch_optiver
-from fetchers.sanofi import fetch as fetch_sanofi
-from fetchers.scor import fetch as fetch_scor
-from fetchers.six import fetch as fetch_six
-from fetchers.smbc import fetch as fetch_smbc
-from fetchers.standardchartered import fetch as fetch_standardchartered
-from fetchers.stifel import fetch as fetch_stifel
-from fetchers.susq import fetch as fetch_susq
-from fetchers.sycomore import fetch as fetch_sycomore
-from fetchers.totale import fetch as fetch_totale
-from fetchers.vitol import fetch as fetch_vitol
+
+# --- Fetchers : import paresseux, seuls les types présents dans config.yaml sont chargés
+from fetchers import registry
+from fetchers.http_pool import new_async_client
+from fetchers import rate_limit
 
 # --- Storage / Notif
 from storage.sqlite_repo import (
-    is_new,
-    is_new_by_link,
-    save_job,
+    save_jobs,
+    mark_closed,
+    close_db,
     init_db,
     delete_old_jobs,
+    seen_jobs,
+    get_task_durations,
+    save_task_durations,
 )
+from storage.export import export_read_replica
+from storage import delta_log
 from notifiers.discord_embed import send as notify_discord
 
-# --- Registry des fetchers
-FETCHERS = {
-    "workday": fetch_workday,
-    "sg_proxy": fetch_sg,
-    "bnp_paribas": fetch_bnp,
-    "credit_agricole": fetch_ca,
-    "bpce": fetch_bpce,
-    "edr": fetch_edr,
-    "hsbc": fetch_hsbc,
-    "ubs": fetch_ubs,
-    "rbc": fetch_rbc,
-    "cic": fetch_cic,
-    "kc": fetch_kc,
-    "oddo": fetch_oddo,
-    "ing": fetch_ing,
-    "barclays": fetch_barclays,
-    "ms_eightfold": fetch_ms_eightfold,
-    "ms_students": fetch_ms_students,
-    "citi": fetch_citi,
-    "bofa_main": fetch_bofa_main,
-    "bofa_students": fetch_bofa_students,
-    "unicredit": fetch_unicredit,
-    "rabobank": fetch_rabobank,
-    "wellsfargo": fetch_wellsfargo,
-    "blackrock": fetch_blackrock,
-    "pictet": fetch_pictet,
-    "goldmansachs": fetch_goldmansachs,
-    "glencore": fetch_glencore,
-    "jefferies": fetch_jefferies,
-    "adm": fetch_adm,
-    "ag2r": fetch_ag2r,
-    "alantra": fetch_alantra,
-    "amundi": fetch_amundi,
-    "axaim": fetch_axaim,
-    "berenberg": fetch_berenberg,
-    "bgcpartners": fetch_bgcpartners,
-    "bloomberg": fetch_bloomberg,
-    "bptrading": fetch_bptrading,
-    "bryangarnier": fetch_bryangarnier,
-    "bunge": fetch_bunge,
-    "caixabank": fetch_caixabank,
-    "cargill": fetch_cargill,
-    "dnca": fetch_dnca,
-    "dzbank": fetch_dzbank,
-    "engiegm": fetch_engiegm,
-    "euronext": fetch_euronext,
-    "fidelity": fetch_fidelity,
-    "flowtraders": fetch_flowtraders,
-    "generali": fetch_generali,
-    "icbc": fetch_icbc,
-    "imc": fetch_imc,
-    "intesasanpaolo": fetch_intesasanpaolo,
-    "janestreet": fetch_janestreet,
-    "jpmorgan": fetch_jpmorgan,
-    "kfw": fetch_kfw,
-    "lbp": fetch_lbp,
-    "lfde": fetch_lfde,
-    "ldc": fetch_ldc,
-    "marex": fetch_marex,
-    "mirabaud": fetch_mirabaud,
-    "mizuho": fetch_mizuho,
-    "nomura": fetch_nomura,
-    "optiver": fetch_optiver,
-    "sanofi": fetch_sanofi,
-    "scor": fetch_scor,
-    "six": fetch_six,
-    "smbc": fetch_smbc,
-    "standardchartered": fetch_standardchartered,
-    "stifel": fetch_stifel,
-    "susq": fetch_susq,
-    "sycomore": fetch_sycomore,
-    "totale": fetch_totale,
-    "vitol": fetch_vitol,
-}
+# Plafond de connexions du client HTTP partagé (toutes sources confondues)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+# File entre fetchers et écriture SQLite (résultats de tâches en attente) et taille des lots écrits
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "16"))
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "200"))
+# Échéance du run (secondes) : au-delà, plus aucune tâche ne démarre et celles en cours sont abandonnées
+RUN_DEADLINE_SECONDS = float(os.getenv("RUN_DEADLINE_SECONDS", "600"))
+# Budget d'une tâche, compté à partir de son démarrage effectif (slot de worker obtenu)
+TASK_BUDGET_SECONDS = float(os.getenv("TASK_BUDGET_SECONDS", "240"))
+# Durée supposée d'une tâche jamais mesurée (placée tôt dans l'ordre LPT)
+TASK_DEFAULT_SECONDS = float(os.getenv("TASK_DEFAULT_SECONDS", "120"))
 
 # --- Filtre langue (inchangé)
 ALLOWED_CHARS = set(
@@ -189,89 +66,346 @@ def load_config(cfg_path: str | pathlib.Path = "config.yaml") -> dict[str, Any]:
     path = pathlib.Path(cfg_path)
     return yaml.safe_load(path.read_text(encoding="utf-8"))
 
+def _split_selector(raw: str | None) -> set[str]:
+    return {part.strip().lower() for part in (raw or "").split(",") if part.strip()}
+
+def select_banks(banks: list[dict[str, Any]], *, only: str | None = None, skip: str | None = None) -> list[dict[str, Any]]:
+    """
+    Filtre les entrées `banks` par type de fetcher ou `source_name`
+    (listes séparées par des virgules, insensibles à la casse).
+    """
+    only_set, skip_set = _split_selector(only), _split_selector(skip)
+    selected = []
+    for bank in banks:
+        names = {str(bank.get("type", "")).lower(), str(bank.get("source_name", "")).lower()} - {""}
+        if only_set and not (names & only_set):
+            continue
+        if names & skip_set:
+            continue
+        selected.append(bank)
+    return selected
+
 def run_fetch_task(task: tuple[str, dict, str, int, int]) -> tuple[str, str, int, list, str | None]:
     fetcher_type, bank_args, kw, hours, limit = task
-    fn = FETCHERS[fetcher_type]
+    fn = registry.get_fetcher(fetcher_type)
     try:
         jobs = fn(keyword=kw, hours=hours, limit=limit, **bank_args)
         return (fetcher_type, kw, len(jobs), jobs, None)
     except Exception as e:
         return (fetcher_type, kw, 0, [], f"{e}")
 
+def run_fetch_task_timed(task: tuple[str, dict, str, int, int]) -> tuple[tuple[str, str, int, list, str | None], float]:
+    """`run_fetch_task` côté worker, avec sa durée réelle (hors attente d'un slot)."""
+    started = time.time()
+    result = run_fetch_task(task)
+    # Le worker peut être recyclé sans passer par atexit : classifications écrites à chaque tâche
+    from storage.classifier import flush_classification_cache
+    flush_classification_cache()
+    return result, time.time() - started
+
+def task_key(task: tuple[str, dict, str, int, int]) -> str:
+    fetcher_type, bank_args, kw, _, _ = task
+    name = bank_args.get("source_name") or bank_args.get("tenant") or ""
+    return f"{fetcher_type}:{name}|{kw}"
+
+def order_tasks(tasks: list[tuple[str, dict, str, int, int]], durations: dict[str, float]) -> list[tuple[str, dict, str, int, int]]:
+    """LPT : les tâches les plus longues (d'après les runs précédents) partent en premier."""
+    return sorted(tasks, key=lambda t: durations.get(task_key(t), TASK_DEFAULT_SECONDS), reverse=True)
+
 def export_public_assets(project_root: pathlib.Path, db_path: pathlib.Path) -> None:
     public_dir = project_root / "ui" / "public"
     public_dir.mkdir(parents=True, exist_ok=True)
-    dest1 = public_dir / "jobs.db"
-    dest2 = public_dir / "storage" / "jobs.db"
-    dest2.parent.mkdir(parents=True, exist_ok=True)
+    dest = public_dir / "jobs.db"
     try:
-        shutil.copy2(db_path, dest1); shutil.copy2(db_path, dest2)
-        print(f"[EXPORT] DB copiée → {dest1}"); print(f"[EXPORT] DB copiée → {dest2}")
+        exported = export_read_replica(db_path, dest)
+        print(f"[EXPORT] Réplique UI écrite → {dest} ({exported} offres, {dest.stat().st_size // 1024} Kio)")
     except Exception as e:
-        print(f"[EXPORT] ⚠️ copie DB échouée: {e}")
+        print(f"[EXPORT] ⚠️ réplique UI échouée ({e}), copie brute de la DB.")
+        try:
+            shutil.copy2(db_path, dest)
+        except Exception as e2:
+            print(f"[EXPORT] ⚠️ copie DB échouée: {e2}")
+    # Ancienne seconde copie (ui/public/storage/jobs.db) : lue par aucune route
+    stale = public_dir / "storage" / "jobs.db"
+    if stale.exists():
+        stale.unlink()
+        print(f"[EXPORT] Copie obsolète supprimée → {stale}")
     try:
         (public_dir / "last-update.txt").write_text(datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"), encoding="utf-8")
         print(f"[EXPORT] last-update.txt mis à jour.")
     except Exception as e:
         print(f"[EXPORT] ⚠️ last-update.txt non écrit: {e}")
 
-def run_once(cfg: dict[str, Any], *, max_procs: int, webhook_url: str | None):
-    tasks: list[tuple[str, dict, str, int, int]] = []
-    for bank in cfg["banks"]:
-        fetcher_type = bank["type"]
-        if fetcher_type not in FETCHERS:
-            print(f"[AVERTISSEMENT] Aucun fetcher pour '{fetcher_type}'.")
+def apply_rate_limits(banks: list[dict[str, Any]]) -> pathlib.Path:
+    """
+    Enregistre les limites `rate_limit: {host?, rps?, burst?, max_in_flight?}` des entrées
+    de config.yaml (hôte par défaut : `base`), dans l'état partagé du run.
+    """
+    state_dir = rate_limit.new_run_dir()
+    for bank in banks:
+        limits = bank.get("rate_limit")
+        if not limits:
             continue
-        bank_args = {k: v for k, v in bank.items() if k != "type"}
-        for kw in cfg["keywords"]:
-            tasks.append((fetcher_type, bank_args, kw, cfg["hours"], cfg.get("fetch_limit", 50)))
+        host = limits.get("host") or bank.get("base")
+        if not host:
+            print(f"[AVERTISSEMENT] rate_limit sans hôte pour '{bank.get('source_name') or bank['type']}' (ajouter host:).")
+            continue
+        rate_limit.configure(host, rps=limits.get("rps"), burst=limits.get("burst"), max_in_flight=limits.get("max_in_flight"))
+        print(f"[RUN] Limite {rate_limit.host_of(host)}: {limits}")
+    return state_dir
+
+class _NotStarted(RuntimeError):
+    """Tâche jamais lancée : aucun worker libre avant l'échéance du run."""
+
+class _Abandoned(RuntimeError):
+    """Travail bloquant abandonné après `ran` secondes d'exécution (budget ou échéance du run)."""
+    def __init__(self, ran: float, *, by_deadline: bool):
+        super().__init__(f"{'échéance du run' if by_deadline else 'budget dépassé'} après {ran:.0f}s, tâche abandonnée")
+        self.ran = ran
+        self.by_deadline = by_deadline
+
+def _make_offload(executor: ProcessPoolExecutor, slots: asyncio.Semaphore, *, deadline: float):
+    """
+    Exécute une fonction bloquante (Playwright, fetcher sync) dans le pool de workers.
+    L'attente d'un slot est bornée par l'échéance du run, l'exécution par TASK_BUDGET_SECONDS ;
+    un appel abandonné garde son slot jusqu'à ce que le worker ait vraiment fini.
+    `offload.pending` liste les appels encore en cours dans un worker.
+    """
+    loop = asyncio.get_running_loop()
+    pending: set[asyncio.Future] = set()
+
+    def _settled(f: asyncio.Future) -> None:
+        pending.discard(f)
+        slots.release()
+        # Appel abandonné : personne ne lira son résultat (ex. BrokenProcessPool après un arrêt forcé)
+        if not f.cancelled():
+            f.exception()
 
-    print(f"[RUN] {len(tasks)} tâches | MAX_PROCS={max_procs}")
+    async def offload(fn, *args, **kwargs):
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            raise _NotStarted("échéance du run atteinte avant d'obtenir un worker") from None
+        fut = loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+        pending.add(fut)
+        fut.add_done_callback(_settled)
+        budget = min(TASK_BUDGET_SECONDS, deadline - loop.time())
+        started = loop.time()
+        try:
+            return await asyncio.wait_for(asyncio.shield(fut), timeout=max(budget, 0))
+        except asyncio.TimeoutError:
+            raise _Abandoned(loop.time() - started, by_deadline=budget < TASK_BUDGET_SECONDS) from None
+
+    offload.pending = pending
+    return offload
+
+async def run_fetch_task_async(task: tuple[str, dict, str, int, int], *, client: httpx.AsyncClient, offload, budget: float) -> tuple[tuple[str, str, int, list, str | None], float | None]:
+    """Retourne (résultat, durée mesurée) ; durée None si la tâche n'a pas pu démarrer."""
+    fetcher_type, bank_args, kw, hours, limit = task
+    fn_async = registry.get_async_fetcher(fetcher_type)
     started = time.time()
-    results = []
-    with ProcessPoolExecutor(max_workers=max_procs) as ex:
-        futures = [ex.submit(run_fetch_task, t) for t in tasks]
-        for fut in as_completed(futures):
-            results.append(fut.result())
+    try:
+        if fn_async is None:
+            return await offload(run_fetch_task_timed, task)
+        jobs = await asyncio.wait_for(fn_async(client=client, offload=offload, keyword=kw, hours=hours, limit=limit, **bank_args), timeout=budget)
+        return (fetcher_type, kw, len(jobs), jobs, None), time.time() - started
+    except _NotStarted as e:
+        return (fetcher_type, kw, 0, [], f"{e}"), None
+    except _Abandoned as e:
+        # Coupée par l'échéance du run : durée non représentative, on ne l'enregistre pas
+        return (fetcher_type, kw, 0, [], f"{e}"), None if e.by_deadline else e.ran
+    except asyncio.TimeoutError:
+        e = _Abandoned(time.time() - started, by_deadline=budget < TASK_BUDGET_SECONDS)
+        return (fetcher_type, kw, 0, [], f"{e}"), None if e.by_deadline else e.ran
+    except Exception as e:
+        return (fetcher_type, kw, 0, [], f"{e}"), time.time() - started
 
-    total_new = 0
+def ingest_results(results: list[tuple[str, str, int, list, str | None]], *, webhook_url: str | None, run_started: datetime | None = None) -> int:
+    """
+    Étage d'écriture : filtre langue, puis upsert du lot entier en une transaction,
+    notif des offres réellement insérées, et fermeture des offres absentes d'un crawl
+    exhaustif (Listing.complete) depuis le début du run.
+    """
+    candidates = []
     for fetcher_type, kw, nb, jobs, err in results:
         if err:
             print(f"[ERREUR] {fetcher_type} '{kw or 'TOUT'}': {err}")
             continue
         print(f"  ⚙️ {nb} offre(s) brutes récupérées pour {fetcher_type} '{kw or 'TOUT'}'")
         for job in jobs:
-            if is_new(job.id) and is_new_by_link(job.link) and is_allowed_language(job.title):
-                print(f"  ✅ Nouvelle offre: {job.title} ({job.company})")
-                save_job(job)
-                if webhook_url:
-                    try:
-                        notify_discord(job, keyword=kw, webhook_url=webhook_url)
-                    except Exception as e:
-                        print(f"   ↳ [WARN] Discord ko: {e}")
-                total_new += 1
-            elif not is_allowed_language(job.title):
+            if is_allowed_language(job.title):
+                candidates.append((job, kw))
+            else:
                 offending = {c for c in job.title if c not in ALLOWED_CHARS}
                 print(f"  🚫 Rejeté (caractères non autorisés: {offending}): {job.title} ({job.company})")
-            else:
-                pass
-        time.sleep(0.3)
+
+    keywords = {id(job): kw for job, kw in candidates}
+    inserted = save_jobs([job for job, _ in candidates])
+    for job in inserted:
+        if job.duplicate_of:
+            # Même poste déjà notifié sous une autre source / un autre mot-clé
+            print(f"  ♊ Quasi-doublon de {job.duplicate_of}: {job.title} ({job.company})")
+            continue
+        print(f"  ✅ Nouvelle offre: {job.title} ({job.company})")
+        if webhook_url:
+            try:
+                notify_discord(job, keyword=keywords[id(job)], webhook_url=webhook_url)
+            except Exception as e:
+                print(f"   ↳ [WARN] Discord ko: {e}")
+
+    if run_started is not None:
+        for _, _, _, jobs, err in results:
+            if err or not getattr(jobs, "complete", False) or not jobs.source:
+                continue
+            closed = mark_closed(jobs.source, seen_before=run_started, since=jobs.since)
+            if closed:
+                print(f"  🔒 {closed} offre(s) {jobs.source} fermée(s) (absentes du dernier crawl complet).")
+    return len(inserted)
+
+async def _produce(task, queue: asyncio.Queue, *, client: httpx.AsyncClient, offload, deadline: float, durations: dict[str, float]) -> None:
+    loop = asyncio.get_running_loop()
+    remaining = deadline - loop.time()
+    if remaining <= 0:
+        await queue.put((task[0], task[2], 0, [], "échéance du run atteinte, tâche non lancée"))
+        return
+    result, elapsed = await run_fetch_task_async(task, client=client, offload=offload, budget=min(TASK_BUDGET_SECONDS, remaining))
+    if elapsed is not None:
+        durations[task_key(task)] = elapsed
+    await queue.put(result)
+
+async def _write(queue: asyncio.Queue, *, webhook_url: str | None, run_started: datetime) -> int:
+    """
+    Consomme la file au fil de l'eau. Les résultats déjà arrivés sont regroupés
+    en un lot (au plus INGEST_BATCH_SIZE offres) écrit hors de la boucle d'événements.
+    """
+    total_new = 0
+    done = False
+    while not done:
+        batch = [await queue.get()]
+        n_jobs = len(batch[0][3]) if batch[0] is not None else 0
+        while n_jobs < INGEST_BATCH_SIZE and not queue.empty():
+            item = queue.get_nowait()
+            batch.append(item)
+            n_jobs += len(item[3]) if item is not None else 0
+        if None in batch:
+            done = True
+            batch = [r for r in batch if r is not None]
+        if batch:
+            try:
+                total_new += await asyncio.to_thread(ingest_results, batch, webhook_url=webhook_url, run_started=run_started)
+            except Exception as e:
+                print(f"[ERREUR] Écriture d'un lot de {len(batch)} résultat(s) échouée: {e}")
+    return total_new
+
+def _shutdown_workers(ex: ProcessPoolExecutor, *, force: bool) -> None:
+    """Arrêt du pool ; `force` tue les workers encore occupés par des tâches abandonnées."""
+    if not force:
+        ex.shutdown(wait=True)
+        return
+    # Pas d'API publique pour tuer un worker : on passe par `_processes` ({pid: Process}),
+    # attribut privé de CPython présent de 3.3 à 3.13. S'il disparaît, les workers
+    # occupés finissent simplement leur tâche avant la fin du process.
+    processes = list((getattr(ex, "_processes", None) or {}).values())
+    ex.shutdown(wait=False, cancel_futures=True)
+    for proc in processes:
+        if proc.is_alive():
+            proc.terminate()
+
+async def run_pipeline_async(tasks: list[tuple[str, dict, str, int, int]], *, max_procs: int, webhook_url: str | None, durations: dict[str, float]) -> int:
+    """
+    Moteur asyncio en flux : les fetchers HTTP tournent en coroutines sur un client partagé,
+    le travail navigateur/bloquant passe par `max_procs` workers, et chaque résultat
+    part dans une file bornée vers l'étage d'écriture SQLite dès qu'il est prêt.
+    Les tâches sont soumises dans l'ordre reçu (LPT) ; `durations` reçoit leurs durées.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + RUN_DEADLINE_SECONDS
+    queue: asyncio.Queue = asyncio.Queue(maxsize=INGEST_QUEUE_SIZE)
+    writer = asyncio.create_task(_write(queue, webhook_url=webhook_url, run_started=datetime.now(timezone.utc)))
+    ex = ProcessPoolExecutor(max_workers=max_procs)
+    offload = _make_offload(ex, asyncio.Semaphore(max_procs), deadline=deadline)
+    try:
+        async with new_async_client(max_connections=HTTP_MAX_CONNECTIONS) as client:
+            await asyncio.gather(*(_produce(t, queue, client=client, offload=offload, deadline=deadline, durations=durations) for t in tasks))
+    finally:
+        overrun = loop.time() >= deadline
+        if overrun:
+            print(f"[RUN] ⏰ Échéance de {RUN_DEADLINE_SECONDS:.0f}s atteinte : résultats partiels.")
+        if offload.pending:
+            print(f"[RUN] {len(offload.pending)} tâche(s) abandonnée(s) encore en cours : workers arrêtés.")
+        _shutdown_workers(ex, force=bool(offload.pending))
+        await queue.put(None)
+    return await writer
+
+def run_once(cfg: dict[str, Any], *, max_procs: int, webhook_url: str | None):
+    tasks: list[tuple[str, dict, str, int, int]] = []
+    for bank in cfg["banks"]:
+        fetcher_type = bank["type"]
+        if not registry.is_known(fetcher_type):
+            print(f"[AVERTISSEMENT] Aucun fetcher pour '{fetcher_type}'.")
+            continue
+        bank_args = {k: v for k, v in bank.items() if k not in ("type", "rate_limit")}
+        for kw in cfg["keywords"]:
+            tasks.append((fetcher_type, bank_args, kw, cfg["hours"], cfg.get("fetch_limit", 50)))
+
+    limits_dir = apply_rate_limits(cfg["banks"])
+    history = get_task_durations()
+    tasks = order_tasks(tasks, history)
+    n_async = sum(1 for t in tasks if registry.get_async_fetcher(t[0]))
+    print(f"[RUN] {len(tasks)} tâches ({n_async} asyncio) | MAX_PROCS={max_procs} | HTTP_MAX_CONNECTIONS={HTTP_MAX_CONNECTIONS}")
+    print(f"[RUN] Échéance {RUN_DEADLINE_SECONDS:.0f}s, budget/tâche {TASK_BUDGET_SECONDS:.0f}s | {len(history)} durée(s) connue(s), plus longues d'abord.")
+    started = time.time()
+    # Chargé avant le fork des workers : les fetchers en héritent pour sauter les offres connues
+    print(f"[RUN] {len(seen_jobs())} offre(s) déjà en base.")
+    durations: dict[str, float] = {}
+    try:
+        total_new = asyncio.run(run_pipeline_async(tasks, max_procs=max_procs, webhook_url=webhook_url, durations=durations))
+    finally:
+        shutil.rmtree(limits_dir, ignore_errors=True)
+        try:
+            save_task_durations(durations)
+        except Exception as e:
+            print(f"[RUN] ⚠️ Durées des tâches non enregistrées: {e}")
 
     elapsed = time.time() - started
     print(f"\n⏱️ Temps total: {elapsed:.1f}s")
     print(f"Terminé. {total_new} nouvelle(s) offre(s)." if total_new else "Terminé. Aucune nouvelle offre.")
 
 # ------------ Entrée principale (inchangée) ------------
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Collecte des offres et export vers ui/public.")
+    parser.add_argument("--config", default="config.yaml", help="Fichier de configuration (défaut: config.yaml)")
+    parser.add_argument("--only", help="Types ou source_name à exécuter, séparés par des virgules (ex: workday,sg_proxy,BBVA)")
+    parser.add_argument("--skip", help="Types ou source_name à ignorer, séparés par des virgules")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
+    args = parse_args()
     load_dotenv()
     MAX_PROCS = int(os.getenv("MAX_PROCS", "7"))
     webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
+    # "db" : seule la réplique UI est produite ; "delta" : + journal NDJSON dans storage/deltas/
+    EXPORT_MODE = os.getenv("EXPORT_MODE", "db").lower()
     init_db()
-    cfg = load_config("config.yaml")
+    cfg = load_config(args.config)
+    if args.only or args.skip:
+        cfg["banks"] = select_banks(cfg["banks"], only=args.only, skip=args.skip)
+        print(f"[RUN] Sélection --only={args.only or '-'} --skip={args.skip or '-'} → {len(cfg['banks'])} source(s).")
     now_str = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
     print(f"\n{'='*20} NOUVEAU CYCLE DE SCRAPING - {now_str} {'='*20}")
     run_once(cfg, max_procs=MAX_PROCS, webhook_url=webhook_url)
+    from storage.classifier import flush_classification_cache
+    flush_classification_cache()
     delete_old_jobs()
+    try:
+        if EXPORT_MODE == "delta":
+            delta_log.write_delta()
+        else:
+            delta_log.discard_changes()
+    except Exception as e:
+        print(f"[EXPORT] ⚠️ journal d'export non écrit: {e}")
+    # Checkpoint du WAL avant copie : jobs.db doit être complet et lisible seul
+    close_db()
     project_root = pathlib.Path(__file__).resolve().parent
     db_path = pathlib.Path(os.getenv("JOBS_DB_FILE", project_root / "storage" / "jobs.db"))
     if not db_path.is_absolute():
@@ -5,7 +5,8 @@ from datetime import datetime, timezone
 from urllib.parse import urljoin, parse_qs, urlparse
 
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright, TimeoutError, Page
+from playwright.sync_api import TimeoutError, Page
+from .browser_pool import browser_session
 
 # Assurez-vous que le répertoire parent est dans le PYTHONPATH pour que cette importation fonctionne
 # ou ajustez le chemin relatif si nécessaire (from ..models import JobPosting)
@@ -28,8 +29,7 @@ def fetch(limit: int, source_name: str, **kwargs) -> list[JobPosting]:
     """
     job_postings: list[JobPosting] = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+    with browser_session(headless=True) as browser:
         page = browser.new_page()
 
         try:
@@ -4,7 +4,8 @@ from datetime import datetime, timezone
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright, TimeoutError
+from playwright.sync_api import TimeoutError
+from .browser_pool import browser_session
 
 from models import JobPosting
 
@@ -17,8 +18,7 @@ def fetch(limit: int, source_name: str, **kwargs) -> list[JobPosting]:
     """
     job_postings: list[JobPosting] = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+    with browser_session(headless=True) as browser:
         page = browser.new_page()
 
         try:
@@ -5,11 +5,14 @@ from datetime import datetime, timezone
 from typing import List
 from bs4 import BeautifulSoup
 from models import JobPosting
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError, expect
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError, expect
+from .browser_pool import browser_session
+from .rate_limit import throttle
 from storage.classifier import classify_job, normalize_contract_type, enrich_location
 
 BASE_URL = "https://search.jobs.barclays"
 API_URL = f"{BASE_URL}/search-jobs"
+FIRST_CARD_LINK = 'div.list-item--card a.job-title--link'
 USER_AGENT_STRING = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36'
 
 def fetch(*, keyword: str = "", hours: int = 48, limit: int = 250, **kwargs) -> list[JobPosting]:
@@ -20,8 +23,7 @@ def fetch(*, keyword: str = "", hours: int = 48, limit: int = 250, **kwargs) ->
         print("[BARCLAYS] AVERTISSEMENT : La recherche par mot-clé n'est pas supportée pour ce fetcher.")
         return []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(channel="chrome", headless=True)
+    with browser_session(channel="chrome", headless=True) as browser:
         context = browser.new_context(
             user_agent=USER_AGENT_STRING,
             locale="en-GB",
@@ -48,7 +50,7 @@ def fetch(*, keyword: str = "", hours: int = 48, limit: int = 250, **kwargs) ->
             page.wait_for_load_state('networkidle', timeout=25000)
             print("[BARCLAYS] Page stable et offres initiales chargées.")
 
-            # --- BOUCLE DE PAGINATION AVEC PAUSE FIXE ---
+            # --- BOUCLE DE PAGINATION ---
             page_num = 1
             while len(all_offers_html) < limit:
                 soup = BeautifulSoup(page.content(), 'lxml')
@@ -69,12 +71,17 @@ def fetch(*, keyword: str = "", hours: int = 48, limit: int = 250, **kwargs) ->
                         break
 
                     print(f"[BARCLAYS] Passage à la page {page_num + 1}...")
+                    first_link = page.locator(FIRST_CARD_LINK).first.get_attribute('href')
+                    # Cadence de l'hôte gérée par le limiteur partagé, plus de pause fixe
+                    throttle(BASE_URL)
                     next_page_button.click()
-                    
-                    # --- LA CORRECTION FINALE ET DÉFINITIVE ---
-                    # On remplace l'attente 'expect' par une pause fixe, plus fiable.
-                    print("[BARCLAYS] Attente de 1 seconde pour le chargement de la nouvelle page...")
-                    page.wait_for_timeout(1000)
+
+                    # La page est chargée quand la première carte a changé
+                    page.wait_for_function(
+                        "([sel, prev]) => { const a = document.querySelector(sel); return a && a.getAttribute('href') !== prev; }",
+                        arg=[FIRST_CARD_LINK, first_link],
+                        timeout=15000,
+                    )
                     
                     page_num += 1
 
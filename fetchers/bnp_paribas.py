@@ -5,7 +5,8 @@ from datetime import datetime, timezone
 from typing import List
 from bs4 import BeautifulSoup
 from models import JobPosting
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError, expect
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError, expect
+from .browser_pool import browser_session
 from storage.classifier import classify_job, normalize_contract_type, enrich_location
 from .scraper import scrape_page_for_structured_data
 
@@ -22,8 +23,7 @@ def fetch(*, keyword: str = "", hours: int = 48, limit: int = 250, **kwargs) ->
     log_message = f"avec le mot-clé '{keyword}'" if keyword else "(toutes les offres)"
     print(f"🚀 Démarrage du fetcher pour BNP Paribas {log_message}...")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(channel="chrome", headless=True)
+    with browser_session(channel="chrome", headless=True) as browser:
 
         # --- CONFIGURATION CRUCIALE POUR GITHUB ACTIONS ---
         # On force la langue, le fuseau horaire et la taille de l'écran
@@ -5,7 +5,8 @@ from datetime import datetime, timezone
 from typing import List
 from bs4 import BeautifulSoup, Tag
 from models import JobPosting
-from playwright.sync_api import sync_playwright, Page
+from playwright.sync_api import Page
+from .browser_pool import browser_session
 from storage.classifier import classify_job, normalize_contract_type
 
 # --- On importe les fonctions de parsing depuis le premier fetcher pour ne pas les dupliquer ! ---
@@ -20,8 +21,7 @@ def fetch(*, keyword: str = "", hours: int = 48, limit: int = 50, **kwargs) -> l
     print(f"🚀 Démarrage du fetcher pour {BANK_SOURCE} (Portail Étudiants)...")
     if keyword: return []
     jobs: List[JobPosting] = []
-    with sync_playwright() as p:
-        browser = p.chromium.launch(channel="chrome", headless=True)
+    with browser_session(channel="chrome", headless=True) as browser:
         context = browser.new_context()
         page = context.new_page()
         try:
@@ -5,7 +5,8 @@ from datetime import datetime, timezone, timedelta
 from urllib.parse import urljoin, parse_qs, urlparse
 
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright, TimeoutError
+from playwright.sync_api import TimeoutError
+from .browser_pool import browser_session
 
 from models import JobPosting
 
@@ -39,8 +40,7 @@ def fetch(limit: int, source_name: str, **kwargs) -> list[JobPosting]:
     # L'URL fournie contient déjà les bons filtres pour Finance et Trading
     start_url = "https://www.bp.com/en/global/corporate/careers/search-and-apply.html?group%5B0%5D=Finance%20Group&group%5B1%5D=Supply%20%26%20Trading%20Group"
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+    with browser_session(headless=True) as browser:
         page = browser.new_page()
 
         try:
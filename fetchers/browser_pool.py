@@ -0,0 +1,141 @@
+# Fichier: fetchers/browser_pool.py
+# Pool Chromium partagé : un navigateur longue durée par worker (process),
+# les fetchers ne reçoivent que des contextes isolés.
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from playwright.sync_api import Browser, BrowserContext, Page, Playwright, sync_playwright
+
+# Nombre max de contextes ouverts simultanément dans un worker
+MAX_CONTEXTS = int(os.getenv("BROWSER_MAX_CONTEXTS", "4"))
+# Délai d'attente d'un slot libre avant d'abandonner (secondes)
+SLOT_TIMEOUT = float(os.getenv("BROWSER_SLOT_TIMEOUT", "120"))
+
+
+def _launch_key(launch_kwargs: dict[str, Any]) -> tuple:
+    """Clé de navigateur : les fetchers qui lancent Chromium pareil partagent la même instance."""
+    return (
+        launch_kwargs.get("channel"),
+        bool(launch_kwargs.get("headless", True)),
+        tuple(launch_kwargs.get("args") or ()),
+    )
+
+
+class BrowserPool:
+    """
+    Garde un `sync_playwright` et un navigateur par configuration de lancement,
+    vivants pendant toute la durée du worker. Le coût du cold start Chromium
+    est payé une fois au lieu d'une fois par tâche (banque × mot-clé).
+    """
+
+    def __init__(self, max_contexts: int = MAX_CONTEXTS):
+        self._pw: Playwright | None = None
+        self._browsers: dict[tuple, Browser] = {}
+        self._slots = threading.BoundedSemaphore(max(1, max_contexts))
+
+    def _browser(self, launch_kwargs: dict[str, Any]) -> Browser:
+        key = _launch_key(launch_kwargs)
+        browser = self._browsers.get(key)
+        if browser is not None and browser.is_connected():
+            return browser
+        if self._pw is None:
+            self._pw = sync_playwright().start()
+        print(f"[BrowserPool] Lancement Chromium (channel={key[0]}, headless={key[1]})…")
+        browser = self._pw.chromium.launch(**launch_kwargs)
+        self._browsers[key] = browser
+        return browser
+
+    def acquire(self) -> None:
+        if not self._slots.acquire(timeout=SLOT_TIMEOUT):
+            raise RuntimeError(f"[BrowserPool] Aucun contexte libre après {SLOT_TIMEOUT:.0f}s (max={MAX_CONTEXTS}).")
+
+    def release(self) -> None:
+        try:
+            self._slots.release()
+        except ValueError:
+            pass
+
+    def lease(self, **launch_kwargs) -> "BrowserLease":
+        return BrowserLease(self, self._browser(launch_kwargs))
+
+    def close(self) -> None:
+        for browser in self._browsers.values():
+            try:
+                browser.close()
+            except Exception:
+                pass
+        self._browsers.clear()
+        if self._pw is not None:
+            try:
+                self._pw.stop()
+            except Exception:
+                pass
+            self._pw = None
+
+
+class BrowserLease:
+    """
+    Vue d'un fetcher sur le navigateur partagé. Expose le sous-ensemble de
+    l'API `Browser` utilisé par les fetchers ; `close()` ne ferme que les
+    contextes ouverts via ce bail, jamais le navigateur lui-même.
+    """
+
+    def __init__(self, pool: BrowserPool, browser: Browser):
+        self._pool = pool
+        self._browser = browser
+        self._contexts: list[BrowserContext] = []
+
+    def new_context(self, **context_kwargs) -> BrowserContext:
+        self._pool.acquire()
+        try:
+            context = self._browser.new_context(**context_kwargs)
+        except Exception:
+            self._pool.release()
+            raise
+        self._contexts.append(context)
+        return context
+
+    def new_page(self, **context_kwargs) -> Page:
+        return self.new_context(**context_kwargs).new_page()
+
+    def is_connected(self) -> bool:
+        return self._browser.is_connected()
+
+    def close(self) -> None:
+        while self._contexts:
+            context = self._contexts.pop()
+            try:
+                context.close()
+            except Exception:
+                pass
+            self._pool.release()
+
+
+_POOL: BrowserPool | None = None
+
+
+def get_pool() -> BrowserPool:
+    """Pool du process courant (créé à la demande, fermé à la sortie)."""
+    global _POOL
+    if _POOL is None:
+        _POOL = BrowserPool()
+        atexit.register(_POOL.close)
+    return _POOL
+
+
+@contextmanager
+def browser_session(**launch_kwargs) -> Iterator[BrowserLease]:
+    """
+    Remplaçant de `with sync_playwright() as p: browser = p.chromium.launch(...)`.
+    Les contextes créés dans le bloc sont fermés à la sortie.
+    """
+    lease = get_pool().lease(**launch_kwargs)
+    try:
+        yield lease
+    finally:
+        lease.close()
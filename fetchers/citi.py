@@ -2,7 +2,15 @@
 # Utilise exactement la même logique que fetchers/workday.py
 from __future__ import annotations
 
-from .workday import fetch as workday_fetch
+from .workday import fetch as workday_fetch, fetch_async as workday_fetch_async
+
+# Paramètres Workday confirmés depuis la page job
+CITI_WORKDAY = {
+    "base": "https://citi.wd5.myworkdayjobs.com",
+    "tenant": "citi",
+    "template": "2",
+    "source_name": "CITI",
+}
 
 def fetch(*, keyword: str = "", hours: int = 360, limit: int = 50, **kwargs):
     """
@@ -13,10 +21,17 @@ def fetch(*, keyword: str = "", hours: int = 360, limit: int = 50, **kwargs):
       template= 2
     """
     return workday_fetch(
-        base="https://citi.wd5.myworkdayjobs.com",
-        tenant="citi",
-        template="2",
-        source_name="CITI",
+        **CITI_WORKDAY,
+        keyword=keyword,
+        hours=hours,
+        limit=limit,
+        **kwargs,
+    )
+
+async def fetch_async(*, keyword: str = "", hours: int = 360, limit: int = 50, **kwargs):
+    """Même wrap, côté moteur asyncio du collector."""
+    return await workday_fetch_async(
+        **CITI_WORKDAY,
         keyword=keyword,
         hours=hours,
         limit=limit,
@@ -1,6 +1,7 @@
 # Fichier : fetchers/credit_agricole.py (VERSION FINALE ET FONCTIONNELLE)
 
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from .browser_pool import browser_session
 from bs4 import BeautifulSoup
 from typing import List
 from datetime import datetime, timezone
@@ -17,8 +18,7 @@ def fetch(keyword: str, hours: int, limit: int, **bank_args) -> List[JobPosting]
     print("Fetching jobs from Crédit Agricole (with correct pagination)...")
     jobs: List[JobPosting] = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True) 
+    with browser_session(headless=True) as browser:
         context = browser.new_context(user_agent=USER_AGENT_STRING)
         page = context.new_page()
         page.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
@@ -6,7 +6,8 @@ from urllib.parse import urljoin
 from locale import setlocale, LC_TIME
 from typing import List, Optional
 
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
+from playwright.sync_api import TimeoutError as PWTimeout
+from .browser_pool import browser_session
 from models import JobPosting
 
 BASE_URL = "https://jobs.engie.com"
@@ -145,8 +146,7 @@ def fetch(limit: int, source_name: str, **kwargs) -> List[JobPosting]:
     job_postings: List[JobPosting] = []
     processed_ids = set()
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+    with browser_session(headless=True) as browser:
         page = browser.new_page()
 
         try:
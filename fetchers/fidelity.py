@@ -5,7 +5,8 @@ from urllib.parse import urljoin
 from locale import setlocale, LC_TIME
 
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright, TimeoutError
+from playwright.sync_api import TimeoutError
+from .browser_pool import browser_session
 
 from models import JobPosting
 
@@ -31,8 +32,7 @@ def parse_fidelity_date(date_str: str) -> datetime:
 def fetch(limit: int, source_name: str, **kwargs) -> list[JobPosting]:
     job_postings: list[JobPosting] = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+    with browser_session(headless=True) as browser:
 
         # ==================== MODIFICATION CLÉ : SIMULATION D'UN NAVIGATEUR RÉEL ====================
         # On définit un User-Agent et une taille de fenêtre pour ne pas être détecté comme un robot.
@@ -1,6 +1,7 @@
 # Fichier : fetchers/hsbc.py (Version finale avec pagination par clics)
 
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from .browser_pool import browser_session
 from bs4 import BeautifulSoup
 from typing import List
 from datetime import datetime, timezone
@@ -16,9 +17,8 @@ def fetch(keyword: str, hours: int, limit: int, **bank_args) -> List[JobPosting]
     print("Fetching jobs from HSBC (with pagination by click)...")
     jobs: List[JobPosting] = []
 
-    with sync_playwright() as p:
+    with browser_session(headless=True) as browser:
         # On utilise headless=True pour l'exécution normale
-        browser = p.chromium.launch(headless=True)
         context = browser.new_context(user_agent=USER_AGENT_STRING)
         page = context.new_page()
         page.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
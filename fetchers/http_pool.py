@@ -0,0 +1,181 @@
+# Fichier: fetchers/http_pool.py
+# Registry de clients HTTP du process : un client httpx par hôte, gardé chaud
+# (HTTP/2 multiplexé, keep-alive) et partagé entre tenants, mots-clés et threads.
+# Toutes les requêtes passent par le limiteur par hôte de rate_limit.py.
+from __future__ import annotations
+
+import atexit
+import os
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+from . import rate_limit
+
+# Connexions max par hôte (sync) et durée de vie d'une connexion inactive (secondes)
+HTTP_POOL_MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+# Durée de cache des résolutions DNS (secondes, 0 = désactivé)
+HTTP_DNS_TTL = float(os.getenv("HTTP_DNS_TTL", "300"))
+
+# httpx ne propose "br" que si le paquet brotli est installé
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+_lock = threading.Lock()
+_clients: dict[tuple[str, bool], httpx.Client] = {}
+
+
+# --- DNS : cache TTL autour de getaddrinfo (sync et asyncio passent par lui) ---
+_dns_cache: dict[tuple, tuple[float, list]] = {}
+_getaddrinfo = socket.getaddrinfo
+
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    key = (host, port, family, type, proto, flags)
+    hit = _dns_cache.get(key)
+    now = time.monotonic()
+    if hit and hit[0] > now:
+        return hit[1]
+    infos = _getaddrinfo(host, port, family, type, proto, flags)
+    _dns_cache[key] = (now + HTTP_DNS_TTL, infos)
+    return infos
+
+
+def _install_dns_cache() -> None:
+    if HTTP_DNS_TTL > 0 and socket.getaddrinfo is not _cached_getaddrinfo:
+        socket.getaddrinfo = _cached_getaddrinfo
+
+
+def _host(url: str) -> str:
+    parts = urlsplit(url if "//" in url else f"https://{url}")
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _should_retry(response: httpx.Response, attempt: int) -> float | None:
+    """Délai avant nouvelle tentative si l'hôte demande de ralentir, sinon None."""
+    if attempt >= rate_limit.RATE_LIMIT_RETRIES:
+        return None
+    if response.status_code == 429 or (response.status_code == 503 and "Retry-After" in response.headers):
+        delay = rate_limit.retry_after(response.headers)
+        return delay if delay <= rate_limit.RATE_LIMIT_MAX_BACKOFF else None
+    return None
+
+
+class _GovernedTransport(httpx.BaseTransport):
+    """Chaque requête passe par le limiteur de son hôte ; 429/503 suspendent l'hôte puis réessaient."""
+
+    def __init__(self, inner: httpx.BaseTransport):
+        self._inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        attempt = 0
+        while True:
+            with rate_limit.slot(url):
+                response = self._inner.handle_request(request)
+            delay = _should_retry(response, attempt)
+            if delay is None:
+                return response
+            response.close()
+            rate_limit.block(url, delay)
+            attempt += 1
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class _GovernedAsyncTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        attempt = 0
+        while True:
+            async with rate_limit.slot_async(url):
+                response = await self._inner.handle_async_request(request)
+            delay = _should_retry(response, attempt)
+            if delay is None:
+                return response
+            await response.aclose()
+            await rate_limit.block_async(url, delay)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def _limits(max_connections: int) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def get_client(url: str, *, http2: bool = True) -> httpx.Client:
+    """
+    Client sync partagé pour l'hôte de `url`. Les en-têtes propres à un tenant
+    (Origin, Referer, Authorization…) se passent par requête, jamais sur le client.
+    Ne pas fermer : le registry s'en charge à la sortie du process.
+    """
+    key = (_host(url), http2)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            _install_dns_cache()
+            transport = httpx.HTTPTransport(http2=http2, limits=_limits(HTTP_POOL_MAX_CONNECTIONS))
+            client = httpx.Client(
+                transport=_GovernedTransport(transport),
+                headers={"Accept-Encoding": ACCEPT_ENCODING},
+                timeout=20,
+            )
+            _clients[key] = client
+    return client
+
+
+def new_async_client(*, max_connections: int) -> httpx.AsyncClient:
+    """
+    Client asyncio du collector, configuré comme les clients sync. Un seul suffit :
+    httpx tient déjà un pool de connexions (HTTP/2 multiplexé) par hôte, et le
+    limiteur s'applique hôte par hôte.
+    """
+    _install_dns_cache()
+    transport = httpx.AsyncHTTPTransport(http2=True, limits=_limits(max_connections))
+    return httpx.AsyncClient(
+        transport=_GovernedAsyncTransport(transport),
+        headers={"Accept-Encoding": ACCEPT_ENCODING},
+        timeout=30,
+    )
+
+
+def close_all() -> None:
+    with _lock:
+        for client in _clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        _clients.clear()
+
+
+def _reset_after_fork() -> None:
+    # Les connexions héritées du parent ne sont pas réutilisables dans un worker forké
+    global _lock
+    _lock = threading.Lock()
+    _clients.clear()
+
+
+atexit.register(close_all)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
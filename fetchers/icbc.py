@@ -5,7 +5,8 @@ from urllib.parse import urljoin
 from locale import setlocale, LC_TIME
 
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright, TimeoutError
+from playwright.sync_api import TimeoutError
+from .browser_pool import browser_session
 
 from models import JobPosting
 
@@ -31,8 +32,7 @@ def parse_icbc_date(date_str: str) -> datetime:
 def fetch(limit: int, source_name: str, **kwargs) -> list[JobPosting]:
     job_postings: list[JobPosting] = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
+    with browser_session(headless=False) as browser:
         
         # ==================== MODIFICATION CLÉ : SIMULATION D'UN NAVIGATEUR RÉEL ====================
         context = browser.new_context(
@@ -5,7 +5,8 @@ from typing import List
 from bs4 import BeautifulSoup
 from datetime import datetime, timezone
 from urllib.parse import urljoin
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from .browser_pool import browser_session
 
 # Imports depuis les modules du projet
 from models import JobPosting
@@ -24,8 +25,7 @@ def fetch(keyword: str, hours: int, limit: int, **bank_args) -> List[JobPosting]
     print(f"[{BANK_SOURCE}] Démarrage du fetcher...")
     jobs_list: List[JobPosting] = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+    with browser_session(headless=True) as browser:
         page = browser.new_page()
 
         try:
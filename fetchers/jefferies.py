@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from typing import List
 from bs4 import BeautifulSoup, Tag
 from models import JobPosting
-from playwright.sync_api import sync_playwright
+from .browser_pool import browser_session
 from storage.classifier import classify_job, normalize_contract_type
 
 # --- CONSTANTES ---
@@ -49,8 +49,7 @@ def fetch(*, keyword: str = "", hours: int = 48, limit: int = 50, **kwargs) -> l
     if keyword: return []
     jobs: List[JobPosting] = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(channel="chrome", headless=True)
+    with browser_session(channel="chrome", headless=True) as browser:
         context = browser.new_context()
         page = context.new_page()
         try:
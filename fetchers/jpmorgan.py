@@ -4,7 +4,8 @@ import re
 from datetime import datetime, timezone
 
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright, TimeoutError
+from playwright.sync_api import TimeoutError
+from .browser_pool import browser_session
 
 from models import JobPosting
 
@@ -19,8 +20,7 @@ def fetch(limit: int, source_name: str, **kwargs) -> list[JobPosting]:
     job_postings: list[JobPosting] = []
     processed_ids = set()
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+    with browser_session(headless=True) as browser:
         page = browser.new_page()
 
         try:
@@ -5,7 +5,8 @@ from typing import List
 from bs4 import BeautifulSoup
 from datetime import datetime, timezone
 import re
-from playwright.sync_api import sync_playwright
+from .browser_pool import browser_session
+from .rate_limit import throttle
 
 from models import JobPosting
 from storage.classifier import classify_job, normalize_contract_type
@@ -13,13 +14,13 @@ from storage.classifier import classify_job, normalize_contract_type
 # --- CONSTANTES ---
 BANK_SOURCE = "KC"
 JOBS_PAGE_URL = "https://keplercheuvreux.teamtailor.com/jobs"
+JOB_CARDS = "ul#jobs_list_container > li"
 
 def fetch(keyword: str, hours: int, limit: int, **bank_args) -> List[JobPosting]:
     print(f"[{BANK_SOURCE}] Démarrage du fetcher (avec le bon sélecteur)...")
     jobs_list: List[JobPosting] = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+    with browser_session(headless=True) as browser:
         page = browser.new_page()
 
         try:
@@ -28,8 +29,20 @@ def fetch(keyword: str, hours: int, limit: int, **bank_args) -> List[JobPosting]
 
             print("  Scrolling page to load all jobs...")
             for _ in range(5):
+                count = page.locator(JOB_CARDS).count()
+                if count >= limit:
+                    break
+                throttle(JOBS_PAGE_URL)
                 page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                page.wait_for_timeout(2000)
+                # Fin du scroll infini dès qu'un défilement ne charge plus rien
+                try:
+                    page.wait_for_function(
+                        "([sel, n]) => document.querySelectorAll(sel).length > n",
+                        arg=[JOB_CARDS, count],
+                        timeout=2000,
+                    )
+                except Exception:
+                    break
 
             page.wait_for_selector('ul#jobs_list_container li', timeout=20000)
             
@@ -6,7 +6,8 @@ from locale import setlocale, LC_TIME
 import re
 
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright, TimeoutError
+from playwright.sync_api import TimeoutError
+from .browser_pool import browser_session
 
 from models import JobPosting
 
@@ -200,8 +201,7 @@ def switch_to_english_after_cookies(page) -> bool:
 def fetch(limit: int, source_name: str, **kwargs) -> list[JobPosting]:
     job_postings: list[JobPosting] = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)  # laisser False pour debug visuel
+    with browser_session(headless=True) as browser:  # laisser False pour debug visuel
         page = browser.new_page()
         page.set_default_timeout(30000)
         page.set_default_navigation_timeout(30000)
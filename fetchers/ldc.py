@@ -3,7 +3,8 @@ from urllib.parse import urljoin, urlparse, parse_qs
 import re
 
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright, TimeoutError
+from playwright.sync_api import TimeoutError
+from .browser_pool import browser_session
 
 from models import JobPosting
 
@@ -37,8 +38,7 @@ def fetch(limit: int, source_name: str, **kwargs) -> list[JobPosting]:
     """
     job_postings: list[JobPosting] = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+    with browser_session(headless=True) as browser:
         context = browser.new_context(
             # Viewport mobile pour rendre visible le bloc '...all-jobs-mobile'
             viewport={"width": 390, "height": 844},
@@ -16,6 +16,7 @@ from datetime import datetime, timezone
 
 import httpx
 
+from .http_pool import get_client
 from models import JobPosting
 from storage.classifier import classify_job, normalize_contract_type
 
@@ -278,35 +279,36 @@ def _http_fetch(*, hours: int, limit: int) -> List[JobPosting]:
         "User-Agent": DEFAULT_UA,
         "Accept": "application/json, text/plain, */*",
         "Referer": f"{BASE}/careers/career-opportunities-search?opportunity=sg",
-        "Connection": "close",
     }
     params = {"opportunity": "sg"}
 
     jobs: List[JobPosting] = []
-    with httpx.Client(http2=False, timeout=httpx.Timeout(15.0, read=15.0)) as client:
-        # ping page HTML pour mimer un parcours (utile côté infra)
-        try:
-            r_html = client.get(f"{BASE}/careers/career-opportunities-search?opportunity=sg", headers={"User-Agent": DEFAULT_UA})
-            _log(f"[HTTP] status={r_html.status_code} http_version={r_html.http_version} url={r_html.url}")
-            if DEBUG:
-                _dump_text(DBG_DIR / f"http_fallback_{int(time.time())}.html", r_html.text)
-        except Exception as e:
-            _log(f"[HTTP] page HTML warmup failed: {e}")
-
-        # endpoint AEM
-        try:
-            r = client.get(RESULTSET_URL, params=params, headers=headers)
-            ctype = r.headers.get("content-type", "")
-            _log(f"PROBE ▶ {r.url} -> {r.status_code} {ctype}")
-            payload = r.json()
-            if DEBUG:
-                _dump_json(DBG_DIR / f"probe_{int(time.time())}.json", payload)
-
-            parsed = _parse_jobs_from_json(payload)
-            _log(f"[parse] {len(parsed)} job(s) via HTTP fallback")
-            jobs.extend(parsed)
-        except Exception as e:
-            _log(f"HTTP parse failed: {e}")
+    # Client du registry (HTTP/1.1 comme avant, mais connexion réutilisée entre appels)
+    client = get_client(BASE, http2=False)
+    timeout = httpx.Timeout(15.0, read=15.0)
+    # ping page HTML pour mimer un parcours (utile côté infra)
+    try:
+        r_html = client.get(f"{BASE}/careers/career-opportunities-search?opportunity=sg", headers={"User-Agent": DEFAULT_UA}, timeout=timeout)
+        _log(f"[HTTP] status={r_html.status_code} http_version={r_html.http_version} url={r_html.url}")
+        if DEBUG:
+            _dump_text(DBG_DIR / f"http_fallback_{int(time.time())}.html", r_html.text)
+    except Exception as e:
+        _log(f"[HTTP] page HTML warmup failed: {e}")
+
+    # endpoint AEM
+    try:
+        r = client.get(RESULTSET_URL, params=params, headers=headers, timeout=timeout)
+        ctype = r.headers.get("content-type", "")
+        _log(f"PROBE ▶ {r.url} -> {r.status_code} {ctype}")
+        payload = r.json()
+        if DEBUG:
+            _dump_json(DBG_DIR / f"probe_{int(time.time())}.json", payload)
+
+        parsed = _parse_jobs_from_json(payload)
+        _log(f"[parse] {len(parsed)} job(s) via HTTP fallback")
+        jobs.extend(parsed)
+    except Exception as e:
+        _log(f"HTTP parse failed: {e}")
 
     # Filtre temporel + tri + limite
     if hours and hours > 0:
@@ -321,9 +323,29 @@ def _http_fetch(*, hours: int, limit: int) -> List[JobPosting]:
 # ────────────────────────────────────────────────────────────────────────────────
 # Playwright (optionnel si MS_FORCE_HTTP=0)
 # ────────────────────────────────────────────────────────────────────────────────
+def _playwright_fetch(context) -> List[JobPosting]:
+    page = context.new_page()
+    url = f"{BASE}/careers/career-opportunities-search?opportunity=sg"
+    # On passe par la page puis on requête l’endpoint AEM depuis le navigateur (bypass éventuels check JS)
+    page.goto(url, wait_until="domcontentloaded", timeout=90_000)
+    _log(f"PW @ {url}")
+
+    # Invoquer l’endpoint depuis le contexte
+    resp = page.request.get(RESULTSET_URL + "?opportunity=sg")
+    ctype = resp.headers.get("content-type", "")
+    _log(f"PW PROBE ▶ {RESULTSET_URL}?opportunity=sg -> {resp.status} {ctype}")
+    payload = resp.json()
+    if DEBUG:
+        _dump_json(DBG_DIR / f"pw_probe_{int(time.time())}.json", payload)
+
+    parsed = _parse_jobs_from_json(payload)
+    _log(f"[parse] {len(parsed)} job(s) via PW")
+    return parsed
+
 def _playwright_harvest(*, hours: int, limit: int) -> List[JobPosting]:
     try:
         from playwright.sync_api import sync_playwright
+        from .browser_pool import browser_session
     except Exception as e:
         _log(f"Playwright indisponible: {e}")
         return []
@@ -337,53 +359,27 @@ def _playwright_harvest(*, hours: int, limit: int) -> List[JobPosting]:
     _log(f"PW headful={headful} persist={persist}")
 
     jobs: List[JobPosting] = []
-    with sync_playwright() as p:
-        launch_kwargs = dict(headless=not headful, channel="chrome")
-        context = None
-        browser = None
-        try:
-            if persist:
-                user_data_dir = str(Path(".pw-ms").resolve())
-                browser = p.chromium.launch_persistent_context(
-                    user_data_dir=user_data_dir,
-                    **launch_kwargs,
+    try:
+        if persist:
+            # Profil persistant : hors pool, Playwright dédié le temps de l'appel
+            with sync_playwright() as p:
+                context = p.chromium.launch_persistent_context(
+                    user_data_dir=str(Path(".pw-ms").resolve()),
+                    headless=not headful,
+                    channel="chrome",
                 )
-                context = browser
-            else:
-                browser = p.chromium.launch(**launch_kwargs)
-                context = browser.new_context(locale="en-US")
-
-            page = context.new_page()
-            url = f"{BASE}/careers/career-opportunities-search?opportunity=sg"
-            # On passe par la page puis on requête l’endpoint AEM depuis le navigateur (bypass éventuels check JS)
-            page.goto(url, wait_until="domcontentloaded", timeout=90_000)
-            _log(f"PW @ {url}")
-
-            # Invoquer l’endpoint depuis le contexte
-            resp = page.request.get(RESULTSET_URL + "?opportunity=sg")
-            ctype = resp.headers.get("content-type", "")
-            _log(f"PW PROBE ▶ {RESULTSET_URL}?opportunity=sg -> {resp.status} {ctype}")
-            payload = resp.json()
-            if DEBUG:
-                _dump_json(DBG_DIR / f"pw_probe_{int(time.time())}.json", payload)
-
-            parsed = _parse_jobs_from_json(payload)
-            _log(f"[parse] {len(parsed)} job(s) via PW")
-            jobs.extend(parsed)
-
-        except Exception as e:
-            _log(f"PW error: {e}")
-        finally:
-            try:
-                if persist:
-                    context.close()
-                else:
-                    if context:
+                try:
+                    jobs.extend(_playwright_fetch(context))
+                finally:
+                    try:
                         context.close()
-                    if browser:
-                        browser.close()
-            except Exception:
-                pass
+                    except Exception:
+                        pass
+        else:
+            with browser_session(channel="chrome", headless=not headful) as browser:
+                jobs.extend(_playwright_fetch(browser.new_context(locale="en-US")))
+    except Exception as e:
+        _log(f"PW error: {e}")
 
     # Filtre/tri/limite
     if hours and hours > 0:
@@ -218,7 +218,7 @@ def _playwright_collect_raw_jobs(url: str, limit: int, max_pages: int = 40) -> L
     """
     print("  ↪️ Playwright pagination (?page=N, stop at limit)…")
     try:
-        from playwright.sync_api import sync_playwright
+        from .browser_pool import browser_session
     except Exception as e:
         print(f"  ❌ Playwright non dispo: {e}")
         return []
@@ -237,8 +237,7 @@ def _playwright_collect_raw_jobs(url: str, limit: int, max_pages: int = 40) -> L
         return f"title:{title}"
 
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
+        with browser_session(
                 headless=True,
                 args=[
                     "--disable-blink-features=AutomationControlled",
@@ -247,7 +246,7 @@ def _playwright_collect_raw_jobs(url: str, limit: int, max_pages: int = 40) -> L
                     "--disable-features=NetworkServiceInProcess",
                     "--disable-http2", "--disable-quic",
                 ],
-            )
+            ) as browser:
             context = browser.new_context(
                 user_agent=UA, locale="en-US", timezone_id="Europe/Amsterdam",
                 viewport={"width": random.randint(1280, 1440), "height": random.randint(800, 900)},
@@ -0,0 +1,196 @@
+# Fichier: fetchers/rate_limit.py
+# Limiteur par hôte partagé entre le collector et ses workers : token bucket
+# (débit + rafale), plafond de requêtes en vol et blocage sur Retry-After.
+# L'état vit dans un petit fichier JSON par hôte, verrouillé par flock.
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import pathlib
+import re
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Iterator
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:  # Windows : coordination limitée au process courant
+    fcntl = None
+
+# Limites par défaut d'un hôte (surchargées par `rate_limit:` dans config.yaml)
+RATE_LIMIT_RPS = float(os.getenv("RATE_LIMIT_RPS", "4"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "8"))
+RATE_LIMIT_MAX_IN_FLIGHT = int(os.getenv("RATE_LIMIT_MAX_IN_FLIGHT", "6"))
+# Attente max acceptée sur un Retry-After (secondes) et nombre de nouvelles tentatives
+RATE_LIMIT_MAX_BACKOFF = float(os.getenv("RATE_LIMIT_MAX_BACKOFF", "120"))
+RATE_LIMIT_RETRIES = int(os.getenv("RATE_LIMIT_RETRIES", "1"))
+# Durée après laquelle une requête "en vol" non libérée (worker tué) est oubliée
+LEASE_TTL = 120.0
+
+_STATE_ENV = "RATE_LIMIT_DIR"
+_local_lock = threading.Lock()
+_lease_ids = itertools.count()
+
+
+def _state_dir() -> pathlib.Path:
+    path = pathlib.Path(os.getenv(_STATE_ENV) or pathlib.Path(tempfile.gettempdir()) / "job_alert_ratelimit")
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def new_run_dir() -> pathlib.Path:
+    """Répertoire d'état propre à un run ; les workers forkés en héritent via l'environnement."""
+    path = pathlib.Path(tempfile.mkdtemp(prefix="job_alert_ratelimit_"))
+    os.environ[_STATE_ENV] = str(path)
+    return path
+
+
+def host_of(url: str) -> str:
+    return (urlsplit(url if "//" in url else f"https://{url}").hostname or url).lower()
+
+
+@contextmanager
+def _locked_state(host: str) -> Iterator[dict]:
+    """Lit, expose puis réécrit l'état de l'hôte sous verrou exclusif."""
+    path = _state_dir() / (re.sub(r"[^a-z0-9.-]", "_", host) + ".json")
+    with _local_lock, open(path, "a+", encoding="utf-8") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            fh.seek(0)
+            try:
+                state = json.loads(fh.read() or "{}")
+            except ValueError:
+                state = {}
+            yield state
+            fh.seek(0)
+            fh.truncate()
+            fh.write(json.dumps(state))
+            fh.flush()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def configure(host: str, *, rps: float | None = None, burst: float | None = None, max_in_flight: int | None = None) -> None:
+    """Fixe les limites d'un hôte pour tout le run (appelé par le collector avant le fork)."""
+    with _locked_state(host_of(host)) as state:
+        if rps is not None:
+            state["rps"] = float(rps)
+        if burst is not None:
+            state["burst"] = float(burst)
+        if max_in_flight is not None:
+            state["max_in_flight"] = int(max_in_flight)
+
+
+def _try_acquire(host: str) -> tuple[str | None, float]:
+    """Retourne (id de bail, 0) si une requête peut partir, sinon (None, attente conseillée)."""
+    now = time.time()
+    with _locked_state(host) as state:
+        rps = state.get("rps", RATE_LIMIT_RPS)
+        burst = state.get("burst", max(RATE_LIMIT_BURST, 1.0))
+        max_in_flight = state.get("max_in_flight", RATE_LIMIT_MAX_IN_FLIGHT)
+        leases = {k: v for k, v in state.get("leases", {}).items() if v > now}
+        tokens = min(burst, state.get("tokens", burst) + (now - state.get("stamp", now)) * rps)
+        state.update(leases=leases, tokens=tokens, stamp=now)
+
+        blocked_until = state.get("blocked_until", 0)
+        if blocked_until > now:
+            return None, blocked_until - now
+        if len(leases) >= max_in_flight:
+            return None, 0.05
+        if tokens < 1:
+            return None, (1 - tokens) / rps if rps > 0 else 1.0
+
+        lease_id = f"{os.getpid()}-{next(_lease_ids)}"
+        leases[lease_id] = now + LEASE_TTL
+        state["tokens"] = tokens - 1
+        return lease_id, 0.0
+
+
+def _release(host: str, lease_id: str) -> None:
+    with _locked_state(host) as state:
+        state.get("leases", {}).pop(lease_id, None)
+
+
+def block(url: str, seconds: float) -> None:
+    """Suspend l'hôte pour tous les workers (429 / 503 avec Retry-After)."""
+    seconds = min(max(seconds, 0.0), RATE_LIMIT_MAX_BACKOFF)
+    with _locked_state(host_of(url)) as state:
+        state["blocked_until"] = max(state.get("blocked_until", 0), time.time() + seconds)
+    print(f"  [RateLimit] {host_of(url)} suspendu {seconds:.1f}s (Retry-After).")
+
+
+async def block_async(url: str, seconds: float) -> None:
+    """`block` hors de la boucle d'événements (verrou fichier partagé entre workers)."""
+    await asyncio.to_thread(block, url, seconds)
+
+
+def retry_after(headers, default: float = 2.0) -> float:
+    """Délai d'un en-tête Retry-After (secondes ou date HTTP)."""
+    raw = (headers.get("Retry-After") or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(raw).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return default
+
+
+@contextmanager
+def slot(url: str) -> Iterator[None]:
+    """Occupe une place en vol sur l'hôte de `url` (sync, bloque le thread si besoin)."""
+    host = host_of(url)
+    while True:
+        lease_id, wait = _try_acquire(host)
+        if lease_id:
+            break
+        time.sleep(wait)
+    try:
+        yield
+    finally:
+        _release(host, lease_id)
+
+
+@asynccontextmanager
+async def slot_async(url: str) -> AsyncIterator[None]:
+    """
+    Comme `slot`, sans bloquer la boucle d'événements : l'attente est un asyncio.sleep, et
+    la lecture-écriture de l'état partagé (verrou local + flock + JSON) part dans un thread.
+    """
+    host = host_of(url)
+    while True:
+        lease_id, wait = await asyncio.to_thread(_try_acquire, host)
+        if lease_id:
+            break
+        await asyncio.sleep(wait)
+    try:
+        yield
+    finally:
+        await asyncio.to_thread(_release, host, lease_id)
+
+
+def throttle(url: str) -> None:
+    """Consomme un jeton sans rester en vol : pour les navigations Playwright."""
+    with slot(url):
+        pass
+
+
+def _reset_after_fork() -> None:
+    # Un worker forké pendant qu'un thread du parent tenait le verrou le recevrait verrouillé à vie
+    global _local_lock
+    _local_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -4,7 +4,8 @@
 from typing import List
 from bs4 import BeautifulSoup
 from datetime import datetime, timezone
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from .browser_pool import browser_session
 
 from models import JobPosting
 from storage.classifier import classify_job, normalize_contract_type
@@ -20,8 +21,7 @@ def fetch(keyword: str, hours: int, limit: int, **bank_args) -> List[JobPosting]
     print(f"[{BANK_SOURCE}] Démarrage du fetcher avec pagination...")
     jobs_list: List[JobPosting] = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+    with browser_session(headless=True) as browser:
         context = browser.new_context()
         page = context.new_page()
 
@@ -0,0 +1,132 @@
+# Fichier: fetchers/registry.py
+# Registry paresseux : type de fetcher (config.yaml) -> module, importé au premier usage.
+from __future__ import annotations
+
+import importlib
+from importlib.metadata import entry_points
+from types import ModuleType
+from typing import Callable
+
+# Groupe d'entry points pour brancher des fetchers externes sans toucher au dépôt
+ENTRY_POINT_GROUP = "job_alert.fetchers"
+
+# Type (clé `type` de config.yaml) -> chemin du module qui expose `fetch` (et éventuellement `fetch_async`)
+FETCHER_MODULES: dict[str, str] = {
+    "workday": "fetchers.workday",
+    "sg_proxy": "fetchers.sg_proxy",
+    "bnp_paribas": "fetchers.bnp_paribas",
+    "credit_agricole": "fetchers.credit_agricole",
+    "bpce": "fetchers.bpce",
+    "edr": "fetchers.edr",
+    "hsbc": "fetchers.hsbc",
+    "ubs": "fetchers.ubs",
+    "rbc": "fetchers.rbc",
+    "cic": "fetchers.cic",
+    "kc": "fetchers.kepler_cheuvreux",
+    "oddo": "fetchers.oddo_bhf",
+    "ing": "fetchers.ing",
+    "barclays": "fetchers.barclays",
+    "ms_eightfold": "fetchers.morgan_stanley_eightfold",
+    "ms_students": "fetchers.morgan_stanley_students",
+    "citi": "fetchers.citi",
+    "bofa_main": "fetchers.bofa_main",
+    "bofa_students": "fetchers.bofa_students",
+    "unicredit": "fetchers.unicredit",
+    "rabobank": "fetchers.rabobank",
+    "wellsfargo": "fetchers.wellsfargo",
+    "blackrock": "fetchers.blackrock",
+    "pictet": "fetchers.pictet",
+    "goldmansachs": "fetchers.goldmansachs",
+    "glencore": "fetchers.glencore",
+    "jefferies": "fetchers.jefferies",
+    "adm": "fetchers.adm",
+    "ag2r": "fetchers.ag2r",
+    "alantra": "fetchers.alantra",
+    "amundi": "fetchers.amundi",
+    "axaim": "fetchers.axaim",
+    "berenberg": "fetchers.berenberg",
+    "bgcpartners": "fetchers.bgcpartners",
+    "bloomberg": "fetchers.bloomberg",
+    "bptrading": "fetchers.bptrading",
+    "bryangarnier": "fetchers.bryangarnier",
+    "bunge": "fetchers.bunge",
+    "caixabank": "fetchers.caixabank",
+    "cargill": "fetchers.cargill",
+    "dnca": "fetchers.dnca",
+    "dzbank": "fetchers.dzbank",
+    "engiegm": "fetchers.engiegm",
+    "euronext": "fetchers.euronext",
+    "fidelity": "fetchers.fidelity",
+    "flowtraders": "fetchers.flowtraders",
+    "generali": "fetchers.generali",
+    "icbc": "fetchers.icbc",
+    "imc": "fetchers.imc",
+    "intesasanpaolo": "fetchers.intesasanpaolo",
+    "janestreet": "fetchers.janestreet",
+    "jpmorgan": "fetchers.jpmorgan",
+    "kfw": "fetchers.kfw",
+    "lbp": "fetchers.lbp",
+    "lfde": "fetchers.lfde",
+    "ldc": "fetchers.ldc",
+    "marex": "fetchers.marex",
+    "mirabaud": "fetchers.mirabaud",
+    "mizuho": "fetchers.mizuho",
+    "nomura": "fetchers.nomura",
+    "optiver": "fetchers.optiver",
+    "sanofi": "fetchers.sanofi",
+    "scor": "fetchers.scor",
+    "six": "fetchers.six",
+    "smbc": "fetchers.smbc",
+    "standardchartered": "fetchers.standardchartered",
+    "stifel": "fetchers.stifel",
+    "susq": "fetchers.susq",
+    "sycomore": "fetchers.sycomore",
+    "totale": "fetchers.totale",
+    "vitol": "fetchers.vitol",
+}
+
+_LOADED: dict[str, ModuleType] = {}
+_ENTRY_POINTS: dict[str, str] | None = None
+
+
+def _entry_point_modules() -> dict[str, str]:
+    """Fetchers déclarés par des paquets installés (lus une seule fois)."""
+    global _ENTRY_POINTS
+    if _ENTRY_POINTS is None:
+        try:
+            _ENTRY_POINTS = {ep.name: ep.value.split(":")[0] for ep in entry_points(group=ENTRY_POINT_GROUP)}
+        except Exception:
+            _ENTRY_POINTS = {}
+    return _ENTRY_POINTS
+
+
+def _module_path(fetcher_type: str) -> str | None:
+    return FETCHER_MODULES.get(fetcher_type) or _entry_point_modules().get(fetcher_type)
+
+
+def is_known(fetcher_type: str) -> bool:
+    return _module_path(fetcher_type) is not None
+
+
+def available() -> list[str]:
+    return sorted({*FETCHER_MODULES, *_entry_point_modules()})
+
+
+def load(fetcher_type: str) -> ModuleType:
+    """Importe le module du fetcher au premier appel, puis le garde en cache."""
+    module = _LOADED.get(fetcher_type)
+    if module is None:
+        path = _module_path(fetcher_type)
+        if path is None:
+            raise KeyError(f"Aucun fetcher pour '{fetcher_type}'.")
+        module = importlib.import_module(path)
+        _LOADED[fetcher_type] = module
+    return module
+
+
+def get_fetcher(fetcher_type: str) -> Callable:
+    return load(fetcher_type).fetch
+
+
+def get_async_fetcher(fetcher_type: str) -> Callable | None:
+    return getattr(load(fetcher_type), "fetch_async", None)
@@ -9,11 +9,15 @@ from datetime import datetime, timezone, timedelta
 from typing import Any, Dict, List, Optional
 
 import httpx
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
+from playwright.sync_api import TimeoutError as PWTimeout
+from .browser_pool import browser_session
+from .http_pool import get_client
 
-from models import JobPosting
+from models import JobPosting, Listing
 from storage.classifier import classify_job, normalize_contract_type, enrich_location
+from storage.sqlite_repo import seen_jobs
 from .scraper import scrape_page_for_structured_data
+from .watermark import Watermark
 
 # --- Constantes ---
 HOME = "https://careers.societegenerale.com"
@@ -106,22 +110,22 @@ def _fetch_token_via_httpx() -> Optional[str]:
     Si 200 et JSON {"token": "..."} → on renvoie le token.
     """
     try:
-        with httpx.Client(http2=True, headers=HEADERS_BASE, follow_redirects=True, timeout=20) as cli:
-            # warm-up: certains CDN posent des cookies après un premier GET
-            cli.get(HOME)
-            cli.get(f"{HOME}/rechercher")
-            for url in (URL_GET_TOKEN_A, URL_GET_TOKEN_B):
-                r = cli.get(url, headers={**HEADERS_BASE, "Cache-Control": "no-cache"})
-                if r.status_code != 200:
-                    continue
-                try:
-                    data = r.json()
-                except Exception:
-                    continue
-                tok = data.get("token")
-                if isinstance(tok, str) and len(tok.split(".")) == 3:
-                    print("[SG] Token récupéré via get-token (HTTP).")
-                    return tok
+        cli = get_client(HOME)
+        # warm-up: certains CDN posent des cookies après un premier GET
+        cli.get(HOME, headers=HEADERS_BASE, follow_redirects=True)
+        cli.get(f"{HOME}/rechercher", headers=HEADERS_BASE, follow_redirects=True)
+        for url in (URL_GET_TOKEN_A, URL_GET_TOKEN_B):
+            r = cli.get(url, headers={**HEADERS_BASE, "Cache-Control": "no-cache"}, follow_redirects=True)
+            if r.status_code != 200:
+                continue
+            try:
+                data = r.json()
+            except Exception:
+                continue
+            tok = data.get("token")
+            if isinstance(tok, str) and len(tok.split(".")) == 3:
+                print("[SG] Token récupéré via get-token (HTTP).")
+                return tok
     except Exception as e:
         print(f"[SG] get-token HTTP a échoué: {e}")
     return None
@@ -134,8 +138,7 @@ def _fetch_token_via_browser() -> Optional[str]:
     """
     token: Optional[str] = None
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True, channel="chrome")
+        with browser_session(headless=True, channel="chrome") as browser:
             context = browser.new_context(
                 locale="fr-FR",
                 user_agent=HEADERS_BASE["User-Agent"],
@@ -214,6 +217,46 @@ def _get_token() -> Optional[str]:
     _TOKEN_CACHE["exp"] = exp
     return tok
 
+async def _fetch_token_via_httpx_async(client: httpx.AsyncClient) -> Optional[str]:
+    """Même parcours que `_fetch_token_via_httpx`, sur le client asyncio partagé."""
+    try:
+        await client.get(HOME, headers=HEADERS_BASE, follow_redirects=True, timeout=20)
+        await client.get(f"{HOME}/rechercher", headers=HEADERS_BASE, follow_redirects=True, timeout=20)
+        for url in (URL_GET_TOKEN_A, URL_GET_TOKEN_B):
+            r = await client.get(url, headers={**HEADERS_BASE, "Cache-Control": "no-cache"}, follow_redirects=True, timeout=20)
+            if r.status_code != 200:
+                continue
+            try:
+                data = r.json()
+            except Exception:
+                continue
+            tok = data.get("token")
+            if isinstance(tok, str) and len(tok.split(".")) == 3:
+                print("[SG] Token récupéré via get-token (HTTP async).")
+                return tok
+    except Exception as e:
+        print(f"[SG] get-token HTTP async a échoué: {e}")
+    return None
+
+async def _get_token_async(client: httpx.AsyncClient, offload) -> Optional[str]:
+    now = int(time.time())
+    tok = _TOKEN_CACHE.get("token")
+    exp = _TOKEN_CACHE.get("exp", 0)
+    if tok and now < exp - 30:
+        return tok
+
+    tok = await _fetch_token_via_httpx_async(client)
+    # Fallback navigateur : délégué au pool de workers
+    if not tok:
+        tok = await offload(_fetch_token_via_browser)
+
+    if not tok:
+        return None
+
+    _TOKEN_CACHE["token"] = tok
+    _TOKEN_CACHE["exp"] = _jwt_exp(tok) or (now + 540)
+    return tok
+
 # --- Extraction robuste des docs ---
 def _extract_docs(data: Dict[str, Any]) -> List[Dict[str, Any]]:
     if not isinstance(data, dict):
@@ -230,139 +273,267 @@ def _extract_docs(data: Dict[str, Any]) -> List[Dict[str, Any]]:
         return docs3
     return []
 
+def _item_link(it: Dict[str, Any]) -> Optional[str]:
+    if isinstance(it.get("success"), dict):
+        return it["success"].get("taleo_link")
+    return it.get("uri") or it.get("resulturl") or it.get("url1")
+
+def _item_id(it: Dict[str, Any]) -> str:
+    """ID brut d'un doc (sans le préfixe `sg-`) ; pour les V.I.E c'est le lien Taleo."""
+    if isinstance(it.get("success"), dict):
+        return str(_item_link(it))
+    return str(it.get("id") or it.get("docid") or _item_link(it))
+
+def _watermark_args(keyword: str) -> dict:
+    return dict(
+        state_key=f"sg_proxy|{keyword or ''}",
+        raw_id=_item_id,
+        job_id=lambda rid: f"sg-{rid}",
+        posted=lambda it: _to_datetime(it.get("sourcedatetime1") or it.get("sourcedatetime2") or it.get("date")),
+    )
+
+def _watermark(keyword: str) -> Watermark:
+    return Watermark(**_watermark_args(keyword))
+
+async def _watermark_async(keyword: str) -> Watermark:
+    return await Watermark.create_async(**_watermark_args(keyword))
+
+def _page_payload(keyword: str, offset: int, page_size: int) -> Dict[str, Any]:
+    payload = json.loads(json.dumps(PAYLOAD_BASE))
+    payload["query"]["text"] = keyword or ""
+    payload["query"]["skipFrom"] = offset
+    payload["query"]["skipCount"] = page_size
+    return payload
+
+def _auth_headers(token: str) -> Dict[str, str]:
+    return {
+        **HEADERS_BASE,
+        "authorization-api": f"Bearer {token}",
+        "Authorization": f"Bearer {token}",
+    }
+
+# --- Enrichissement des offres (Playwright) ---
+def _build_jobs(items: List[Dict[str, Any]], *, keyword: str, hours: int, exhaustive: bool = False) -> Listing:
+    """
+    Enrichit les nouvelles offres ; les offres déjà en base reviennent sous forme minimale
+    (rafraîchissement de `last_seen`). `exhaustive` : la pagination a listé tout le site.
+    """
+    jobs: List[JobPosting] = []
+    known: List[JobPosting] = []
+    now = datetime.now(timezone.utc)
+    print(f"[SG] {len(items)} offres brutes à traiter après pagination…")
+
+    # Tri préalable : le navigateur n'est lancé que si une offre nouvelle demande sa page de détail
+    seen = seen_jobs()
+    todo: List[tuple[str, str, Optional[str], datetime, bool]] = []
+    for it in items:
+        is_vie_offer = isinstance(it.get("success"), dict)
+
+        link = _item_link(it)
+        job_id = _item_id(it)
+        if is_vie_offer:
+            print("  [SG] Format V.I.E détecté.")
+            title = "V.I.E. (Titre à récupérer sur la page)"
+            raw_date = None
+        else:
+            title = it.get("title") or it.get("resulttitle") or it.get("name")
+            raw_date = it.get("sourcedatetime1") or it.get("sourcedatetime2") or it.get("date")
+
+        if not link:
+            print("  [SG] Avertissement: offre ignorée (pas de lien).")
+            continue
+
+        posted = _to_datetime(raw_date) or datetime.now(timezone.utc)
+        if (now - posted).total_seconds() > hours * 3600:
+            continue
+
+        if keyword and title and keyword.lower() not in title.lower():
+            continue
+
+        # Offre déjà en base : pas de navigation vers la page de détail
+        if seen.is_known(f"sg-{job_id}", link):
+            known.append(JobPosting(id=f"sg-{job_id}", title=title, link=link, posted=posted, source="SG", company="Société Générale", keyword=keyword))
+            continue
+        todo.append((job_id, link, title, posted, is_vie_offer))
+    skipped = len(known)
+
+    # Scraping des pages d’offres pour enrichir
+    if todo:
+        with browser_session(headless=True) as browser:
+            page = browser.new_page()
+
+            for job_id, link, title, posted, is_vie_offer in todo:
+                try:
+                    page.goto(link, wait_until="domcontentloaded")
+                    details = scrape_page_for_structured_data(page, page_url=link)
+
+                    if is_vie_offer or (title and "Titre à récupérer" in title):
+                        page_title = page.title()
+                        if page_title and "Job Detail" not in page_title:
+                            title = page_title.split("|")[0].strip()
+                except Exception as e:
+                    print(f"  [SG] Erreur Playwright sur {link}: {e}. Détails ignorés.")
+                    details = {}
+
+                job = JobPosting(
+                    id=f"sg-{job_id}",
+                    title=title,
+                    link=link,
+                    posted=posted,
+                    source="SG",
+                    company="Société Générale",
+                    location=details.get("location"),
+                    keyword=keyword,
+                    contract_type=details.get("contract_type") or ("vie" if is_vie_offer else None),
+                )
+
+                job.location = enrich_location(job.location)
+                job.contract_type = normalize_contract_type(job.title, job.contract_type)
+                job.category = classify_job(job.title)
+                jobs.append(job)
+
+            browser.close()
+
+    if skipped:
+        print(f"[SG] {skipped} offre(s) déjà connue(s), détails non rechargés.")
+    print(f"[SG] Fetcher terminé. {len(jobs)} offres traitées et ajoutées.")
+    return Listing(jobs + known, source="SG", complete=exhaustive and not keyword, since=now - timedelta(hours=hours))
+
 # --- Fonction principale ---
-def fetch(*, keyword: str = "", hours: int = 48, limit: int = 40, **kwargs) -> list[JobPosting]:
+def fetch(*, keyword: str = "", hours: int = 48, limit: int = 40, **kwargs) -> Listing:
     print("[SG] Lancement du fetcher (API)…")
 
     token = _get_token()
     if not token:
         print("[SG] Erreur: access-token introuvable. Arrêt.")
-        return []
-
-    headers = {
-        **HEADERS_BASE,
-        "authorization-api": f"Bearer {token}",
-        "Authorization": f"Bearer {token}",
-    }
+        return Listing(source="SG")
 
     all_items: List[Dict[str, Any]] = []
     offset = 0
     page_size = 20
+    watermark = _watermark(keyword)
+    complete = True
+    exhausted = False
 
     try:
-        with httpx.Client(http2=True, headers=headers, follow_redirects=True, timeout=30) as cli:
-            while True:
-                print(f"  [SG] Page offset={offset}…")
-                payload = json.loads(json.dumps(PAYLOAD_BASE))
-                payload["query"]["text"] = keyword or ""
-                payload["query"]["skipFrom"] = offset
-                payload["query"]["skipCount"] = page_size
-
-                r = cli.post(URL_PROXY, json=payload)
-                if r.status_code in (401, 403):
-                    # Token expiré ou mal reconnu → refresh 1 fois via navigateur
-                    print(f"  [SG] HTTP {r.status_code} sur search-proxy, refresh token…")
-                    _TOKEN_CACHE["token"] = None
-                    _TOKEN_CACHE["exp"] = 0
-                    token2 = _get_token()  # tentera browser si besoin
-                    if not token2:
-                        print("  [SG] Impossible de rafraîchir le token.")
-                        break
-                    cli.headers["authorization-api"] = f"Bearer {token2}"
-                    cli.headers["Authorization"] = f"Bearer {token2}"
-                    r = cli.post(URL_PROXY, json=payload)
-
-                r.raise_for_status()
-                data = r.json()
-
-                new_items = _extract_docs(data)
-                if not new_items:
-                    print("  [SG] Fin de pagination (0 doc).")
+        cli = get_client(URL_PROXY)
+        headers = _auth_headers(token)
+        while True:
+            print(f"  [SG] Page offset={offset}…")
+            payload = _page_payload(keyword, offset, page_size)
+
+            r = cli.post(URL_PROXY, json=payload, headers=headers, follow_redirects=True, timeout=30)
+            if r.status_code in (401, 403):
+                # Token expiré ou mal reconnu → refresh 1 fois via navigateur
+                print(f"  [SG] HTTP {r.status_code} sur search-proxy, refresh token…")
+                _TOKEN_CACHE["token"] = None
+                _TOKEN_CACHE["exp"] = 0
+                token2 = _get_token()  # tentera browser si besoin
+                if not token2:
+                    print("  [SG] Impossible de rafraîchir le token.")
+                    complete = False
                     break
-
-                all_items.extend(new_items)
-                print(f"  [SG] +{len(new_items)} offres (total {len(all_items)})")
-                offset += len(new_items)
-
-                if len(all_items) >= limit:
-                    print(f"  [SG] Limite {limit} atteinte.")
-                    break
-
+                headers = _auth_headers(token2)
+                r = cli.post(URL_PROXY, json=payload, headers=headers, follow_redirects=True, timeout=30)
+
+            r.raise_for_status()
+            data = r.json()
+
+            new_items = _extract_docs(data)
+            if not new_items:
+                print("  [SG] Fin de pagination (0 doc).")
+                exhausted = True
+                break
+
+            all_items.extend(new_items)
+            print(f"  [SG] +{len(new_items)} offres (total {len(all_items)})")
+            offset += len(new_items)
+
+            if len(all_items) >= limit:
+                print(f"  [SG] Limite {limit} atteinte.")
+                break
+            if watermark.reached(new_items):
+                print("  [SG] Page entièrement connue (watermark), fin de pagination.")
+                break
+
+        if complete:
+            watermark.record(all_items)
     except httpx.HTTPStatusError as e:
         print(f"[SG] HTTP {e.response.status_code} sur search-proxy.php: {e}")
-        return []
+        return Listing(source="SG")
     except Exception as e:
         print(f"[SG] Erreur critique lors de la requête API: {e}")
         import traceback; traceback.print_exc()
-        return []
-
-    items = all_items[:limit]
-    jobs: List[JobPosting] = []
-    now = datetime.now(timezone.utc)
-    print(f"[SG] {len(items)} offres brutes à traiter après pagination…")
+        return Listing(source="SG")
 
-    # Scraping des pages d’offres pour enrichir
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-
-        for it in items:
-            is_vie_offer = isinstance(it.get("success"), dict)
-
-            if is_vie_offer:
-                print("  [SG] Format V.I.E détecté.")
-                job_data = it["success"]
-                link = job_data.get("taleo_link")
-                title = "V.I.E. (Titre à récupérer sur la page)"
-                raw_date = None
-                job_id = link
-            else:
-                link = it.get("uri") or it.get("resulturl") or it.get("url1")
-                title = it.get("title") or it.get("resulttitle") or it.get("name")
-                raw_date = it.get("sourcedatetime1") or it.get("sourcedatetime2") or it.get("date")
-                job_id = str(it.get("id") or it.get("docid") or link)
-
-            if not link:
-                print("  [SG] Avertissement: offre ignorée (pas de lien).")
-                continue
-
-            posted = _to_datetime(raw_date) or datetime.now(timezone.utc)
-            if (now - posted).total_seconds() > hours * 3600:
-                continue
+    return _build_jobs(all_items[:limit], keyword=keyword, hours=hours, exhaustive=exhausted and complete)
 
-            if keyword and title and keyword.lower() not in title.lower():
-                continue
+async def fetch_async(*, client: httpx.AsyncClient, offload, keyword: str = "", hours: int = 48, limit: int = 40, **kwargs) -> Listing:
+    """
+    Variante asyncio : token + pagination sur le client partagé du collector,
+    navigateur (fallback token, enrichissement) délégué via `offload`.
+    """
+    print("[SG] Lancement du fetcher (API async)…")
 
-            try:
-                page.goto(link, wait_until="domcontentloaded")
-                details = scrape_page_for_structured_data(page, page_url=link)
-
-                if is_vie_offer or (title and "Titre à récupérer" in title):
-                    page_title = page.title()
-                    if page_title and "Job Detail" not in page_title:
-                        title = page_title.split("|")[0].strip()
-            except Exception as e:
-                print(f"  [SG] Erreur Playwright sur {link}: {e}. Détails ignorés.")
-                details = {}
-
-            job = JobPosting(
-                id=f"sg-{job_id}",
-                title=title,
-                link=link,
-                posted=posted,
-                source="SG",
-                company="Société Générale",
-                location=details.get("location"),
-                keyword=keyword,
-                contract_type=details.get("contract_type") or ("vie" if is_vie_offer else None),
-            )
+    token = await _get_token_async(client, offload)
+    if not token:
+        print("[SG] Erreur: access-token introuvable. Arrêt.")
+        return Listing(source="SG")
 
-            job.location = enrich_location(job.location)
-            job.contract_type = normalize_contract_type(job.title, job.contract_type)
-            job.category = classify_job(job.title)
-            jobs.append(job)
+    headers = _auth_headers(token)
+    all_items: List[Dict[str, Any]] = []
+    offset = 0
+    page_size = 20
+    watermark = await _watermark_async(keyword)
+    complete = True
+    exhausted = False
 
-        browser.close()
+    try:
+        while True:
+            print(f"  [SG] Page offset={offset}…")
+            payload = _page_payload(keyword, offset, page_size)
+
+            r = await client.post(URL_PROXY, json=payload, headers=headers, follow_redirects=True, timeout=30)
+            if r.status_code in (401, 403):
+                print(f"  [SG] HTTP {r.status_code} sur search-proxy, refresh token…")
+                _TOKEN_CACHE["token"] = None
+                _TOKEN_CACHE["exp"] = 0
+                token2 = await _get_token_async(client, offload)
+                if not token2:
+                    print("  [SG] Impossible de rafraîchir le token.")
+                    complete = False
+                    break
+                headers = _auth_headers(token2)
+                r = await client.post(URL_PROXY, json=payload, headers=headers, follow_redirects=True, timeout=30)
+
+            r.raise_for_status()
+            new_items = _extract_docs(r.json())
+            if not new_items:
+                print("  [SG] Fin de pagination (0 doc).")
+                exhausted = True
+                break
+
+            all_items.extend(new_items)
+            print(f"  [SG] +{len(new_items)} offres (total {len(all_items)})")
+            offset += len(new_items)
+
+            if len(all_items) >= limit:
+                print(f"  [SG] Limite {limit} atteinte.")
+                break
+            if watermark.reached(new_items):
+                print("  [SG] Page entièrement connue (watermark), fin de pagination.")
+                break
+
+        if complete:
+            await watermark.record_async(all_items)
+    except httpx.HTTPStatusError as e:
+        print(f"[SG] HTTP {e.response.status_code} sur search-proxy.php: {e}")
+        return Listing(source="SG")
+    except Exception as e:
+        print(f"[SG] Erreur critique lors de la requête API: {e}")
+        return Listing(source="SG")
 
-    print(f"[SG] Fetcher terminé. {len(jobs)} offres traitées et ajoutées.")
-    return jobs
+    items = all_items[:limit]
+    if not items:
+        return Listing(source="SG")
+    return await offload(_build_jobs, items, keyword=keyword, hours=hours, exhaustive=exhausted and complete)
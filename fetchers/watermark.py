@@ -0,0 +1,59 @@
+# Fichier: fetchers/watermark.py
+# Crawl incrémental : arrêt de la pagination dès qu'on retombe sur du déjà-vu.
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from typing import Any, Callable
+
+from storage.sqlite_repo import seen_jobs, get_crawl_state, save_crawl_state
+
+
+class Watermark:
+    """
+    High-water mark d'une source (clé = source / tenant / mot-clé).
+    Une page de liste est "connue" si toutes ses offres figurent dans les IDs du
+    dernier crawl réussi ou dans la base. Sans crawl précédent, on ne coupe jamais.
+    Côté asyncio : `create_async` / `record_async`, car la lecture et l'écriture de
+    crawl_state attendent le verrou du repo, tenu par le thread d'écriture pendant save_jobs.
+    """
+
+    def __init__(
+        self,
+        state_key: str,
+        *,
+        raw_id: Callable[[dict], str],
+        job_id: Callable[[str], str],
+        posted: Callable[[dict], datetime | None],
+    ):
+        self.state_key = state_key
+        self._raw_id = raw_id
+        self._job_id = job_id
+        self._posted = posted
+        state = get_crawl_state(state_key)
+        self.known_ids = set(state["last_ids"]) if state else None
+
+    @classmethod
+    async def create_async(cls, state_key: str, **kwargs) -> "Watermark":
+        return await asyncio.to_thread(cls, state_key, **kwargs)
+
+    def reached(self, page: list[dict[str, Any]]) -> bool:
+        if self.known_ids is None or not page:
+            return False
+        seen = seen_jobs()
+        for item in page:
+            rid = self._raw_id(item)
+            if rid not in self.known_ids and not seen.is_known(self._job_id(rid)):
+                return False
+        return True
+
+    def record(self, items: list[dict[str, Any]]) -> None:
+        """À appeler après une pagination sans erreur."""
+        dates = [d for d in (self._posted(it) for it in items) if d]
+        try:
+            save_crawl_state(self.state_key, newest_posted=max(dates, default=None), ids=[self._raw_id(it) for it in items])
+        except Exception as e:
+            print(f"  [Watermark] crawl_state '{self.state_key}' non enregistré: {e}")
+
+    async def record_async(self, items: list[dict[str, Any]]) -> None:
+        await asyncio.to_thread(self.record, items)
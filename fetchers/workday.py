@@ -1,14 +1,33 @@
 # Fichier: fetchers/workday.py (VERSION FINALE AVEC FILTRES APPLIQUÉS)
 
+import os
 import httpx
 import re
+import json
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from models import JobPosting
-from playwright.sync_api import sync_playwright
+from models import JobPosting, Listing
+from .browser_pool import browser_session
+from .http_pool import get_client
 from storage.classifier import classify_job, enrich_location, normalize_contract_type
+from storage.sqlite_repo import seen_jobs
 from .scraper import scrape_page_for_structured_data
+from .watermark import Watermark
 
 USER_AGENT_STRING = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36'
+PAGE_SIZE = 20
+
+# Détails d'offre : "http" (endpoint CXS JSON, défaut) ou "browser" (Playwright + JSON-LD).
+# Surcharge possible par entrée config.yaml : {type: workday, ..., detail: browser}
+DETAIL_MODE = os.getenv("WORKDAY_DETAIL", "http")
+# Repli Playwright pour les offres dont le détail CXS échoue (désactivé par défaut)
+BROWSER_FALLBACK = os.getenv("WORKDAY_BROWSER_FALLBACK", "0").lower() in ("1", "true", "yes")
+# Requêtes de détail simultanées par tenant
+DETAIL_CONCURRENCY = int(os.getenv("WORKDAY_DETAIL_CONCURRENCY", "8"))
+# Pages de liste demandées en parallèle par tenant (après la 1re page qui donne `total`)
+LIST_CONCURRENCY = int(os.getenv("WORKDAY_LIST_CONCURRENCY", "4"))
 
 # --- Fonctions utilitaires ---
 def _parse_posted(raw: str) -> datetime | None:
@@ -25,100 +44,413 @@ def _parse_posted(raw: str) -> datetime | None:
 def _extract_id(j: dict) -> str:
     return str(j.get("jobPostingId") or j.get("externalPath") or "UNKNOWN")
 
-# --- Fonction principale ---
-def fetch(
-    *,
-    base: str,
-    tenant: str,
-    template: str,
-    source_name: str | None = None,
-    keyword: str = "",
-    hours: int = 48,
-    limit: int = 100,
-    facets: dict | None = None,
-    **kwargs,
-) -> list[JobPosting]:
-    url_root = f"{base}/{template}"
-    url_jobs = f"{base}/wday/cxs/{tenant}/{template}/jobs"
-    headers = { "User-Agent": USER_AGENT_STRING, "Accept": "application/json", "Content-Type": "application/json", "Origin": base, "Referer": url_root, "X-Workday-Client": "job-candidate-portal"}
+def _headers(base: str, template: str) -> dict:
+    return { "User-Agent": USER_AGENT_STRING, "Accept": "application/json", "Content-Type": "application/json", "Origin": base, "Referer": f"{base}/{template}", "X-Workday-Client": "job-candidate-portal"}
+
+def _payload(applied_facets: dict, offset: int, keyword: str) -> dict:
+    return {
+        "appliedFacets": applied_facets,
+        "limit": PAGE_SIZE,
+        "offset": offset,
+        "searchText": keyword or "",
+    }
+
+def _state_key(tenant: str, template: str, keyword: str, facets: dict | None) -> str:
+    key = f"workday:{tenant}/{template}|{keyword or ''}"
+    if facets:
+        key += "|" + hashlib.sha1(json.dumps(facets, sort_keys=True).encode("utf-8")).hexdigest()[:10]
+    return key
+
+def _watermark_args(tenant: str, template: str, keyword: str, facets: dict | None, source_name: str | None) -> dict:
+    prefix = (source_name or tenant.upper()).lower()
+    return dict(
+        state_key=_state_key(tenant, template, keyword, facets),
+        raw_id=_extract_id,
+        job_id=lambda rid: f"{prefix}-{rid}",
+        posted=lambda j: _parse_posted(j.get("postedOn", "")),
+    )
+
+def _watermark(tenant: str, template: str, keyword: str, facets: dict | None, source_name: str | None) -> Watermark:
+    return Watermark(**_watermark_args(tenant, template, keyword, facets, source_name))
 
+async def _watermark_async(tenant: str, template: str, keyword: str, facets: dict | None, source_name: str | None) -> Watermark:
+    return await Watermark.create_async(**_watermark_args(tenant, template, keyword, facets, source_name))
+
+# --- Liste (HTTP) ---
+def _waves(start: int, end: int) -> list[list[int]]:
+    """Offsets restants (après la 1re page) groupés par vagues de LIST_CONCURRENCY requêtes."""
+    offsets = list(range(start, end, PAGE_SIZE))
+    return [offsets[i:i + LIST_CONCURRENCY] for i in range(0, len(offsets), LIST_CONCURRENCY)]
+
+def _extend(all_postings: list[dict], pages: list[list[dict]], *, limit: int, watermark: Watermark) -> str | None:
+    """
+    Ajoute les pages dans l'ordre des offsets. Retourne la raison de l'arrêt
+    ("end", "limit" ou "watermark") dès qu'une condition est atteinte, sinon None.
+    """
+    for new_postings in pages:
+        if not new_postings:
+            print("  [Workday] Plus d'offres trouvées, fin de la pagination.")
+            return "end"
+        all_postings.extend(new_postings)
+        print(f"  [Workday] {len(new_postings)} offres récupérées. Total: {len(all_postings)}.")
+        if len(all_postings) >= limit:
+            print(f"  [Workday] Limite globale de {limit} offres atteinte.")
+            return "limit"
+        if watermark.reached(new_postings):
+            print("  [Workday] Page entièrement connue (watermark), fin de la pagination.")
+            return "watermark"
+    return None
+
+def _end_offset(first: dict, limit: int) -> int:
+    # `total` n'est fiable que sur la première page ; sans lui on borne par la limite
+    total = int(first.get("total") or 0)
+    return min(total, limit) if total else limit
+
+def _is_complete(stop: str | None, first: dict, limit: int) -> bool:
+    """
+    La liste couvre-t-elle tout le tenant ? Oui si la pagination a atteint une page vide,
+    ou si toutes les vagues ont tourné jusqu'à un `total` inférieur à la limite.
+    Un arrêt par limite ou watermark laisse des offres non vues : pas de fermeture possible.
+    """
+    if stop == "end":
+        return True
+    total = int(first.get("total") or 0)
+    return stop is None and 0 < total < limit
+
+def _list_postings(*, base: str, tenant: str, template: str, keyword: str, limit: int, facets: dict | None, watermark: Watermark) -> tuple[list[dict], bool]:
+    """
+    Page 1 seule (elle porte `total`), puis les offsets restants par vagues parallèles.
+    Le watermark est évalué page par page dans l'ordre, entre deux vagues.
+    Retourne (offres, liste complète ?).
+    """
+    url_jobs = f"{base}/wday/cxs/{tenant}/{template}/jobs"
+    headers = _headers(base, template)
     all_postings = []
-    offset = 0
-    page_size = 20
     applied_facets = facets or {}
-
-    print(f"[Workday] Démarrage du fetcher pour {source_name or tenant.upper()}...")
-    if applied_facets:
-        print(f"  [Workday] Utilisation de filtres personnalisés (facets).")
+    cli = get_client(base)
+    complete = False
 
     try:
-        with httpx.Client(headers=headers, timeout=20) as cli:
-            while True:
-                print(f"  [Workday] Récupération offset={offset}…")
-                
-                # --- LA CORRECTION DÉCISIVE : On utilise la variable qui contient les filtres ---
-                payload = {
-                    "appliedFacets": applied_facets,
-                    "limit": page_size,
-                    "offset": offset,
-                    "searchText": keyword or "",
-                }
-                # --- FIN DE LA CORRECTION ---
-
-                r = cli.post(url_jobs, json=payload)
+        with ThreadPoolExecutor(max_workers=LIST_CONCURRENCY) as pool:
+            def page(offset: int) -> dict:
+                r = cli.post(url_jobs, json=_payload(applied_facets, offset, keyword), headers=headers)
                 r.raise_for_status()
+                return r.json()
+
+            print("  [Workday] Récupération offset=0…")
+            first = page(0)
+            first_postings = first.get("jobPostings", [])
+            stop = _extend(all_postings, [first_postings], limit=limit, watermark=watermark)
+            if not stop:
+                for wave in _waves(len(first_postings), _end_offset(first, limit)):
+                    print(f"  [Workday] Récupération offsets={wave[0]}…{wave[-1]} ({len(wave)} en parallèle)…")
+                    pages = list(pool.map(lambda o: page(o).get("jobPostings", []), wave))
+                    stop = _extend(all_postings, pages, limit=limit, watermark=watermark)
+                    if stop:
+                        break
+            complete = _is_complete(stop, first, limit)
+        watermark.record(all_postings)
+    except Exception as e:
+        print(f"[Workday] Erreur lors de la récupération de la liste: {e}")
 
-                response_data = r.json()
-                new_postings = response_data.get("jobPostings", [])
+    return all_postings[:limit], complete
 
-                if not new_postings:
-                    print("  [Workday] Plus d'offres trouvées, fin de la pagination.")
-                    break
+async def _list_postings_async(client: httpx.AsyncClient, *, base: str, tenant: str, template: str, keyword: str, limit: int, facets: dict | None, watermark: Watermark, slots: asyncio.Semaphore) -> tuple[list[dict], bool]:
+    """Comme `_list_postings` ; `slots` borne les requêtes simultanées vers l'hôte du tenant."""
+    url_jobs = f"{base}/wday/cxs/{tenant}/{template}/jobs"
+    headers = _headers(base, template)
+    all_postings = []
+    applied_facets = facets or {}
+    complete = False
 
-                all_postings.extend(new_postings)
-                print(f"  [Workday] {len(new_postings)} offres récupérées. Total: {len(all_postings)}.")
+    async def page(offset: int) -> dict:
+        async with slots:
+            r = await client.post(url_jobs, json=_payload(applied_facets, offset, keyword), headers=headers, timeout=20)
+        r.raise_for_status()
+        return r.json()
 
-                offset += len(new_postings)
-                if len(all_postings) >= limit:
-                    print(f"  [Workday] Limite globale de {limit} offres atteinte.")
+    try:
+        print("  [Workday] Récupération offset=0…")
+        first = await page(0)
+        first_postings = first.get("jobPostings", [])
+        stop = _extend(all_postings, [first_postings], limit=limit, watermark=watermark)
+        if not stop:
+            for wave in _waves(len(first_postings), _end_offset(first, limit)):
+                print(f"  [Workday] Récupération offsets={wave[0]}…{wave[-1]} ({len(wave)} en parallèle)…")
+                pages = [p.get("jobPostings", []) for p in await asyncio.gather(*(page(o) for o in wave))]
+                stop = _extend(all_postings, pages, limit=limit, watermark=watermark)
+                if stop:
                     break
+        complete = _is_complete(stop, first, limit)
+        await watermark.record_async(all_postings)
     except Exception as e:
         print(f"[Workday] Erreur lors de la récupération de la liste: {e}")
 
-    postings = all_postings[:limit]
-    jobs: list[JobPosting] = []
+    return all_postings[:limit], complete
+
+# --- Partitionnement par facet (gros tenants) ---
+def _partitions(facets: dict | None, partition: str | None) -> list[dict | None]:
+    """
+    Une requête de liste par valeur de la facet `partition` (ex: jobFamilyGroup),
+    les autres facets restant appliquées. Sans partition : la requête d'origine.
+    """
+    values = (facets or {}).get(partition) if partition else None
+    if not values or len(values) < 2:
+        if partition:
+            print(f"  [Workday] Partition '{partition}' ignorée (moins de 2 valeurs dans facets).")
+        return [facets]
+    return [{**facets, partition: [v]} for v in values]
+
+def _merge(parts: list[tuple[list[dict], bool]], limit: int) -> tuple[list[dict], bool]:
+    """
+    Fusionne les partitions : dédup par ID, plus récentes d'abord, puis limite globale.
+    Complète seulement si chaque partition l'est et que la limite n'a rien coupé.
+    """
+    merged = {}
+    for postings, _ in parts:
+        for j in postings:
+            merged.setdefault(_extract_id(j), j)
+    epoch = datetime.min.replace(tzinfo=timezone.utc)
+    ordered = sorted(merged.values(), key=lambda j: _parse_posted(j.get("postedOn", "")) or epoch, reverse=True)
+    complete = all(c for _, c in parts) and len(ordered) <= limit
+    return ordered[:limit], complete
+
+def _list_all(*, base: str, tenant: str, template: str, keyword: str, limit: int, facets: dict | None, partition: str | None, source_name: str | None) -> tuple[list[dict], bool]:
+    parts = _partitions(facets, partition)
+    if len(parts) > 1:
+        print(f"  [Workday] Liste partitionnée sur '{partition}' ({len(parts)} requêtes).")
+    results = [
+        _list_postings(base=base, tenant=tenant, template=template, keyword=keyword, limit=limit, facets=f,
+                       watermark=_watermark(tenant, template, keyword, f, source_name))
+        for f in parts
+    ]
+    return _merge(results, limit) if len(parts) > 1 else results[0]
+
+async def _list_all_async(client: httpx.AsyncClient, *, base: str, tenant: str, template: str, keyword: str, limit: int, facets: dict | None, partition: str | None, source_name: str | None) -> tuple[list[dict], bool]:
+    parts = _partitions(facets, partition)
+    if len(parts) > 1:
+        print(f"  [Workday] Liste partitionnée sur '{partition}' ({len(parts)} requêtes).")
+    # Un seul plafond pour toutes les partitions : elles visent le même hôte
+    slots = asyncio.Semaphore(LIST_CONCURRENCY)
+    watermarks = await asyncio.gather(*(_watermark_async(tenant, template, keyword, f, source_name) for f in parts))
+    results = await asyncio.gather(*(
+        _list_postings_async(client, base=base, tenant=tenant, template=template, keyword=keyword, limit=limit, facets=f,
+                             watermark=wm, slots=slots)
+        for f, wm in zip(parts, watermarks)
+    ))
+    return _merge(list(results), limit) if len(parts) > 1 else results[0]
+
+# --- Sélection des offres à enrichir ---
+def _candidates(postings: list[dict], *, base: str, template: str, keyword: str, hours: int, source: str) -> tuple[list[dict], list[JobPosting]]:
+    """
+    Filtre date / mot-clé et écarte les offres déjà en base avant tout appel de détail.
+    Les offres connues reviennent à part, sous forme minimale : elles servent seulement
+    à rafraîchir `last_seen` en base.
+    """
     now = datetime.now(timezone.utc)
+    seen = seen_jobs()
+    skipped = 0
+    candidates = []
+    known = []
+    for j in postings:
+        posted = _parse_posted(j.get("postedOn", ""))
+        if not posted or (now - posted).total_seconds() > hours * 3600: continue
+        if keyword and keyword.lower() not in j["title"].lower(): continue
+        link = f"{base}/{template}{j['externalPath']}"
+        job_id = f"{source.lower()}-{_extract_id(j)}"
+        if seen.is_known(job_id, link):
+            skipped += 1
+            known.append(JobPosting(id=job_id, title=j["title"], link=link, posted=posted, source=source, company=source, location=j.get("locationsText"), keyword=keyword))
+            continue
+        candidates.append({"raw": j, "posted": posted, "link": link, "id": job_id})
+    if skipped:
+        print(f"[Workday] {skipped} offre(s) déjà connue(s), détails non rechargés.")
+    return candidates, known
 
-    if not postings:
-        print("[Workday] Aucune offre brute à traiter.")
-        return []
+def _make_job(c: dict, details: dict, *, source: str, keyword: str) -> JobPosting:
+    j = c["raw"]
+    job = JobPosting(id=c["id"], title=j["title"], link=c["link"], posted=c["posted"], source=source, company=source, location=details.get("location") or j.get("locationsText"), keyword=keyword, contract_type=details.get("contract_type"))
+    job.location = enrich_location(job.location)
+    job.contract_type = normalize_contract_type(job.title, job.contract_type)
+    job.category = classify_job(job.title)
+    return job
 
-    print(f"[Workday] {len(postings)} offres brutes à traiter après pagination...")
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+# --- Détails (HTTP, endpoint CXS) ---
+def _detail_url(base: str, tenant: str, template: str, external_path: str) -> str:
+    return f"{base}/wday/cxs/{tenant}/{template}{external_path}"
+
+def _parse_detail(data: dict) -> dict:
+    """Même forme que scrape_page_for_structured_data : {"location": "Ville, Pays", "contract_type": ...}."""
+    info = data.get("jobPostingInfo") or {}
+    city = info.get("location")
+    country = (info.get("country") or {}).get("descriptor")
+    return {
+        "location": f"{city}, {country}" if city and country else city,
+        "contract_type": info.get("timeType"),
+    }
+
+def _details_http(candidates: list[dict], *, base: str, tenant: str, template: str) -> list[dict | None]:
+    """Détails en parallèle sur le client HTTP/2 de l'hôte ; None pour les offres en échec."""
+    cli = get_client(base)
+    headers = _headers(base, template)
+
+    def one(c: dict) -> dict | None:
+        try:
+            r = cli.get(_detail_url(base, tenant, template, c["raw"]["externalPath"]), headers=headers)
+            r.raise_for_status()
+            return _parse_detail(r.json())
+        except Exception as e:
+            print(f"  [Workday] Détail CXS indisponible pour {c['link']}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=DETAIL_CONCURRENCY) as pool:
+        return list(pool.map(one, candidates))
+
+async def _details_async(client: httpx.AsyncClient, candidates: list[dict], *, base: str, tenant: str, template: str) -> list[dict | None]:
+    headers = _headers(base, template)
+    slots = asyncio.Semaphore(DETAIL_CONCURRENCY)
+
+    async def one(c: dict) -> dict | None:
+        async with slots:
+            try:
+                r = await client.get(_detail_url(base, tenant, template, c["raw"]["externalPath"]), headers=headers, timeout=20)
+                r.raise_for_status()
+                return _parse_detail(r.json())
+            except Exception as e:
+                print(f"  [Workday] Détail CXS indisponible pour {c['link']}: {e}")
+                return None
+
+    return list(await asyncio.gather(*(one(c) for c in candidates)))
+
+# --- Détails (Playwright, opt-in / fallback) ---
+def _details_browser(candidates: list[dict]) -> list[dict | None]:
+    details: list[dict | None] = []
+    with browser_session(headless=True) as browser:
         context = browser.new_context(user_agent=USER_AGENT_STRING)
         page = context.new_page()
         page.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
 
-        for j in postings:
+        for c in candidates:
             page.wait_for_timeout(500)
-            posted = _parse_posted(j.get("postedOn", ""))
-            if not posted or (now - posted).total_seconds() > hours * 3600: continue
-            if keyword and keyword.lower() not in j["title"].lower(): continue
-            link = f"{base}/{template}{j['externalPath']}"
             try:
-                page.goto(link, wait_until='domcontentloaded', timeout=30000)
+                page.goto(c["link"], wait_until='domcontentloaded', timeout=30000)
             except Exception as e:
-                print(f"  [Workday] Erreur de navigation vers {link}: {e}. Offre ignorée.")
+                print(f"  [Workday] Erreur de navigation vers {c['link']}: {e}. Offre ignorée.")
+                details.append(None)
                 continue
-
-            details = scrape_page_for_structured_data(page, page_url=link)
-            final_source_name = source_name or tenant.upper()
-            job = JobPosting(id=f"{final_source_name.lower()}-{_extract_id(j)}", title=j["title"], link=link, posted=posted, source=final_source_name, company=final_source_name, location=details.get("location") or j.get("locationsText"), keyword=keyword, contract_type=details.get("contract_type"))
-            job.location = enrich_location(job.location)
-            job.contract_type = normalize_contract_type(job.title, job.contract_type)
-            job.category = classify_job(job.title)
-            jobs.append(job)
+            details.append(scrape_page_for_structured_data(page, page_url=c["link"]))
         browser.close()
+    return details
+
+def _detail_mode(detail: str | None) -> str:
+    mode = (detail or DETAIL_MODE).lower()
+    return mode if mode in ("http", "browser") else "http"
 
+def _assemble(candidates: list[dict], details: list[dict | None], *, source: str, keyword: str, drop_missing: bool) -> list[JobPosting]:
+    jobs = []
+    for c, d in zip(candidates, details):
+        if d is None and drop_missing:
+            continue
+        jobs.append(_make_job(c, d or {}, source=source, keyword=keyword))
     return jobs
+
+# --- Fonction principale ---
+def fetch(
+    *,
+    base: str,
+    tenant: str,
+    template: str,
+    source_name: str | None = None,
+    keyword: str = "",
+    hours: int = 48,
+    limit: int = 100,
+    facets: dict | None = None,
+    partition: str | None = None,
+    detail: str | None = None,
+    **kwargs,
+) -> Listing:
+    source = source_name or tenant.upper()
+    print(f"[Workday] Démarrage du fetcher pour {source}...")
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    if facets:
+        print(f"  [Workday] Utilisation de filtres personnalisés (facets).")
+
+    postings, complete = _list_all(base=base, tenant=tenant, template=template, keyword=keyword, limit=limit, facets=facets, partition=partition, source_name=source_name)
+    if not postings:
+        print("[Workday] Aucune offre brute à traiter.")
+        # Liste vide : souvent une réponse dégradée, jamais prise pour une fermeture en masse
+        return Listing(source=source)
+
+    print(f"[Workday] {len(postings)} offres brutes à traiter après pagination...")
+    candidates, known = _candidates(postings, base=base, template=template, keyword=keyword, hours=hours, source=source)
+    # Sans mot-clé, une liste complète permet de fermer les offres disparues du tenant
+    listing = Listing(known, source=source, complete=complete and not keyword, since=since)
+    if not candidates:
+        return listing
+
+    if _detail_mode(detail) == "browser":
+        details = _details_browser(candidates)
+        listing[:0] = _assemble(candidates, details, source=source, keyword=keyword, drop_missing=True)
+        return listing
+
+    details = _details_http(candidates, base=base, tenant=tenant, template=template)
+    missing = [i for i, d in enumerate(details) if d is None]
+    if missing and BROWSER_FALLBACK:
+        print(f"  [Workday] {len(missing)} détail(s) via Playwright (fallback).")
+        for i, d in zip(missing, _details_browser([candidates[i] for i in missing])):
+            details[i] = d
+    listing[:0] = _assemble(candidates, details, source=source, keyword=keyword, drop_missing=False)
+    return listing
+
+async def fetch_async(
+    *,
+    client: httpx.AsyncClient,
+    offload,
+    base: str,
+    tenant: str,
+    template: str,
+    source_name: str | None = None,
+    keyword: str = "",
+    hours: int = 48,
+    limit: int = 100,
+    facets: dict | None = None,
+    partition: str | None = None,
+    detail: str | None = None,
+    **kwargs,
+) -> Listing:
+    """
+    Variante asyncio : liste et détails CXS passent par le client HTTP partagé du collector ;
+    Playwright (opt-in ou fallback) est délégué au pool navigateur via `offload`.
+    """
+    source = source_name or tenant.upper()
+    print(f"[Workday] Démarrage du fetcher (async) pour {source}...")
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    if facets:
+        print("  [Workday] Utilisation de filtres personnalisés (facets).")
+
+    postings, complete = await _list_all_async(client, base=base, tenant=tenant, template=template, keyword=keyword, limit=limit, facets=facets, partition=partition, source_name=source_name)
+    if not postings:
+        print("[Workday] Aucune offre brute à traiter.")
+        # Liste vide : souvent une réponse dégradée, jamais prise pour une fermeture en masse
+        return Listing(source=source)
+
+    print(f"[Workday] {len(postings)} offres brutes à traiter après pagination...")
+    candidates, known = _candidates(postings, base=base, template=template, keyword=keyword, hours=hours, source=source)
+    # Sans mot-clé, une liste complète permet de fermer les offres disparues du tenant
+    listing = Listing(known, source=source, complete=complete and not keyword, since=since)
+    if not candidates:
+        return listing
+
+    if _detail_mode(detail) == "browser":
+        details = await offload(_details_browser, candidates)
+        listing[:0] = _assemble(candidates, details, source=source, keyword=keyword, drop_missing=True)
+        return listing
+
+    details = await _details_async(client, candidates, base=base, tenant=tenant, template=template)
+    missing = [i for i, d in enumerate(details) if d is None]
+    if missing and BROWSER_FALLBACK:
+        print(f"  [Workday] {len(missing)} détail(s) via Playwright (fallback).")
+        for i, d in zip(missing, await offload(_details_browser, [candidates[i] for i in missing])):
+            details[i] = d
+    listing[:0] = _assemble(candidates, details, source=source, keyword=keyword, drop_missing=False)
+    return listing
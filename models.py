@@ -16,7 +16,23 @@ class JobPosting:
     category: str = "Autre"
     # ✨ NOUVEAU CHAMP AJOUTÉ
     contract_type: str | None = None
+    # Renseigné à l'insertion : ID de tête du groupe si l'offre est un quasi-doublon
+    duplicate_of: str | None = None
 
     def __post_init__(self):
         if self.company is None:
-            self.company = self.source
\ No newline at end of file
+            self.company = self.source
+
+
+class Listing(list):
+    """
+    Liste de JobPosting renvoyée par un fetcher qui sait si son crawl est exhaustif.
+    `complete=True` : toutes les offres de `source` publiées depuis `since` ont été listées
+    (y compris celles déjà en base) ; les autres peuvent être marquées fermées.
+    """
+
+    def __init__(self, jobs=(), *, source: str | None = None, complete: bool = False, since: datetime | None = None):
+        super().__init__(jobs)
+        self.source = source
+        self.complete = complete
+        self.since = since
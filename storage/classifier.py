@@ -1,12 +1,18 @@
 # Fichier: storage/classifier.py
 from __future__ import annotations
+import os
 import re
 import json
+import atexit
+import hashlib
 import unicodedata
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor
 import html
 
+from storage.classify_cache import ClassificationCache, MISS
+
 
 # -------------------------------------------------------------
 # Utils
@@ -526,24 +532,146 @@ _RULES_COMPILED: list[tuple[re.Pattern, str, str]] = [
 
 
 # -------------------------------------------------------------
-# Classification
+# Préfiltre : littéraux requis par règle + automate Aho-Corasick
 # -------------------------------------------------------------
+# Pour chaque règle, on extrait de son arbre syntaxique un ensemble de littéraux dont
+# au moins un figure forcément dans tout texte qu'elle accepte (ex: {"research"} pour
+# "(credit|equity|macro)\s+research"). Un seul passage de l'automate sur le titre donne
+# les littéraux présents, donc les règles candidates, évaluées ensuite dans l'ordre de
+# la cascade : le résultat est identique, les règles impossibles ne sont jamais lancées.
+# Une règle sans littéral requis extractible reste candidate pour tous les textes.
 
-def classify_by_rules(text: str) -> Optional[str]:
-    if not text:
+try:
+    import re._parser as _sre_parse  # Python 3.11+
+    from re._constants import (LITERAL as _LITERAL, SUBPATTERN as _SUBPATTERN, BRANCH as _BRANCH,
+                               MAX_REPEAT as _MAX_REPEAT, MIN_REPEAT as _MIN_REPEAT)
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+    from sre_constants import (LITERAL as _LITERAL, SUBPATTERN as _SUBPATTERN, BRANCH as _BRANCH,
+                               MAX_REPEAT as _MAX_REPEAT, MIN_REPEAT as _MIN_REPEAT)
+
+
+def _best_factor(factors: list[set[str]]) -> Optional[set[str]]:
+    # Le plus sélectif : littéral le plus court le plus long, puis le moins d'alternatives
+    factors = [f for f in factors if f and "" not in f]
+    if not factors:
         return None
-    lower_clean = _soft_normalize(text)
-    for regex, category, _ in _RULES_COMPILED:
+    return max(factors, key=lambda f: (min(map(len, f)), -len(f)))
+
+
+def _required_literals(items) -> Optional[set[str]]:
+    """Littéraux dont au moins un apparaît dans tout match de la séquence `items` (None = inconnu)."""
+    factors: list[set[str]] = []
+    run = ""
+    for op, av in items:
+        if op is _LITERAL:
+            run += chr(av)
+            continue
+        if run:
+            factors.append({run})
+            run = ""
+        if op is _SUBPATTERN:
+            _group, add_flags, _del_flags, sub = av
+            if not add_flags:
+                found = _required_literals(sub)
+                if found:
+                    factors.append(found)
+        elif op is _BRANCH:
+            alternatives = [_required_literals(seq) for seq in av[1]]
+            if all(alternatives):
+                factors.append(set().union(*alternatives))
+        elif op in (_MAX_REPEAT, _MIN_REPEAT):
+            lo, _hi, sub = av
+            if lo >= 1:
+                found = _required_literals(sub)
+                if found:
+                    factors.append(found)
+        # AT (\b), ANY, IN, assertions… : aucun littéral garanti
+    if run:
+        factors.append({run})
+    return _best_factor(factors)
+
+
+class _LiteralIndex:
+    """Automate Aho-Corasick : un passage sur le texte → ensemble des règles candidates."""
+
+    def __init__(self, rules: list[Optional[set[str]]]):
+        self.always = frozenset(i for i, lits in enumerate(rules) if not lits)
+        self.goto: list[dict[str, int]] = [{}]
+        self.out: list[set[int]] = [set()]
+        for i, lits in enumerate(rules):
+            for lit in lits or ():
+                node = 0
+                for ch in lit:
+                    nxt = self.goto[node].get(ch)
+                    if nxt is None:
+                        nxt = len(self.goto)
+                        self.goto[node][ch] = nxt
+                        self.goto.append({})
+                        self.out.append(set())
+                    node = nxt
+                self.out[node].add(i)
+        # Liens d'échec en largeur ; les sorties héritent de celles du suffixe
+        self.fail = [0] * len(self.goto)
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for ch, nxt in self.goto[node].items():
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] |= self.out[self.fail[nxt]]
+                queue.append(nxt)
+
+    def candidates(self, text: str) -> list[int]:
+        goto, fail, out = self.goto, self.fail, self.out
+        found = set(self.always)
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return sorted(found)
+
+
+def _rule_literals(regex: re.Pattern) -> Optional[set[str]]:
+    if regex.flags & re.IGNORECASE:
+        return None  # littéraux sensibles à la casse : pas de garantie
+    return _required_literals(_sre_parse.parse(regex.pattern, regex.flags))
+
+
+_RULE_INDEX = _LiteralIndex([_rule_literals(rx) for rx, _, _ in _RULES_COMPILED])
+
+
+# -------------------------------------------------------------
+# Classification
+# -------------------------------------------------------------
+
+def _classify_normalized(lower_clean: str) -> Optional[str]:
+    for i in _RULE_INDEX.candidates(lower_clean):
+        regex, category, _ = _RULES_COMPILED[i]
         if regex.search(lower_clean):
             return category
     return None
 
 
+def classify_by_rules(text: str) -> Optional[str]:
+    if not text:
+        return None
+    return _classify_normalized(_soft_normalize(text))
+
+
 def classify_job_with_why(text: str) -> tuple[str, str]:
     if not text:
         return ("Autre", "—")
-    lower_clean = prep_text(text)
-    for regex, category, why_tag in _RULES_COMPILED:
+    return _why_normalized(prep_text(text))
+
+
+def _why_normalized(lower_clean: str) -> tuple[str, str]:
+    for i in _RULE_INDEX.candidates(lower_clean):
+        regex, category, why_tag = _RULES_COMPILED[i]
         m = regex.search(lower_clean)
         if m:
             matched = m.group(0)
@@ -555,16 +683,109 @@ def classify_job_with_why(text: str) -> tuple[str, str]:
 
 
 def classify_job(text: str, location: str = "") -> str:
-    return classify_by_rules(text) or "Autre"
+    # Clé = texte normalisé comme le voit classify_by_rules : les variantes de casse / accents partagent l'entrée
+    key = _soft_normalize(text)
+    category = _CACHE.get("category", key)
+    if category is MISS:
+        category = classify_by_rules(text) or "Autre"
+        _CACHE.put("category", key, category)
+    return category
+
+
+# -------------------------------------------------------------
+# Classification par lots (retraitement de l'historique)
+# -------------------------------------------------------------
+
+# Titres distincts à calculer en dessous desquels le démarrage d'un pool coûte plus qu'il ne rapporte
+CLASSIFY_POOL_MIN = int(os.getenv("CLASSIFY_POOL_MIN", "2000"))
+
+
+def _classify_chunk(texts: list[str]) -> list[str]:
+    # Fonctions de module : picklables pour le pool
+    return [_classify_normalized(t) or "Autre" for t in texts]
+
+
+def _why_chunk(texts: list[str]) -> list[tuple[str, str]]:
+    return [_why_normalized(t) for t in texts]
+
+
+def _map_unique(chunk_fn: Callable[[list[str]], list], texts: list[str], *, workers: Optional[int], executor: Optional[Executor]) -> list:
+    """Applique `chunk_fn` aux textes distincts, en parallèle si le lot le justifie ; ordre conservé."""
+    workers = workers or os.cpu_count() or 1
+    if len(texts) < CLASSIFY_POOL_MIN or (executor is None and workers <= 1):
+        return chunk_fn(texts)
+    size = -(-len(texts) // (workers * 4))
+    chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+    if executor is not None:
+        return [r for part in executor.map(chunk_fn, chunks) for r in part]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [r for part in pool.map(chunk_fn, chunks) for r in part]
+
+
+def classify_many(titles: list[str], *, workers: Optional[int] = None, executor: Optional[Executor] = None) -> list[str]:
+    """
+    `classify_job` sur une liste de titres, résultats dans l'ordre. Normalisation en une
+    passe, calcul une seule fois par titre normalisé distinct absent du cache, réparti sur
+    un pool de processus (`workers`, défaut : nombre de CPU ; 1 = sans pool, ou `executor`
+    fourni) au-delà de CLASSIFY_POOL_MIN titres à calculer.
+    """
+    keys = [_soft_normalize(t) for t in titles]
+    results: dict[str, str] = {}
+    todo: list[str] = []
+    for key in dict.fromkeys(keys):
+        hit = _CACHE.get("category", key)
+        if hit is MISS:
+            todo.append(key)
+        else:
+            results[key] = hit
+    computed = dict(zip(todo, _map_unique(_classify_chunk, todo, workers=workers, executor=executor)))
+    _CACHE.put_many("category", computed)
+    results.update(computed)
+    return [results[k] for k in keys]
+
+
+def classify_many_with_why(titles: list[str], *, workers: Optional[int] = None,
+                           executor: Optional[Executor] = None) -> list[tuple[str, str]]:
+    """`classify_job_with_why` par lots (même répartition que classify_many, sans cache)."""
+    keys = [prep_text(t) for t in titles]
+    todo = list(dict.fromkeys(keys))
+    results = dict(zip(todo, _map_unique(_why_chunk, todo, workers=workers, executor=executor)))
+    return [results[k] for k in keys]
 
 
 # -------------------------------------------------------------
 # Normalisation du type de contrat
 # -------------------------------------------------------------
 
+_CONTRACT_SPECIFIC_TERMS = {
+    'stage': 'stage', 'internship': 'stage', 'intern': 'stage', 'stagiaire': 'stage', 'summer internship': 'stage',
+    'alternance': 'alternance', 'apprentissage': 'alternance', 'apprenticeship': 'alternance',
+    'alternant': 'alternance', 'apprenti': 'alternance', 'work study': 'alternance',
+    'contrat pro': 'alternance', 'professionalisation': 'alternance',
+    'cdd': 'cdd', 'contrat a duree determinee': 'cdd', 'temporary': 'cdd', 'contract': 'cdd', 'interim': 'cdd',
+    'freelance': 'freelance', 'independant': 'freelance', 'contractor': 'freelance',
+    'graduate program': 'cdi', 'graduate': 'cdi', 'trainee program': 'cdi',
+    'part time': 'cdi', 'temps partiel': 'cdi', 'full time': 'cdi',
+}
+
+_SENIORITY_IMPLIES_CDI = (
+    'analyst', 'associate', 'vp', 'vice president', 'director', 'managing director',
+    'manager', 'specialist', 'executive', 'officer', 'engineer', 'lead', 'head'
+)
+
+_CONTRACT_GENERIC_TERMS = {'cdi': 'cdi', 'contrat a duree indeterminee': 'cdi', 'permanent': 'cdi', 'regular': 'cdi'}
+
+
 def normalize_contract_type(title: str, raw_text: str | None) -> str:
     combined = strip_accents(f"{raw_text or ''} {title or ''}")
+    contract = _CACHE.get("contract", combined)
+    if contract is MISS:
+        contract = _contract_type_of(combined)
+        _CACHE.put("contract", combined, contract)
+    return contract
 
+
+def _contract_type_of(combined: str) -> str:
     # "VIE" sans séparateurs doit être en majuscules, mais la forme avec points ou espaces
     # (ex: "v.i.e" ou "V I E") est acceptée quel que soit le casing
     match_vie = re.search(r"\bV[. ]?I[. ]?E\b", combined, re.IGNORECASE)
@@ -572,30 +793,15 @@ def normalize_contract_type(title: str, raw_text: str | None) -> str:
         return "vie"
 
     combined_text = combined.lower().replace('-', ' ').replace('_', ' ')
-    specific_terms = {
-        'stage': 'stage', 'internship': 'stage', 'intern': 'stage', 'stagiaire': 'stage', 'summer internship': 'stage',
-        'alternance': 'alternance', 'apprentissage': 'alternance', 'apprenticeship': 'alternance',
-        'alternant': 'alternance', 'apprenti': 'alternance', 'work study': 'alternance',
-        'contrat pro': 'alternance', 'professionalisation': 'alternance',
-        'cdd': 'cdd', 'contrat a duree determinee': 'cdd', 'temporary': 'cdd', 'contract': 'cdd', 'interim': 'cdd',
-        'freelance': 'freelance', 'independant': 'freelance', 'contractor': 'freelance',
-        'graduate program': 'cdi', 'graduate': 'cdi', 'trainee program': 'cdi',
-        'part time': 'cdi', 'temps partiel': 'cdi', 'full time': 'cdi',
-    }
-    for k, v in specific_terms.items():
+    for k, v in _CONTRACT_SPECIFIC_TERMS.items():
         if k in combined_text:
             return v
 
-    seniority_implies_cdi = {
-        'analyst', 'associate', 'vp', 'vice president', 'director', 'managing director',
-        'manager', 'specialist', 'executive', 'officer', 'engineer', 'lead', 'head'
-    }
-    for k in seniority_implies_cdi:
+    for k in _SENIORITY_IMPLIES_CDI:
         if k in combined_text:
             return 'cdi'
 
-    generic_terms = {'cdi': 'cdi', 'contrat a duree indeterminee': 'cdi', 'permanent': 'cdi', 'regular': 'cdi'}
-    for k, v in generic_terms.items():
+    for k, v in _CONTRACT_GENERIC_TERMS.items():
         if k in combined_text:
             return v
 
@@ -630,6 +836,8 @@ __all__ = [
     "classify_by_rules",
     "classify_job",
     "classify_job_with_why",
+    "classify_many",
+    "classify_many_with_why",
     "normalize_contract_type",
     "enrich_location",
 ]
@@ -1054,21 +1262,38 @@ _COUNTRY_ALIASES = {
 
 
 # --- Regex builder pour alias (FIX) ---
-def _alias_to_regex(alias: str) -> re.Pattern:
+def _alias_to_pattern(alias: str) -> Optional[str]:
     # on aligne avec prep_text pour la clé mais on matche en IGNORECASE
     a = prep_text(alias).strip()
     if not a:
-        # fallback defensi f: impossible en pratique avec nos alias actuels
-        return re.compile(r"(?!x)x")
+        # alias vide : ignoré (impossible en pratique avec nos alias actuels)
+        return None
     parts = re.split(r"\s+", a)
     escaped = [re.escape(p) for p in parts if p]
-    pattern = r"\b" + r"\s+".join(escaped) + r"\b"
-    return re.compile(pattern, flags=re.IGNORECASE)
+    return r"\s+".join(escaped)
 
 
-_COUNTRY_REGEXES: list[tuple[re.Pattern, str]] = [
-    (_alias_to_regex(alias), iso) for alias, iso in _COUNTRY_ALIASES.items()
-]
+def _build_country_matcher() -> re.Pattern:
+    """
+    Tous les alias en une seule regex : un groupe nommé par code ISO, groupes triés par code.
+    `search` s'arrête à la position la plus à gauche où un alias matche ; à position égale,
+    l'alternation essaie les codes dans l'ordre, donc le plus petit code gagne (même règle
+    que l'ancien tri (start, iso) des matches alias par alias). Dans un groupe, alias les
+    plus longs d'abord : sans effet sur le résultat.
+    """
+    by_iso: dict[str, set[str]] = {}
+    for alias, iso in _COUNTRY_ALIASES.items():
+        pattern = _alias_to_pattern(alias)
+        if pattern:
+            by_iso.setdefault(iso, set()).add(pattern)
+    groups = [
+        f"(?P<{iso}>{'|'.join(sorted(patterns, key=lambda p: (-len(p), p)))})"
+        for iso, patterns in sorted(by_iso.items())
+    ]
+    return re.compile(r"\b(?:" + "|".join(groups) + r")\b", flags=re.IGNORECASE)
+
+
+_COUNTRY_MATCHER = _build_country_matcher()
 
 # Set ISO codes
 _ISO2_SET = set(_COUNTRY_CANON.keys())
@@ -1081,19 +1306,14 @@ def _prep_for_country_scan(text: str) -> str:
     t = re.sub(r"\s+", " ", t).strip()
     return t
 
-# --- Helper: trouver toutes les occurrences pays dans le texte normalisé ---
-def _scan_country_hits(text_norm: str) -> list[tuple[int, str]]:
+# --- Helper: alias pays le plus à gauche dans le texte normalisé ---
+def _first_country_hit(text_norm: str) -> Optional[str]:
     """
-    Retourne [(start_index, ISO2), ...] pour chaque alias détecté dans text_norm.
-    On travaille sur le texte pré-normalisé via _prep_for_country_scan.
+    ISO2 de l'alias détecté le plus à gauche dans text_norm (à égalité : le plus petit code),
+    en un seul passage. On travaille sur le texte pré-normalisé via _prep_for_country_scan.
     """
-    hits: list[tuple[int, str]] = []
-    for pat, iso in _COUNTRY_REGEXES:
-        for m in pat.finditer(text_norm):
-            hits.append((m.start(), iso))
-    # left-most d'abord (puis ISO2 pour la stabilité)
-    hits.sort(key=lambda t: (t[0], t[1]))
-    return hits
+    m = _COUNTRY_MATCHER.search(text_norm)
+    return m.lastgroup if m else None
 
 # Indices explicites de "Canada" (pour lever l'ambiguïté de "CA")
 _CANADA_HINTS = {
@@ -1105,7 +1325,15 @@ _CANADA_HINTS = {
 def normalize_country_from_location(raw_location: str | None) -> dict | None:
     if not raw_location:
         return None
+    info = _CACHE.get("country", raw_location)
+    if info is MISS:
+        info = _country_of(raw_location)
+        _CACHE.put("country", raw_location, info)
+    # Copie : l'appelant peut modifier le dict sans altérer le cache
+    return dict(info) if info else None
+
 
+def _country_of(raw_location: str) -> dict | None:
     t_norm = _prep_for_country_scan(raw_location)
     saw_ca = False  # "CA" vu quelque part (peut être California chez Citi)
 
@@ -1133,14 +1361,13 @@ def normalize_country_from_location(raw_location: str | None) -> dict | None:
             return {"code": iso_up, "name": _COUNTRY_CANON.get(iso_up, iso_up), "confidence": "high"}
 
     # (B) alias multi-langues → on prend le match le plus à gauche
-    hits = _scan_country_hits(t_norm)
-    if not hits:
+    iso = _first_country_hit(t_norm)
+    if iso is None:
         t2 = t_norm.replace(".", " ")  # pour "U.S." / "U.K."
         if t2 != t_norm:
-            hits = _scan_country_hits(t2)
+            iso = _first_country_hit(t2)
 
-    if hits:
-        _, iso = hits[0]
+    if iso:
         return {"code": iso, "name": _COUNTRY_CANON.get(iso, iso), "confidence": "high"}
 
     # (C) Fallback spécifique : "CA" vu mais pas d’indices Canada → US (California)
@@ -1166,3 +1393,40 @@ __all__ += [
     "maybe_append_country",
 ]
 
+
+# -------------------------------------------------------------
+# Cache des classifications (mémoire + disque), clé = empreinte des règles
+# -------------------------------------------------------------
+
+# Incrémenter quand la logique change sans toucher aux tables ci-dessous
+CLASSIFIER_LOGIC_VERSION = 1
+
+
+def _ruleset_fingerprint() -> str:
+    tables = {
+        "logic": CLASSIFIER_LOGIC_VERSION,
+        "overrides": MANUAL_OVERRIDES,
+        "rules": list(RULE_BASED_CLASSIFICATION.items()),
+        "contract": [list(_CONTRACT_SPECIFIC_TERMS.items()), _SENIORITY_IMPLIES_CDI, list(_CONTRACT_GENERIC_TERMS.items())],
+        "aliases": _COUNTRY_ALIASES,
+        "canon": _COUNTRY_CANON,
+        "canada_hints": sorted(_CANADA_HINTS),
+    }
+    return hashlib.sha256(json.dumps(tables, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+RULESET_FINGERPRINT = _ruleset_fingerprint()
+_CACHE = ClassificationCache(RULESET_FINGERPRINT)
+atexit.register(_CACHE.flush)
+
+
+def flush_classification_cache() -> int:
+    """Écrit sur disque les classifications calculées depuis le dernier flush (fin de tâche / de run)."""
+    return _CACHE.flush()
+
+
+__all__ += [
+    "RULESET_FINGERPRINT",
+    "flush_classification_cache",
+]
+
@@ -0,0 +1,133 @@
+# storage/classify_cache.py
+# Cache des classifications (catégorie, type de contrat, pays) : LRU en mémoire devant une
+# table SQLite persistante. Chaque entrée porte l'empreinte du jeu de règles qui l'a produite
+# (voir classifier.RULESET_FINGERPRINT) : toute modification des règles ou des tables d'alias
+# change l'empreinte, les anciennes entrées ne sont plus lues puis sont purgées.
+#
+# Fichier séparé de jobs.db : les workers de fetch écrivent leurs entrées sans disputer
+# le verrou du writer principal.
+import os
+import json
+import pathlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+# Chemin du cache disque ("" = mémoire seule)
+CLASSIFY_CACHE_FILE = os.getenv("CLASSIFY_CACHE_FILE", str(pathlib.Path(__file__).parent / "classify_cache.db"))
+# Entrées gardées en mémoire par process
+CLASSIFY_CACHE_SIZE = int(os.getenv("CLASSIFY_CACHE_SIZE", "50000"))
+# Entrées nouvelles accumulées avant écriture sur disque
+CLASSIFY_CACHE_FLUSH_EVERY = int(os.getenv("CLASSIFY_CACHE_FLUSH_EVERY", "200"))
+
+MISS = object()
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS classification_cache (
+        kind TEXT NOT NULL,
+        key TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        value TEXT,
+        PRIMARY KEY (kind, key)
+    ) WITHOUT ROWID
+"""
+
+class ClassificationCache:
+    """
+    LRU (kind, clé normalisée) → valeur JSON-sérialisable, chargé depuis / écrit vers le disque.
+    Partagé entre la boucle asyncio (fetchers) et le thread d'écriture (save_jobs) : verrouillé.
+    """
+
+    def __init__(self, fingerprint: str, path: str = CLASSIFY_CACHE_FILE, maxsize: int = CLASSIFY_CACHE_SIZE):
+        self.fingerprint = fingerprint
+        self.path = path
+        self.maxsize = maxsize
+        self._lru: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._pending: dict[tuple[str, str], Any] = {}
+        self._loaded_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        return conn
+
+    def _load(self) -> None:
+        # Une fois par process (un worker forké hérite du LRU mais recharge le disque) ; appelé verrou tenu
+        self._loaded_pid = os.getpid()
+        # Entrées en attente héritées du parent : c'est lui qui les écrit
+        self._pending = {}
+        if not self.path:
+            return
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT kind, key, value FROM classification_cache WHERE fingerprint = ? LIMIT ?",
+                    (self.fingerprint, self.maxsize),
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[CLASSIFIER] ⚠️ cache disque illisible ({e}), cache mémoire seul.")
+            self.path = ""
+            return
+        for kind, key, value in rows:
+            self._lru.setdefault((kind, key), json.loads(value))
+
+    def get(self, kind: str, key: str) -> Any:
+        with self._lock:
+            if self._loaded_pid != os.getpid():
+                self._load()
+            value = self._lru.get((kind, key), MISS)
+            if value is MISS:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._lru.move_to_end((kind, key))
+            return value
+
+    def put(self, kind: str, key: str, value: Any) -> None:
+        self.put_many(kind, {key: value})
+
+    def put_many(self, kind: str, entries: dict[str, Any]) -> None:
+        """Ajoute un lot d'entrées : une seule écriture disque au plus."""
+        with self._lock:
+            if self._loaded_pid != os.getpid():
+                self._load()
+            for key, value in entries.items():
+                self._lru[(kind, key)] = value
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+            if not self.path:
+                return
+            self._pending.update(((kind, key), value) for key, value in entries.items())
+            due = len(self._pending) >= CLASSIFY_CACHE_FLUSH_EVERY
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Écrit les entrées nouvelles et purge celles d'anciens jeux de règles. Retourne le nombre écrit."""
+        # Échange sous verrou ; l'écriture disque se fait hors verrou sur un dict que plus personne ne modifie
+        with self._lock:
+            if not self._pending or not self.path or self._loaded_pid != os.getpid():
+                return 0
+            pending, self._pending = self._pending, {}
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM classification_cache WHERE fingerprint != ?", (self.fingerprint,))
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO classification_cache (kind, key, fingerprint, value) VALUES (?, ?, ?, ?)",
+                        [(kind, key, self.fingerprint, json.dumps(value, ensure_ascii=False)) for (kind, key), value in pending.items()],
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[CLASSIFIER] ⚠️ cache disque non écrit ({e}).")
+            return 0
+        return len(pending)
@@ -0,0 +1,168 @@
+# storage/delta_log.py
+# Journal d'export en ajout seul : un fichier NDJSON par run (offres insérées, modifiées
+# ou supprimées, d'après la table job_changes) et un instantané compacté périodique.
+# Le dépôt grossit au rythme des nouvelles offres au lieu de réécrire un binaire SQLite.
+#
+# Reconstruction (cache CI perdu, poste de dev) :
+#   python -m storage.delta_log rebuild --db storage/jobs.db --ui ui/public/jobs.db
+import os
+import gzip
+import json
+import sqlite3
+import pathlib
+import argparse
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from storage.sqlite_repo import PUBLIC_COLUMNS, ensure_derived_tables, get_repo
+
+DELTA_DIR = pathlib.Path(os.getenv("JOBS_DELTA_DIR", str(pathlib.Path(__file__).parent / "deltas")))
+# Nouvel instantané après N deltas (~1 semaine à un run toutes les 4 h)
+DELTA_SNAPSHOT_EVERY = int(os.getenv("DELTA_SNAPSHOT_EVERY", "42"))
+
+_COLS = ", ".join(PUBLIC_COLUMNS)
+
+# Schéma minimal d'une base reconstruite : init_db y ajoute ensuite les colonnes de cycle de vie
+_JOBS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        company TEXT,
+        location TEXT,
+        link TEXT NOT NULL UNIQUE,
+        posted TEXT NOT NULL,
+        source TEXT NOT NULL,
+        keyword TEXT NOT NULL,
+        category TEXT,
+        contract_type TEXT,
+        country_code TEXT,
+        country_name TEXT,
+        closed_at TEXT
+    )
+"""
+
+def _stamp(path: pathlib.Path) -> str:
+    # snapshot-20261018T080000Z.ndjson.gz -> 20261018T080000Z
+    return path.name.split("-", 1)[1].split(".", 1)[0]
+
+def _snapshots(log_dir: pathlib.Path) -> list[pathlib.Path]:
+    return sorted(log_dir.glob("snapshot-*.ndjson.gz"), key=_stamp)
+
+def _deltas_after(log_dir: pathlib.Path, snapshot: pathlib.Path) -> list[pathlib.Path]:
+    return sorted((p for p in log_dir.glob("delta-*.ndjson") if _stamp(p) > _stamp(snapshot)), key=_stamp)
+
+def _rows(conn: sqlite3.Connection, sql: str, params=()) -> Iterator[dict]:
+    for row in conn.execute(sql, params):
+        yield dict(zip(PUBLIC_COLUMNS, row))
+
+def _write_snapshot(conn: sqlite3.Connection, log_dir: pathlib.Path, stamp: str) -> pathlib.Path:
+    """Instantané complet ; remplace l'ancien et ses deltas (l'historique git les conserve)."""
+    path = log_dir / f"snapshot-{stamp}.ndjson.gz"
+    tmp = path.with_name(path.name + ".tmp")
+    # mtime=0 : même contenu → même fichier, git ne voit pas de changement
+    with open(tmp, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+        for job in _rows(conn, f"SELECT {_COLS} FROM jobs ORDER BY id"):
+            gz.write((json.dumps(job, ensure_ascii=False) + "\n").encode("utf-8"))
+    os.replace(tmp, path)
+    for old in log_dir.glob("delta-*.ndjson"):
+        old.unlink()
+    for old in _snapshots(log_dir):
+        if old != path:
+            old.unlink()
+    return path
+
+def _write_changes(conn: sqlite3.Connection, log_dir: pathlib.Path, stamp: str, last_seq: int) -> Optional[pathlib.Path]:
+    """Une ligne par offre modifiée depuis le dernier export : état courant, ou suppression."""
+    ids = [r[0] for r in conn.execute("SELECT DISTINCT job_id FROM job_changes WHERE seq <= ? ORDER BY job_id", (last_seq,))]
+    if not ids:
+        return None
+    path = log_dir / f"delta-{stamp}.ndjson"
+    with open(path, "w", encoding="utf-8", newline="\n") as fh:
+        for job_id in ids:
+            job = next(_rows(conn, f"SELECT {_COLS} FROM jobs WHERE id = ?", (job_id,)), None)
+            entry = {"op": "upsert", "job": job} if job else {"op": "delete", "id": job_id}
+            fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return path
+
+def write_delta(log_dir: pathlib.Path = DELTA_DIR, *, snapshot_every: int = DELTA_SNAPSHOT_EVERY) -> Optional[pathlib.Path]:
+    """
+    Exporte les modifications journalisées depuis le run précédent, ou un instantané
+    complet s'il n'y en a pas encore / si `snapshot_every` deltas se sont accumulés.
+    Vide ensuite job_changes. Retourne le fichier écrit (None si rien n'a changé).
+    """
+    log_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    snapshots = _snapshots(log_dir)
+    with get_repo().transaction() as conn:
+        last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM job_changes").fetchone()[0]
+        if not snapshots or len(_deltas_after(log_dir, snapshots[-1])) >= snapshot_every:
+            path = _write_snapshot(conn, log_dir, stamp)
+            print(f"[EXPORT] Instantané écrit → {path}")
+        else:
+            path = _write_changes(conn, log_dir, stamp, last_seq)
+            if path:
+                print(f"[EXPORT] Delta écrit → {path} ({sum(1 for _ in open(path, encoding='utf-8'))} offre(s))")
+            else:
+                print("[EXPORT] Aucune modification depuis le dernier delta.")
+        conn.execute("DELETE FROM job_changes WHERE seq <= ?", (last_seq,))
+    return path
+
+def discard_changes() -> None:
+    """Mode d'export "db" : le journal n'est pas consommé, on l'empêche de grossir."""
+    with get_repo().transaction() as conn:
+        conn.execute("DELETE FROM job_changes")
+
+def rebuild(db_path: pathlib.Path, log_dir: pathlib.Path = DELTA_DIR) -> int:
+    """
+    Reconstruit une base depuis le dernier instantané puis ses deltas, dans l'ordre.
+    Utilisable comme base chaude (init_db la complète) ou comme source de la réplique UI.
+    Retourne le nombre d'offres.
+    """
+    snapshots = _snapshots(log_dir)
+    if not snapshots:
+        raise FileNotFoundError(f"aucun instantané dans {log_dir}")
+    snapshot = snapshots[-1]
+    deltas = _deltas_after(log_dir, snapshot)
+
+    placeholders = ", ".join("?" for _ in PUBLIC_COLUMNS)
+    upsert = f"INSERT OR REPLACE INTO jobs ({_COLS}) VALUES ({placeholders})"
+    tmp = db_path.with_name(db_path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute(_JOBS_SCHEMA)
+        with gzip.open(snapshot, "rt", encoding="utf-8") as fh:
+            conn.executemany(upsert, ([job[c] for c in PUBLIC_COLUMNS] for job in map(json.loads, fh)))
+        for delta in deltas:
+            with open(delta, encoding="utf-8") as fh:
+                for entry in map(json.loads, fh):
+                    if entry["op"] == "upsert":
+                        conn.execute(upsert, [entry["job"][c] for c in PUBLIC_COLUMNS])
+                    else:
+                        conn.execute("DELETE FROM jobs WHERE id = ?", (entry["id"],))
+        # Index, agrégats et journal créés après coup : le chargement ne déclenche aucun trigger
+        ensure_derived_tables(conn)
+        conn.commit()
+        total = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+    finally:
+        conn.close()
+    os.replace(tmp, db_path)
+    print(f"🔁 Base reconstruite → {db_path} ({total} offres, {snapshot.name} + {len(deltas)} delta(s)).")
+    return total
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Journal d'export des offres (instantané + deltas NDJSON)")
+    sub = p.add_subparsers(dest="command", required=True)
+    r = sub.add_parser("rebuild", help="Reconstruit une base SQLite depuis le journal")
+    r.add_argument("--db", type=pathlib.Path, required=True, help="Base à (re)créer, ex: storage/jobs.db")
+    r.add_argument("--ui", type=pathlib.Path, help="Écrit aussi la réplique UI, ex: ui/public/jobs.db")
+    r.add_argument("--dir", type=pathlib.Path, default=DELTA_DIR, help="Répertoire du journal")
+    return p.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "rebuild":
+        rebuild(args.db, args.dir)
+        if args.ui:
+            from storage.export import export_read_replica
+            print(f"[EXPORT] Réplique UI écrite → {args.ui} ({export_read_replica(args.db, args.ui)} offres)")
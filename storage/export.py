@@ -0,0 +1,123 @@
+# storage/export.py
+# Réplique de lecture pour l'UI (ui/public/jobs.db) : seulement les colonnes lues
+# par les routes Next.js, index couvrants pour leurs filtres, index plein texte
+# jobs_fts, agrégats de la page stats, fichier compacté par VACUUM INTO.
+# La base d'écriture (storage/jobs.db) n'est jamais exposée.
+import os
+import sqlite3
+import pathlib
+
+from storage.sqlite_repo import STATS_TABLES, PUBLIC_COLUMNS
+
+# Colonnes servies par ui/src/app/api/jobs, api/stats et lib/data.ts
+UI_COLUMNS = PUBLIC_COLUMNS
+
+_REPLICA_SCHEMA = """
+    CREATE TABLE jobs (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        company TEXT,
+        location TEXT,
+        link TEXT NOT NULL,
+        posted TEXT NOT NULL,
+        source TEXT NOT NULL,
+        keyword TEXT NOT NULL,
+        category TEXT,
+        contract_type TEXT,
+        country_code TEXT,
+        country_name TEXT,
+        closed_at TEXT,
+        posted_ts INTEGER
+    )
+"""
+
+# Recherche par mot-clé de api/jobs : même index que la base chaude, rowid = rowid de la réplique
+_REPLICA_FTS = """
+    CREATE VIRTUAL TABLE jobs_fts USING fts5(
+        title, company, location,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+"""
+
+# Filtres de api/jobs (IN sur la colonne + closed_at IS NULL + posted_ts >= ?, tri par posted_ts) :
+# (colonne, closed_at, posted_ts) sert à la fois le filtre, le tri et le COUNT(*) sans lire la table.
+_REPLICA_INDEXES = [
+    "CREATE INDEX idx_jobs_posted ON jobs(posted_ts)",
+    "CREATE INDEX idx_jobs_open_posted ON jobs(posted_ts) WHERE closed_at IS NULL",
+    "CREATE INDEX idx_jobs_source ON jobs(source, closed_at, posted_ts)",
+    "CREATE INDEX idx_jobs_category ON jobs(category, closed_at, posted_ts)",
+    "CREATE INDEX idx_jobs_contract_type ON jobs(contract_type, closed_at, posted_ts)",
+    "CREATE INDEX idx_jobs_country_code ON jobs(country_code, closed_at, posted_ts)",
+]
+
+# Libellés des contrats sur la page stats (donut), à partir des valeurs de normalize_contract_type
+CONTRACT_LABELS = {
+    "cdi": "CDI",
+    "cdd": "CDD",
+    "stage": "Stage",
+    "alternance": "Alternance",
+    "freelance": "Freelance",
+    "vie": "VIE",
+    "non-specifie": "Non spécifié",
+}
+
+def contract_label(contract_type: str) -> str:
+    """Regroupe une valeur de contract_type (canonique ou brute d'anciennes lignes) en libellé UI."""
+    if contract_type in CONTRACT_LABELS:
+        return CONTRACT_LABELS[contract_type]
+    from storage.classifier import normalize_contract_type
+    canonical = normalize_contract_type("", contract_type)
+    return CONTRACT_LABELS[canonical] if canonical != "non-specifie" else "Autres"
+
+def _export_stats(conn: sqlite3.Connection) -> None:
+    """Recopie les agrégats de la base chaude et y ajoute le regroupement des contrats."""
+    for table in STATS_TABLES:
+        conn.execute(f"CREATE TABLE {table} AS SELECT * FROM src.{table}")
+    groups: dict[str, int] = {}
+    for contract_type, count in conn.execute("SELECT contract_type, count FROM stats_by_contract"):
+        label = contract_label(contract_type)
+        groups[label] = groups.get(label, 0) + count
+    conn.execute("CREATE TABLE stats_by_contract_group (label TEXT PRIMARY KEY, count INTEGER NOT NULL)")
+    conn.executemany("INSERT INTO stats_by_contract_group (label, count) VALUES (?, ?)", groups.items())
+
+def export_read_replica(src: pathlib.Path, dest: pathlib.Path) -> int:
+    """
+    Construit la réplique en mémoire (copie des colonnes UI, index, ANALYZE), puis l'écrit
+    d'un bloc par VACUUM INTO dans un fichier temporaire qui remplace `dest` atomiquement.
+    Retourne le nombre d'offres exportées.
+    """
+    tmp = dest.with_name(dest.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    cols = ", ".join(UI_COLUMNS)
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("ATTACH DATABASE ? AS src", (str(src),))
+        conn.execute(_REPLICA_SCHEMA)
+        # Ordre de publication décroissant : la première page de l'UI tient dans peu de pages disque
+        # posted_ts recalculé ici : la source peut être une base reconstruite sans la colonne générée
+        exported = conn.execute(f"""
+            INSERT INTO jobs ({cols}, posted_ts)
+            SELECT {cols}, CAST(strftime('%s', posted) AS INTEGER) FROM src.jobs ORDER BY posted DESC
+        """).rowcount
+        # Texte déjà replié côté base chaude : recopié tel quel, ré-indexé sur les rowid de la réplique
+        conn.execute(_REPLICA_FTS)
+        conn.execute("""
+            INSERT INTO jobs_fts (rowid, title, company, location)
+            SELECT j.rowid, f.title, f.company, f.location
+              FROM src.jobs s
+              JOIN src.jobs_fts f ON f.rowid = s.rowid
+              JOIN jobs j ON j.id = s.id
+        """)
+        conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('optimize')")
+        _export_stats(conn)
+        conn.commit()
+        conn.execute("DETACH DATABASE src")
+        for sql in _REPLICA_INDEXES:
+            conn.execute(sql)
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.execute("VACUUM INTO ?", (str(tmp),))
+    finally:
+        conn.close()
+    os.replace(tmp, dest)
+    return exported
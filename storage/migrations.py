@@ -0,0 +1,329 @@
+# storage/migrations.py
+# Migrations versionnées de storage/jobs.db : chaque étape est appliquée une seule fois,
+# dans l'ordre, dans sa propre transaction, et notée dans `schema_version`.
+# Les étapes restent idempotentes : une base antérieure au versionnage (version 0)
+# les rejoue toutes sans erreur.
+import re
+import html
+import random
+import struct
+import hashlib
+import sqlite3
+import unicodedata
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+_VERSION_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TEXT NOT NULL
+    )
+"""
+
+def _columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    # xinfo : inclut les colonnes générées
+    return {r[1] for r in conn.execute(f"PRAGMA table_xinfo({table})")}
+
+def _add_columns(conn: sqlite3.Connection, table: str, definitions: list[str]) -> None:
+    existing = _columns(conn, table)
+    for definition in definitions:
+        name = definition.split()[0]
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {definition}")
+            print(f"Colonne '{name}' ajoutée.")
+
+def _m001_jobs(conn: sqlite3.Connection) -> None:
+    """Table des offres (colonnes de classification et pays comprises)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            company TEXT,
+            location TEXT,
+            link TEXT NOT NULL UNIQUE,
+            posted TEXT NOT NULL,
+            source TEXT NOT NULL,
+            keyword TEXT NOT NULL,
+            category TEXT,
+            contract_type TEXT,
+            country_code TEXT,
+            country_name TEXT
+        )
+    """)
+    # Bases créées par d'anciennes versions (dont create_jobs_table.py : id, title, link, posted, source)
+    _add_columns(conn, "jobs", [
+        "company TEXT",
+        "location TEXT",
+        "keyword TEXT NOT NULL DEFAULT ''",
+        "category TEXT",
+        "contract_type TEXT",
+        "country_code TEXT",
+        "country_name TEXT",
+    ])
+
+def _m002_lifecycle(conn: sqlite3.Connection) -> None:
+    """Cycle de vie : première / dernière vue, nombre de passages, fermeture."""
+    _add_columns(conn, "jobs", [
+        "first_seen TEXT",
+        "last_seen TEXT",
+        "seen_count INTEGER NOT NULL DEFAULT 1",
+        "closed_at TEXT",
+    ])
+    # Lignes antérieures au suivi : vues pour la dernière fois à leur date de publication
+    conn.execute("UPDATE jobs SET first_seen = posted, last_seen = posted WHERE first_seen IS NULL")
+
+def _m003_crawl_tables(conn: sqlite3.Connection) -> None:
+    """Watermarks de crawl incrémental et durées des tâches (ordonnancement LPT)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_state (
+            source_key TEXT PRIMARY KEY,
+            newest_posted TEXT,
+            last_ids TEXT NOT NULL DEFAULT '[]',
+            last_success TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS task_stats (
+            task_key TEXT PRIMARY KEY,
+            avg_seconds REAL NOT NULL,
+            last_seconds REAL NOT NULL,
+            runs INTEGER NOT NULL DEFAULT 1,
+            last_run TEXT
+        )
+    """)
+
+def _m004_base_indexes(conn: sqlite3.Connection) -> None:
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_posted ON jobs(posted)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_country_code ON jobs(country_code)")
+    # Offres ouvertes et détection de fermeture par source
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_open_posted ON jobs(posted) WHERE closed_at IS NULL")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_source_last_seen ON jobs(source, last_seen)")
+
+def _m005_posted_epoch(conn: sqlite3.Connection) -> None:
+    """
+    `posted_ts` : date de publication en secondes epoch (UTC), colonne générée depuis `posted`.
+    Les comparaisons de plage se font sur un entier indexé ; `posted` reste l'ISO 8601
+    lisible servi à l'UI et au journal d'export, et aucun écrivain n'a à tenir les deux.
+    """
+    _add_columns(conn, "jobs", [
+        "posted_ts INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', posted) AS INTEGER)) VIRTUAL",
+    ])
+
+def _m006_composite_indexes(conn: sqlite3.Connection) -> None:
+    """Filtres réels : une source / catégorie / type de contrat sur une fenêtre de publication."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_source_posted ON jobs(source, posted_ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_category_posted ON jobs(category, posted_ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_contract_posted ON jobs(contract_type, posted_ts)")
+
+def _m007_analyze(conn: sqlite3.Connection) -> None:
+    """Statistiques pour le planificateur (sqlite_stat1), une fois les nouveaux index posés."""
+    conn.execute("ANALYZE")
+
+# Paramètres MinHash / LSH figés à la version 8 (ceux de storage/near_dup.py à cette date) :
+# l'étape publiée ne doit pas changer si near_dup évolue. Changer les paramètres de near_dup
+# impose une nouvelle migration qui recalcule job_signatures et job_lsh.
+_M008_NUM_PERM = 32
+_M008_BANDS = 8
+_M008_ROWS = _M008_NUM_PERM // _M008_BANDS
+_M008_P = (1 << 61) - 1
+_m008_rng = random.Random(0x5EED)
+_M008_PERMS = [(_m008_rng.randrange(1, _M008_P), _m008_rng.randrange(0, _M008_P)) for _ in range(_M008_NUM_PERM)]
+_M008_PACK = struct.Struct(f">{_M008_NUM_PERM}Q")
+_M008_THRESHOLD = 0.8
+_M008_WINDOW_SECONDS = 30 * 86400
+_M008_NOISE = re.compile(r"\((?:h/?f|f/?h|m/?f(?:/?d)?|w/?m(?:/?d)?|e|ere|rice)\)|\b(?:m/f/d|w/m/d|h/f|f/h)\b")
+_M008_TOKEN = re.compile(r"[a-z0-9]+")
+
+def _m008_fold(text: Optional[str]) -> str:
+    # prep_text du classifier à la version 8
+    text = html.unescape(text or "")
+    return "".join(ch for ch in unicodedata.normalize("NFD", text) if unicodedata.category(ch) != "Mn").lower()
+
+def _m008_signature(title: Optional[str], company: Optional[str], location: Optional[str]) -> Optional[list[int]]:
+    words = _M008_TOKEN.findall(_M008_NOISE.sub(" ", _m008_fold(title)))
+    feats = {f"t:{w}" for w in words} | {f"t:{a} {b}" for a, b in zip(words, words[1:])}
+    feats |= {f"c:{w}" for w in _M008_TOKEN.findall(_m008_fold(company))}
+    feats |= {f"l:{w}" for w in _M008_TOKEN.findall(_m008_fold(location))}
+    if not feats:
+        return None
+    hashes = [int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "big") for f in feats]
+    return [min((a * h + b) % _M008_P for h in hashes) for a, b in _M008_PERMS]
+
+def _m008_bands(sig: list[int]) -> list[tuple[int, int]]:
+    packed = _M008_PACK.pack(*sig)
+    return [
+        (band, int.from_bytes(hashlib.blake2b(packed[band * _M008_ROWS * 8:(band + 1) * _M008_ROWS * 8], digest_size=8).digest(), "big") >> 1)
+        for band in range(_M008_BANDS)
+    ]
+
+def _m008_index(conn: sqlite3.Connection, job_id: str, title, company, location, posted_ts: int) -> None:
+    sig = _m008_signature(title, company, location)
+    if sig is None:
+        return
+    bands = _m008_bands(sig)
+    candidates: set[str] = set()
+    for band, bucket in bands:
+        candidates.update(r[0] for r in conn.execute("SELECT job_id FROM job_lsh WHERE band = ? AND bucket = ?", (band, bucket)))
+    candidates.discard(job_id)
+    best: Optional[tuple[float, str]] = None
+    for cid in candidates:
+        row = conn.execute(
+            """
+            SELECT s.signature, COALESCE(s.dup_of, s.job_id)
+              FROM job_signatures s JOIN jobs j ON j.id = s.job_id
+             WHERE s.job_id = ? AND j.closed_at IS NULL AND j.posted_ts >= ?
+            """,
+            (cid, posted_ts - _M008_WINDOW_SECONDS),
+        ).fetchone()
+        if not row:
+            continue
+        score = sum(x == y for x, y in zip(sig, _M008_PACK.unpack(row[0]))) / _M008_NUM_PERM
+        if score >= _M008_THRESHOLD and (best is None or score > best[0]):
+            best = (score, row[1])
+    conn.execute(
+        "INSERT OR REPLACE INTO job_signatures (job_id, signature, dup_of) VALUES (?, ?, ?)",
+        (job_id, _M008_PACK.pack(*sig), best[1] if best else None),
+    )
+    conn.executemany("INSERT OR IGNORE INTO job_lsh (band, bucket, job_id) VALUES (?, ?, ?)", [(b, k, job_id) for b, k in bands])
+
+def _m008_near_duplicates(conn: sqlite3.Connection) -> None:
+    """Signatures MinHash et index LSH des quasi-doublons, remplis pour les offres existantes."""
+    conn.execute("CREATE TABLE IF NOT EXISTS job_signatures (job_id TEXT PRIMARY KEY, signature BLOB NOT NULL, dup_of TEXT)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS job_lsh (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            job_id TEXT NOT NULL,
+            PRIMARY KEY (band, bucket, job_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_job_lsh_job ON job_lsh(job_id)")
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_near_dup_delete AFTER DELETE ON jobs BEGIN
+            DELETE FROM job_signatures WHERE job_id = old.id;
+            DELETE FROM job_lsh WHERE job_id = old.id;
+        END
+    """)
+    # Dans l'ordre d'arrivée : la tête de chaque groupe est l'offre vue en premier
+    rows = conn.execute("""
+        SELECT id, title, company, location, COALESCE(posted_ts, 0) FROM jobs
+         WHERE id NOT IN (SELECT job_id FROM job_signatures)
+         ORDER BY first_seen, rowid
+    """).fetchall()
+    for job_id, title, company, location, posted_ts in rows:
+        _m008_index(conn, job_id, title, company, location, posted_ts)
+
+# Triggers des agrégats stats_* figés à la version 9 (ceux de sqlite_repo._STATS_TRIGGERS
+# à cette date). Le trigger unique jobs_stats_update recalculait MAX(posted) de toute la
+# source à chaque reclassement ; il est remplacé par un trigger par agrégat.
+_M009_TABLES = [
+    "CREATE TABLE IF NOT EXISTS stats_by_source (source TEXT PRIMARY KEY, count INTEGER NOT NULL, last_posted TEXT)",
+    "CREATE TABLE IF NOT EXISTS stats_daily (day TEXT PRIMARY KEY, count INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS stats_by_category (category TEXT PRIMARY KEY, count INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS stats_by_contract (contract_type TEXT PRIMARY KEY, count INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS stats_by_country (country_code TEXT PRIMARY KEY, country_name TEXT, count INTEGER NOT NULL)",
+]
+_M009_KEYS = [
+    ("stats_daily", "day", "date({r}.posted)", ("posted",)),
+    ("stats_by_category", "category", "COALESCE({r}.category, '')", ("category",)),
+    ("stats_by_contract", "contract_type", "COALESCE({r}.contract_type, 'non-specifie')", ("contract_type",)),
+    ("stats_by_country", "country_code", "COALESCE({r}.country_code, '')", ("country_code", "country_name")),
+]
+_M009_DROPPED = ("jobs_stats_update", "jobs_stats_insert", "jobs_stats_delete", "jobs_stats_source_update",
+                 *(f"jobs_{table}_update" for table, _, _, _ in _M009_KEYS))
+
+def _m009_source_add(r: str) -> str:
+    return f"""
+        INSERT INTO stats_by_source (source, count, last_posted) VALUES ({r}.source, 1, {r}.posted)
+        ON CONFLICT(source) DO UPDATE SET count = count + 1, last_posted = MAX(COALESCE(last_posted, ''), excluded.last_posted);
+    """
+
+def _m009_source_sub(r: str) -> str:
+    return f"""
+        UPDATE stats_by_source
+           SET count = count - 1,
+               last_posted = CASE WHEN {r}.posted >= last_posted
+                                  THEN (SELECT MAX(posted) FROM jobs WHERE source = {r}.source)
+                                  ELSE last_posted END
+         WHERE source = {r}.source;
+        DELETE FROM stats_by_source WHERE source = {r}.source AND count <= 0;
+    """
+
+def _m009_key_add(table: str, key: str, expr: str, r: str) -> str:
+    expr = expr.format(r=r)
+    sql = f"""
+        INSERT INTO {table} ({key}, count) SELECT {expr}, 1 WHERE {expr} IS NOT NULL
+        ON CONFLICT({key}) DO UPDATE SET count = count + 1;
+        """
+    if table == "stats_by_country":
+        sql += f"UPDATE stats_by_country SET country_name = {r}.country_name WHERE country_code = {expr} AND {r}.country_name IS NOT NULL;"
+    return sql
+
+def _m009_key_sub(table: str, key: str, expr: str, r: str) -> str:
+    expr = expr.format(r=r)
+    return f"""
+        UPDATE {table} SET count = count - 1 WHERE {key} = {expr};
+        DELETE FROM {table} WHERE {key} = {expr} AND count <= 0;
+        """
+
+def _m009_changed(columns: tuple[str, ...]) -> str:
+    return " OR ".join(f"old.{c} IS NOT new.{c}" for c in columns)
+
+def _m009_stats_triggers(conn: sqlite3.Connection) -> None:
+    """Triggers stats_* recréés : un trigger de mise à jour par agrégat, filtré sur ses colonnes."""
+    for sql in _M009_TABLES:
+        conn.execute(sql)
+    for name in _M009_DROPPED:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    add = _m009_source_add("new") + "".join(_m009_key_add(t, k, e, "new") for t, k, e, _ in _M009_KEYS)
+    sub = _m009_source_sub("old") + "".join(_m009_key_sub(t, k, e, "old") for t, k, e, _ in _M009_KEYS)
+    conn.execute(f"CREATE TRIGGER jobs_stats_insert AFTER INSERT ON jobs BEGIN {add} END")
+    conn.execute(f"CREATE TRIGGER jobs_stats_delete AFTER DELETE ON jobs BEGIN {sub} END")
+    conn.execute(f"""CREATE TRIGGER jobs_stats_source_update AFTER UPDATE OF source, posted ON jobs
+        WHEN {_m009_changed(("source", "posted"))}
+        BEGIN {_m009_source_sub('old')} {_m009_source_add('new')} END""")
+    for table, key, expr, columns in _M009_KEYS:
+        conn.execute(f"""CREATE TRIGGER jobs_{table}_update AFTER UPDATE OF {", ".join(columns)} ON jobs
+        WHEN {_m009_changed(columns)}
+        BEGIN {_m009_key_sub(table, key, expr, 'old')} {_m009_key_add(table, key, expr, 'new')} END""")
+
+# (version, nom, étape) : ne jamais renuméroter ni modifier une étape publiée, en ajouter une
+MIGRATIONS: list[tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "table jobs", _m001_jobs),
+    (2, "cycle de vie des offres", _m002_lifecycle),
+    (3, "crawl_state et task_stats", _m003_crawl_tables),
+    (4, "index de base", _m004_base_indexes),
+    (5, "posted_ts (epoch)", _m005_posted_epoch),
+    (6, "index composites source/catégorie/contrat + posted_ts", _m006_composite_indexes),
+    (7, "ANALYZE", _m007_analyze),
+    (8, "quasi-doublons (MinHash + LSH)", _m008_near_duplicates),
+    (9, "triggers stats_* par agrégat", _m009_stats_triggers),
+]
+
+def current_version(conn: sqlite3.Connection) -> int:
+    conn.execute(_VERSION_SCHEMA)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Applique les migrations en attente ; retourne la version du schéma."""
+    version = current_version(conn)
+    conn.commit()
+    for number, name, step in MIGRATIONS:
+        if number <= version:
+            continue
+        # BEGIN explicite : sqlite3 n'ouvre pas de transaction implicite pour le DDL
+        conn.execute("BEGIN")
+        try:
+            step(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                (number, name, datetime.now(timezone.utc).isoformat()),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        print(f"🧱 Migration {number} appliquée : {name}")
+        version = number
+    return version
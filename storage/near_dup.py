@@ -0,0 +1,101 @@
+# storage/near_dup.py
+# Détection de quasi-doublons entre sources (portail groupe / filiale, bofa_main /
+# bofa_students, mêmes offres Workday sous plusieurs mots-clés…) : signature MinHash
+# du titre + entreprise + lieu normalisés, index LSH par bandes dans SQLite.
+# Une insertion ne compare sa signature qu'aux offres partageant au moins une bande.
+import os
+import re
+import random
+import struct
+import hashlib
+import sqlite3
+from typing import Iterator, Optional
+
+# Similarité de Jaccard estimée à partir de laquelle deux offres sont le même poste
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+# Fenêtre de publication (jours) : au-delà, une offre semblable est une republication
+NEAR_DUP_WINDOW_DAYS = int(os.getenv("NEAR_DUP_WINDOW_DAYS", "30"))
+
+# 32 permutations en 8 bandes de 4 : candidates dès ~0.6 de Jaccard, tri fin ensuite
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+
+_P = (1 << 61) - 1
+# Graine fixe : les signatures stockées doivent rester comparables d'un run à l'autre
+_rng = random.Random(0x5EED)
+_PERMS = [(_rng.randrange(1, _P), _rng.randrange(0, _P)) for _ in range(NUM_PERM)]
+_PACK = struct.Struct(f">{NUM_PERM}Q")
+
+# Marqueurs de genre / mentions légales qui varient d'un portail à l'autre
+_NOISE = re.compile(r"\((?:h/?f|f/?h|m/?f(?:/?d)?|w/?m(?:/?d)?|e|ere|rice)\)|\b(?:m/f/d|w/m/d|h/f|f/h)\b")
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+def features(title: Optional[str], company: Optional[str], location: Optional[str]) -> set[str]:
+    """Mots et bigrammes du titre (poids dominant), mots de l'entreprise et du lieu."""
+    from storage.classifier import prep_text
+    words = _TOKEN.findall(_NOISE.sub(" ", prep_text(title or "")))
+    feats = {f"t:{w}" for w in words} | {f"t:{a} {b}" for a, b in zip(words, words[1:])}
+    feats |= {f"c:{w}" for w in _TOKEN.findall(prep_text(company or ""))}
+    feats |= {f"l:{w}" for w in _TOKEN.findall(prep_text(location or ""))}
+    return feats
+
+def signature(title: Optional[str], company: Optional[str], location: Optional[str]) -> Optional[list[int]]:
+    feats = features(title, company, location)
+    if not feats:
+        return None
+    hashes = [int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "big") for f in feats]
+    return [min((a * h + b) % _P for h in hashes) for a, b in _PERMS]
+
+def similarity(a: list[int], b: list[int]) -> float:
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+def bands(sig: list[int]) -> Iterator[tuple[int, int]]:
+    """(n° de bande, seau) ; seau sur 63 bits pour tenir dans un INTEGER SQLite."""
+    for band in range(BANDS):
+        chunk = _PACK.pack(*sig)[band * ROWS * 8:(band + 1) * ROWS * 8]
+        yield band, int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "big") >> 1
+
+def find_duplicate(conn: sqlite3.Connection, sig: list[int], *, job_id: str, posted_ts: int) -> Optional[str]:
+    """
+    Offre ouverte, publiée dans la fenêtre, la plus semblable au-dessus du seuil parmi
+    celles qui partagent une bande. Retourne l'ID de tête de son groupe de doublons.
+    """
+    candidates: set[str] = set()
+    for band, bucket in bands(sig):
+        candidates.update(r[0] for r in conn.execute("SELECT job_id FROM job_lsh WHERE band = ? AND bucket = ?", (band, bucket)))
+    candidates.discard(job_id)
+    best: Optional[tuple[float, str]] = None
+    since = posted_ts - NEAR_DUP_WINDOW_DAYS * 86400
+    for cid in candidates:
+        row = conn.execute(
+            """
+            SELECT s.signature, COALESCE(s.dup_of, s.job_id)
+              FROM job_signatures s JOIN jobs j ON j.id = s.job_id
+             WHERE s.job_id = ? AND j.closed_at IS NULL AND j.posted_ts >= ?
+            """,
+            (cid, since),
+        ).fetchone()
+        if not row:
+            continue
+        score = similarity(sig, list(_PACK.unpack(row[0])))
+        if score >= NEAR_DUP_THRESHOLD and (best is None or score > best[0]):
+            best = (score, row[1])
+    return best[1] if best else None
+
+def index_job(conn: sqlite3.Connection, *, job_id: str, title: Optional[str], company: Optional[str],
+              location: Optional[str], posted_ts: int) -> Optional[str]:
+    """Enregistre la signature et les seaux de l'offre ; retourne la tête de groupe si doublon."""
+    sig = signature(title, company, location)
+    if sig is None:
+        return None
+    dup_of = find_duplicate(conn, sig, job_id=job_id, posted_ts=posted_ts)
+    conn.execute(
+        "INSERT OR REPLACE INTO job_signatures (job_id, signature, dup_of) VALUES (?, ?, ?)",
+        (job_id, _PACK.pack(*sig), dup_of),
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO job_lsh (band, bucket, job_id) VALUES (?, ?, ?)",
+        [(band, bucket, job_id) for band, bucket in bands(sig)],
+    )
+    return dup_of
@@ -0,0 +1,136 @@
+# storage/reprocess.py
+# Retraitement de l'historique : pays, catégorie ou type de contrat recalculés sur la
+# table jobs après un changement de règles. Lecture par tranches de rowid, calcul sur
+# les seules valeurs distinctes (mémo partagé entre tranches, pool de processus en
+# option), réécriture par executemany, une transaction par tranche. La catégorie passe
+# par classifier.classify_many (cache de classification, même pool).
+#
+#   python -m storage.reprocess --field category --workers 4   # après modification des règles
+#   python -m storage.reprocess --field category --field contract --only-missing
+import time
+import argparse
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from storage.classifier import classify_many, maybe_append_country, normalize_contract_type, normalize_country_from_location
+from storage.sqlite_repo import init_db, close_db, get_repo, refresh_fts
+
+# Lignes lues par tranche, et valeurs distinctes en dessous desquelles le pool ne vaut pas son coût
+REPROCESS_CHUNK = 5000
+POOL_MIN_UNIQUES = 256
+
+def _country(location: Optional[str]) -> Optional[tuple]:
+    info = normalize_country_from_location(location or "")
+    return (info["code"], info["name"]) if info else None
+
+def _country_and_location(location: Optional[str]) -> Optional[tuple]:
+    found = _country(location)
+    if not found:
+        return None
+    return (*found, maybe_append_country(location or "") or location)
+
+def _categories(keys: list[tuple], pool: Optional[Executor], workers: int) -> list[Optional[tuple]]:
+    # Lot entier via classify_many (cache de classification + pool partagé)
+    return [(c,) for c in classify_many([title or "" for title, in keys], workers=max(workers, 1), executor=pool)]
+
+def _contract(title: Optional[str], contract_type: Optional[str]) -> Optional[tuple]:
+    return (normalize_contract_type(title or "", contract_type),)
+
+@dataclass(frozen=True)
+class Enricher:
+    """
+    Colonnes lues, colonnes écrites, calcul (None = ne rien écrire) et lignes « à compléter ».
+    `compute_many` (optionnel) traite d'un coup les valeurs distinctes d'une tranche.
+    """
+    inputs: tuple[str, ...]
+    outputs: tuple[str, ...]
+    compute: Optional[Callable[..., Optional[tuple]]]
+    missing: str
+    compute_many: Optional[Callable[[list[tuple], Optional[Executor], int], list[Optional[tuple]]]] = None
+
+ENRICHERS: dict[str, Enricher] = {
+    "country": Enricher(("location",), ("country_code", "country_name"), _country,
+                        "(country_code IS NULL OR country_code = '')"),
+    # Variante de backfill_countries(append_country_to_location=True)
+    "country+location": Enricher(("location",), ("country_code", "country_name", "location"), _country_and_location,
+                                 "(country_code IS NULL OR country_code = '')"),
+    "category": Enricher(("title",), ("category",), None, "(category IS NULL OR category = '')", _categories),
+    "contract": Enricher(("title", "contract_type"), ("contract_type",), _contract, "(contract_type IS NULL OR contract_type = '')"),
+}
+
+def _apply(args: tuple[str, tuple]) -> Optional[tuple]:
+    # Fonction de module : picklable pour le pool
+    name, key = args
+    return ENRICHERS[name].compute(*key)
+
+def reprocess(field: str, *, only_missing: bool = False, chunk_size: int = REPROCESS_CHUNK, workers: int = 0) -> int:
+    """
+    Recalcule `field` sur toute la table (ou les lignes à compléter) et ne réécrit que
+    les lignes dont la valeur change. Retourne le nombre de lignes mises à jour.
+    """
+    enricher = ENRICHERS[field]
+    select = (
+        f"SELECT rowid, {', '.join(enricher.inputs + enricher.outputs)} FROM jobs "
+        f"WHERE rowid > ?{' AND ' + enricher.missing if only_missing else ''} ORDER BY rowid LIMIT ?"
+    )
+    update = f"UPDATE jobs SET {', '.join(f'{c} = ?' for c in enricher.outputs)} WHERE rowid = ?"
+    memo: dict[tuple, Optional[tuple]] = {}
+    repo = get_repo()
+    n_in = len(enricher.inputs)
+    read = updated = 0
+    last_rowid = 0
+    started = time.time()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        while True:
+            with repo.transaction() as conn:
+                rows = conn.execute(select, (last_rowid, chunk_size)).fetchall()
+            if not rows:
+                break
+            last_rowid = rows[-1][0]
+            read += len(rows)
+
+            # Calcul sur les seules valeurs jamais vues
+            todo = list({tuple(r[1:1 + n_in]) for r in rows} - memo.keys())
+            if enricher.compute_many:
+                results = enricher.compute_many(todo, pool, workers)
+            elif pool and len(todo) >= POOL_MIN_UNIQUES:
+                results = pool.map(_apply, [(field, key) for key in todo], chunksize=max(1, len(todo) // (workers * 4)))
+            else:
+                results = map(_apply, [(field, key) for key in todo])
+            memo.update(zip(todo, results))
+
+            changes = []
+            for r in rows:
+                new = memo[tuple(r[1:1 + n_in])]
+                if new is not None and tuple(new) != tuple(r[1 + n_in:]):
+                    changes.append((*new, r[0]))
+            if changes:
+                with repo.transaction() as conn:
+                    conn.executemany(update, changes)
+                    if "location" in enricher.outputs:
+                        # Lieu réécrit : l'index plein texte suit
+                        refresh_fts(conn, [c[-1] for c in changes])
+                updated += len(changes)
+    finally:
+        if pool:
+            pool.shutdown()
+    print(f"🔁 Retraitement '{field}' — {read} ligne(s) lue(s), {len(memo)} valeur(s) distincte(s), "
+          f"{updated} mise(s) à jour en {time.time() - started:.1f}s.")
+    return updated
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Retraitement de l'historique des offres (pays / catégorie / contrat)")
+    p.add_argument("--field", action="append", required=True, choices=sorted(ENRICHERS), help="Champ à recalculer (répétable)")
+    p.add_argument("--only-missing", action="store_true", help="Seulement les lignes où le champ est vide")
+    p.add_argument("--chunk", type=int, default=REPROCESS_CHUNK, help="Lignes lues par tranche")
+    p.add_argument("--workers", type=int, default=0, help="Processus de calcul (0 = dans le process courant)")
+    return p.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    init_db()
+    for name in args.field:
+        reprocess(name, only_missing=args.only_missing, chunk_size=args.chunk, workers=args.workers)
+    close_db()
@@ -1,69 +1,289 @@
 # storage/sqlite_repo.py
 import os
+import json
+import atexit
 import sqlite3
 import pathlib
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from models import JobPosting
-from storage.classifier import normalize_country_from_location, maybe_append_country
+from storage.migrations import migrate
+from storage import near_dup
 
 # Permet de remplacer le chemin par env: JOBS_DB_FILE
 _db_env = os.getenv("JOBS_DB_FILE")
 DB_FILE = pathlib.Path(_db_env) if _db_env else pathlib.Path(__file__).parent / "jobs.db"
+# Archive froide des offres purgées (JOBS_ARCHIVE_FILE, vide = pas d'archive)
+ARCHIVE_FILE = os.getenv("JOBS_ARCHIVE_FILE", str(pathlib.Path(__file__).parent / "jobs_archive.db"))
+
+# Cache page SQLite (Kio, valeur négative = taille) et zone mmap (octets)
+SQLITE_CACHE_KIB = int(os.getenv("SQLITE_CACHE_KIB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+class JobRepository:
+    """
+    Connexion SQLite unique et longue durée du process (WAL, synchronous=NORMAL).
+    Partagée entre threads : chaque transaction prend le verrou du repository.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        for pragma in (
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            f"PRAGMA cache_size=-{SQLITE_CACHE_KIB}",
+            f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+            "PRAGMA temp_store=MEMORY",
+        ):
+            self.conn.execute(pragma)
+
+    @contextmanager
+    def transaction(self):
+        """Commit à la sortie, rollback sur exception (comme `with sqlite3.connect(...)`)."""
+        with self.lock, self.conn:
+            yield self.conn
+
+    def close(self) -> None:
+        """
+        Rapatrie le WAL dans la base et repasse en journal classique : le fichier
+        exporté / commité reste lisible seul (better-sqlite3 en lecture seule).
+        """
+        with self.lock:
+            try:
+                # Met à jour les statistiques du planificateur si elles ont dérivé (bon marché)
+                self.conn.execute("PRAGMA optimize")
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self.conn.execute("PRAGMA journal_mode=DELETE")
+            except sqlite3.OperationalError as e:
+                print(f"⚠️ Checkpoint SQLite impossible: {e}")
+            self.conn.close()
+
+_REPO: Optional[JobRepository] = None
+_REPO_LOCK = threading.Lock()
+
+def get_repo() -> JobRepository:
+    global _REPO
+    if _REPO is None:
+        with _REPO_LOCK:
+            if _REPO is None:
+                _REPO = JobRepository(DB_FILE)
+    return _REPO
+
+def close_db() -> None:
+    """Ferme la connexion du process (à appeler avant de copier jobs.db)."""
+    global _REPO
+    with _REPO_LOCK:
+        if _REPO is not None:
+            _REPO.close()
+            _REPO = None
+
+def _reset_after_fork() -> None:
+    # Un worker forké ne doit pas réutiliser la connexion du parent : il rouvre la sienne
+    global _REPO, _REPO_LOCK
+    _REPO = None
+    _REPO_LOCK = threading.Lock()
+
+atexit.register(close_db)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
 
 def _get_connection():
-    # row_factory pour debug/inspection si besoin
-    conn = sqlite3.connect(DB_FILE)
-    return conn
+    return get_repo().transaction()
 
 def init_db():
+    """Applique les migrations en attente (storage/migrations.py) puis vérifie les tables dérivées."""
     with _get_connection() as conn:
-        cursor = conn.cursor()
-        # Table complète avec nouvelles colonnes
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS jobs (
-                id TEXT PRIMARY KEY,
-                title TEXT NOT NULL,
-                company TEXT,
-                location TEXT,
-                link TEXT NOT NULL UNIQUE,
-                posted TEXT NOT NULL,
-                source TEXT NOT NULL,
-                keyword TEXT NOT NULL,
-                category TEXT,
-                contract_type TEXT,
-                country_code TEXT,
-                country_name TEXT
-            );
-        """)
+        migrate(conn)
+        # Plein texte, agrégats stats et journal des modifications (tenus par triggers)
+        ensure_derived_tables(conn)
         conn.commit()
+        print(f"Base de données initialisée: {DB_FILE}")
 
-        # Ajouts idempotents si table ancienne
-        for col in [
-            "category TEXT",
-            "contract_type TEXT",
-            "country_code TEXT",
-            "country_name TEXT",
-        ]:
-            try:
-                cursor.execute(f"ALTER TABLE jobs ADD COLUMN {col};")
-                print(f"Colonne '{col.split()[0]}' ajoutée.")
-            except sqlite3.OperationalError:
-                pass
+# Index plein texte des offres, ligne à ligne avec `jobs` (même rowid). Le texte est replié
+# par prep_text (accents, casse, entités HTML) ; remove_diacritics couvre les requêtes non repliées.
+_FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, company, location,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+"""
 
-        # Index utiles
-        try:
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_posted ON jobs(posted)")
-        except sqlite3.OperationalError:
-            pass
-        try:
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_country_code ON jobs(country_code)")
-        except sqlite3.OperationalError:
-            pass
+# La suppression suit sans Python (purge, archivage, sqlite3 en ligne de commande)
+_FTS_DELETE_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+        DELETE FROM jobs_fts WHERE rowid = old.rowid;
+    END
+"""
 
-        conn.commit()
-        print(f"Base de données initialisée: {DB_FILE}")
+_FTS_UPSERT = """
+    INSERT OR REPLACE INTO jobs_fts (rowid, title, company, location)
+    SELECT rowid, ?, ?, ? FROM jobs WHERE id = ?
+"""
+
+def _fts_row(job_id: str, title: Optional[str], company: Optional[str], location: Optional[str]) -> tuple:
+    # Imports du classifier au premier usage : le collector charge ce module au démarrage
+    from storage.classifier import prep_text
+    return (prep_text(title or ""), prep_text(company or ""), prep_text(location or ""), job_id)
+
+def refresh_fts(conn: sqlite3.Connection, rowids: list[int]) -> None:
+    """Réindexe des lignes dont le titre, l'entreprise ou le lieu ont été réécrits."""
+    for i in range(0, len(rowids), 500):
+        batch = rowids[i:i + 500]
+        marks = ", ".join("?" for _ in batch)
+        rows = conn.execute(f"SELECT id, title, company, location FROM jobs WHERE rowid IN ({marks})", batch).fetchall()
+        conn.executemany(_FTS_UPSERT, [_fts_row(*row) for row in rows])
+
+def rebuild_fts(conn: sqlite3.Connection) -> int:
+    """
+    Reconstruit jobs_fts depuis `jobs` (création, ou désynchronisation : les rowid
+    implicites de `jobs` peuvent changer après un VACUUM de la base chaude).
+    """
+    from storage.classifier import prep_text
+    conn.execute("DELETE FROM jobs_fts")
+    rows = conn.execute("SELECT rowid, title, company, location FROM jobs").fetchall()
+    conn.executemany(
+        "INSERT INTO jobs_fts (rowid, title, company, location) VALUES (?, ?, ?, ?)",
+        [(rowid, prep_text(t or ""), prep_text(c or ""), prep_text(l or "")) for rowid, t, c, l in rows],
+    )
+    print(f"🔎 Index plein texte reconstruit ({len(rows)} offres).")
+    return len(rows)
+
+# Agrégats matérialisés pour ui/src/app/api/stats (toutes les offres, ouvertes ou fermées).
+# Des triggers les tiennent à jour ligne à ligne : insertion, purge / archivage, reclassement.
+STATS_TABLES = ("stats_by_source", "stats_daily", "stats_by_category", "stats_by_contract", "stats_by_country")
+
+_STATS_TABLES = [
+    "CREATE TABLE IF NOT EXISTS stats_by_source (source TEXT PRIMARY KEY, count INTEGER NOT NULL, last_posted TEXT)",
+    "CREATE TABLE IF NOT EXISTS stats_daily (day TEXT PRIMARY KEY, count INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS stats_by_category (category TEXT PRIMARY KEY, count INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS stats_by_contract (contract_type TEXT PRIMARY KEY, count INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS stats_by_country (country_code TEXT PRIMARY KEY, country_name TEXT, count INTEGER NOT NULL)",
+]
+
+# (table, clé, expression de la clé pour une ligne `{r}` de jobs, colonnes dont elle dépend) ;
+# NULL → '' (ou 'non-specifie')
+_STATS_KEYS = [
+    ("stats_daily", "day", "date({r}.posted)", ("posted",)),
+    ("stats_by_category", "category", "COALESCE({r}.category, '')", ("category",)),
+    ("stats_by_contract", "contract_type", "COALESCE({r}.contract_type, 'non-specifie')", ("contract_type",)),
+    ("stats_by_country", "country_code", "COALESCE({r}.country_code, '')", ("country_code", "country_name")),
+]
+
+def _source_add(r: str) -> str:
+    return f"""
+        INSERT INTO stats_by_source (source, count, last_posted) VALUES ({r}.source, 1, {r}.posted)
+        ON CONFLICT(source) DO UPDATE SET count = count + 1, last_posted = MAX(COALESCE(last_posted, ''), excluded.last_posted);
+    """
+
+def _source_sub(r: str) -> str:
+    # last_posted n'est recalculé que si la ligne retirée le portait (la purge retire surtout les plus anciennes)
+    return f"""
+        UPDATE stats_by_source
+           SET count = count - 1,
+               last_posted = CASE WHEN {r}.posted >= last_posted
+                                  THEN (SELECT MAX(posted) FROM jobs WHERE source = {r}.source)
+                                  ELSE last_posted END
+         WHERE source = {r}.source;
+        DELETE FROM stats_by_source WHERE source = {r}.source AND count <= 0;
+    """
+
+def _key_add(table: str, key: str, expr: str, r: str) -> str:
+    expr = expr.format(r=r)
+    sql = f"""
+        INSERT INTO {table} ({key}, count) SELECT {expr}, 1 WHERE {expr} IS NOT NULL
+        ON CONFLICT({key}) DO UPDATE SET count = count + 1;
+        """
+    if table == "stats_by_country":
+        sql += f"UPDATE stats_by_country SET country_name = {r}.country_name WHERE country_code = {expr} AND {r}.country_name IS NOT NULL;"
+    return sql
+
+def _key_sub(table: str, key: str, expr: str, r: str) -> str:
+    expr = expr.format(r=r)
+    return f"""
+        UPDATE {table} SET count = count - 1 WHERE {key} = {expr};
+        DELETE FROM {table} WHERE {key} = {expr} AND count <= 0;
+        """
+
+def _stats_add(r: str) -> str:
+    return _source_add(r) + "".join(_key_add(table, key, expr, r) for table, key, expr, _ in _STATS_KEYS)
+
+def _stats_sub(r: str) -> str:
+    return _source_sub(r) + "".join(_key_sub(table, key, expr, r) for table, key, expr, _ in _STATS_KEYS)
+
+def _changed(columns: tuple[str, ...]) -> str:
+    return " OR ".join(f"old.{c} IS NOT new.{c}" for c in columns)
+
+# Mise à jour : un trigger par agrégat, déclenché seulement si ses colonnes changent vraiment
+# (un reclassement ne touche ni stats_by_source ni son recalcul de last_posted).
+# Créés "IF NOT EXISTS" : changer un corps impose une migration qui les recrée (voir m009).
+_STATS_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS jobs_stats_insert AFTER INSERT ON jobs BEGIN {_stats_add('new')} END",
+    f"CREATE TRIGGER IF NOT EXISTS jobs_stats_delete AFTER DELETE ON jobs BEGIN {_stats_sub('old')} END",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_stats_source_update AFTER UPDATE OF source, posted ON jobs
+        WHEN {_changed(("source", "posted"))}
+        BEGIN {_source_sub('old')} {_source_add('new')} END""",
+    *[
+        f"""CREATE TRIGGER IF NOT EXISTS jobs_{table}_update AFTER UPDATE OF {", ".join(columns)} ON jobs
+        WHEN {_changed(columns)}
+        BEGIN {_key_sub(table, key, expr, 'old')} {_key_add(table, key, expr, 'new')} END"""
+        for table, key, expr, columns in _STATS_KEYS
+    ],
+]
+
+def rebuild_stats(conn: sqlite3.Connection) -> None:
+    """Recalcule tous les agrégats depuis `jobs` (création des tables, ou dérive constatée)."""
+    for table in STATS_TABLES:
+        conn.execute(f"DELETE FROM {table}")
+    conn.execute("INSERT INTO stats_by_source (source, count, last_posted) SELECT source, COUNT(*), MAX(posted) FROM jobs GROUP BY source")
+    for table, key, expr, _ in _STATS_KEYS:
+        expr = expr.format(r="jobs")
+        conn.execute(f"INSERT INTO {table} ({key}, count) SELECT {expr}, COUNT(*) FROM jobs WHERE {expr} IS NOT NULL GROUP BY 1")
+    conn.execute("""
+        UPDATE stats_by_country
+           SET country_name = (SELECT MAX(country_name) FROM jobs WHERE COALESCE(jobs.country_code, '') = stats_by_country.country_code)
+    """)
+    print("📊 Agrégats statistiques recalculés.")
+
+# Colonnes publiées (réplique UI, journal d'export) : une modification de l'une d'elles
+# est journalisée dans job_changes ; last_seen / seen_count ne le sont pas.
+PUBLIC_COLUMNS = (
+    "id", "title", "company", "location", "link", "posted", "source", "keyword",
+    "category", "contract_type", "country_code", "country_name", "closed_at",
+)
+
+_CHANGES_SCHEMA = "CREATE TABLE IF NOT EXISTS job_changes (seq INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT NOT NULL)"
+
+_CHANGES_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS jobs_log_insert AFTER INSERT ON jobs BEGIN INSERT INTO job_changes (job_id) VALUES (new.id); END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_log_delete AFTER DELETE ON jobs BEGIN INSERT INTO job_changes (job_id) VALUES (old.id); END",
+    # _TOUCH_JOBS réécrit closed_at à chaque passage : seules les vraies différences comptent
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_log_update AFTER UPDATE ON jobs
+        WHEN {" OR ".join(f"old.{c} IS NOT new.{c}" for c in PUBLIC_COLUMNS)}
+        BEGIN INSERT INTO job_changes (job_id) VALUES (new.id); END""",
+]
+
+def ensure_derived_tables(conn: sqlite3.Connection) -> None:
+    """
+    Crée les tables dérivées de `jobs` et leurs triggers (jobs_fts, stats_*, job_changes),
+    et reconstruit l'index ou les agrégats s'ils ne correspondent plus à la table.
+    """
+    total = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+    conn.execute(_FTS_SCHEMA)
+    conn.execute(_FTS_DELETE_TRIGGER)
+    if total != conn.execute("SELECT COUNT(*) FROM jobs_fts").fetchone()[0]:
+        rebuild_fts(conn)
+    for sql in _STATS_TABLES + _STATS_TRIGGERS:
+        conn.execute(sql)
+    if total != conn.execute("SELECT COALESCE(SUM(count), 0) FROM stats_by_source").fetchone()[0]:
+        rebuild_stats(conn)
+    for sql in [_CHANGES_SCHEMA] + _CHANGES_TRIGGERS:
+        conn.execute(sql)
 
 def is_new(job_id: str) -> bool:
     with _get_connection() as conn:
@@ -77,87 +297,327 @@ def is_new_by_link(job_link: str) -> bool:
         cursor.execute("SELECT 1 FROM jobs WHERE link = ?", (job_link,))
         return cursor.fetchone() is None
 
-def delete_old_jobs(db_path=None, days=60):
-    path = db_path or str(DB_FILE)
-    conn = sqlite3.connect(path)
-    cursor = conn.cursor()
-    limit_date = (datetime.utcnow() - timedelta(days=days)).isoformat()
-    cursor.execute("DELETE FROM jobs WHERE posted < ?", (limit_date,))
-    deleted = cursor.rowcount
-    conn.commit()
-    conn.close()
-    print(f"🧹 {deleted} offre(s) supprimée(s) (plus de {days} jours).")
+@dataclass
+class SeenJobs:
+    """
+    IDs et liens déjà en base, chargés une fois en début de run : dédup en O(1) à l'écriture
+    et court-circuit de l'enrichissement des offres connues côté fetchers.
+    Tenu à jour par `save_jobs` au fil des insertions.
+    """
+    ids: set[str] = field(default_factory=set)
+    links: set[str] = field(default_factory=set)
+
+    def is_known(self, job_id: str | None = None, link: str | None = None) -> bool:
+        return (job_id is not None and job_id in self.ids) or (link is not None and link in self.links)
+
+    def add(self, job_id: str, link: str) -> None:
+        self.ids.add(job_id)
+        self.links.add(link)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+def load_seen_jobs() -> SeenJobs:
+    seen = SeenJobs()
+    if not DB_FILE.exists():
+        return seen
+    try:
+        with _get_connection() as conn:
+            for job_id, link in conn.execute("SELECT id, link FROM jobs"):
+                seen.add(job_id, link)
+    except sqlite3.OperationalError:
+        pass
+    return seen
+
+_SEEN: Optional[SeenJobs] = None
+
+def seen_jobs() -> SeenJobs:
+    """
+    Seen-set du process, chargé au premier appel. Le collector l'initialise avant
+    de lancer ses workers, qui en héritent par fork sans relire la base.
+    """
+    global _SEEN
+    if _SEEN is None:
+        _SEEN = load_seen_jobs()
+    return _SEEN
+
+# ------- Crawl incrémental : high-water marks par source -------
+
+# Nombre d'IDs bruts conservés par source (les plus récents de la liste)
+CRAWL_STATE_MAX_IDS = 500
+
+def get_crawl_state(source_key: str) -> Optional[dict]:
+    """
+    Retourne {"newest_posted": datetime|None, "last_ids": list[str], "last_success": datetime}
+    ou None si la source n'a jamais été crawlée avec succès.
+    """
+    try:
+        with _get_connection() as conn:
+            row = conn.execute(
+                "SELECT newest_posted, last_ids, last_success FROM crawl_state WHERE source_key = ?",
+                (source_key,),
+            ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    if not row or not row[2]:
+        return None
+    newest_posted, last_ids, last_success = row
+    return {
+        "newest_posted": datetime.fromisoformat(newest_posted) if newest_posted else None,
+        "last_ids": json.loads(last_ids or "[]"),
+        "last_success": datetime.fromisoformat(last_success),
+    }
+
+def save_crawl_state(source_key: str, *, newest_posted: Optional[datetime], ids: list[str]) -> None:
+    """
+    Enregistre un crawl réussi : les IDs listés (ordre de la source, plus récents d'abord)
+    passent devant les précédents, et le watermark de date ne recule jamais.
+    """
+    previous = get_crawl_state(source_key)
+    if previous:
+        if previous["newest_posted"] and (newest_posted is None or previous["newest_posted"] > newest_posted):
+            newest_posted = previous["newest_posted"]
+        ids = ids + previous["last_ids"]
+    ids = list(dict.fromkeys(ids))[:CRAWL_STATE_MAX_IDS]
+
+    with _get_connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO crawl_state (source_key, newest_posted, last_ids, last_success)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(source_key) DO UPDATE SET
+                newest_posted = excluded.newest_posted,
+                last_ids = excluded.last_ids,
+                last_success = excluded.last_success
+            """,
+            (
+                source_key,
+                newest_posted.isoformat() if newest_posted else None,
+                json.dumps(ids),
+                datetime.now(timezone.utc).isoformat(),
+            ),
+        )
+        conn.commit()
+
+# ------- Durées des tâches (ordonnancement du collector) -------
+
+# Poids de la dernière mesure dans la moyenne glissante
+TASK_STATS_ALPHA = 0.5
+
+def get_task_durations() -> dict[str, float]:
+    """Durée moyenne (secondes) par clé de tâche, {} si aucune mesure."""
+    try:
+        with _get_connection() as conn:
+            return dict(conn.execute("SELECT task_key, avg_seconds FROM task_stats"))
+    except sqlite3.OperationalError:
+        return {}
+
+def save_task_durations(durations: dict[str, float]) -> None:
+    """Intègre les durées d'un run dans la moyenne glissante de chaque tâche."""
+    if not durations:
+        return
+    now = datetime.now(timezone.utc).isoformat()
+    with _get_connection() as conn:
+        conn.executemany(
+            """
+            INSERT INTO task_stats (task_key, avg_seconds, last_seconds, runs, last_run)
+            VALUES (?, ?, ?, 1, ?)
+            ON CONFLICT(task_key) DO UPDATE SET
+                avg_seconds = ? * excluded.last_seconds + (1 - ?) * task_stats.avg_seconds,
+                last_seconds = excluded.last_seconds,
+                runs = task_stats.runs + 1,
+                last_run = excluded.last_run
+            """,
+            [(key, sec, sec, now, TASK_STATS_ALPHA, TASK_STATS_ALPHA) for key, sec in durations.items()],
+        )
+        conn.commit()
+
+def mark_closed(source: str, *, seen_before: datetime, since: Optional[datetime] = None) -> int:
+    """
+    Après un crawl exhaustif de `source` : ferme les offres ouvertes qu'il n'a pas revues
+    (last_seen antérieur au début du run), limitées à la fenêtre de publication couverte.
+    """
+    sql = "UPDATE jobs SET closed_at = ? WHERE source = ? AND closed_at IS NULL AND last_seen < ?"
+    params: list = [datetime.now(timezone.utc).isoformat(), source, seen_before.isoformat()]
+    if since is not None:
+        # (source, posted_ts) : idx_jobs_source_posted
+        sql += " AND posted_ts >= ?"
+        params.append(int(since.timestamp()))
+    with _get_connection() as conn:
+        return conn.execute(sql, params).rowcount
+
+# Conservation des offres fermées avant purge (jours)
+CLOSED_RETENTION_DAYS = int(os.getenv("CLOSED_RETENTION_DAYS", "14"))
+
+_PURGE_WHERE = """
+     WHERE COALESCE(last_seen, posted) < ?
+        OR (closed_at IS NOT NULL AND closed_at < ?)
+"""
+
+def _ensure_archive_table(conn: sqlite3.Connection) -> list[str]:
+    """
+    Table `cold.jobs` calquée sur `jobs` (+ archived_at), complétée des colonnes
+    ajoutées depuis sa création. Retourne les colonnes de `jobs` à recopier.
+    """
+    # table_info omet les colonnes générées (posted_ts) : recalculables, non archivées
+    cols = [r[1] for r in conn.execute("PRAGMA main.table_info(jobs)")]
+    conn.execute(f"CREATE TABLE IF NOT EXISTS cold.jobs AS SELECT {', '.join(cols)} FROM main.jobs WHERE 0")
+    archived = {r[1] for r in conn.execute("PRAGMA cold.table_info(jobs)")}
+    for col in cols + ["archived_at"]:
+        if col not in archived:
+            conn.execute(f"ALTER TABLE cold.jobs ADD COLUMN {col}")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS cold.idx_archive_id ON jobs(id)")
+    return cols
+
+def _purge(conn: sqlite3.Connection, params: tuple, archive: Optional[str]) -> int:
+    """Recopie les offres à purger dans l'archive froide puis les supprime, en une transaction."""
+    if not archive:
+        with conn:
+            return conn.execute(f"DELETE FROM jobs {_PURGE_WHERE}", params).rowcount
+    # ATTACH est interdit dans une transaction : avant le `with conn`
+    conn.execute("ATTACH DATABASE ? AS cold", (archive,))
+    try:
+        with conn:
+            cols = ", ".join(_ensure_archive_table(conn))
+            archived = conn.execute(
+                f"INSERT OR REPLACE INTO cold.jobs ({cols}, archived_at) SELECT {cols}, ? FROM main.jobs {_PURGE_WHERE}",
+                (datetime.now(timezone.utc).isoformat(), *params),
+            ).rowcount
+            deleted = conn.execute(f"DELETE FROM main.jobs {_PURGE_WHERE}", params).rowcount
+        if archived:
+            print(f"🧊 {archived} offre(s) archivée(s) dans {archive}.")
+        return deleted
+    finally:
+        conn.execute("DETACH DATABASE cold")
+
+def delete_old_jobs(db_path=None, days=60, archive_path=ARCHIVE_FILE):
+    """
+    Purge par cycle de vie plutôt que par date de publication (souvent factice) :
+    offres plus revues depuis `days` jours, ou fermées depuis CLOSED_RETENTION_DAYS.
+    Les lignes purgées partent dans l'archive froide `archive_path` : la base chaude
+    (et la réplique exportée pour l'UI) ne garde que les offres récentes.
+    """
+    now = datetime.now(timezone.utc)
+    params = ((now - timedelta(days=days)).isoformat(), (now - timedelta(days=CLOSED_RETENTION_DAYS)).isoformat())
+    archive = str(archive_path) if archive_path else None
+    if db_path:
+        conn = sqlite3.connect(db_path)
+        try:
+            deleted = _purge(conn, params, archive)
+        finally:
+            conn.close()
+    else:
+        global _SEEN
+        repo = get_repo()
+        with repo.lock:
+            deleted = _purge(repo.conn, params, archive)
+        # Les offres purgées redeviennent "nouvelles" : seen-set rechargé au prochain usage
+        if deleted:
+            _SEEN = None
+    print(f"🧹 {deleted} offre(s) supprimée(s) (non revues depuis {days} jours ou fermées depuis {CLOSED_RETENTION_DAYS}).")
 
 def _enrich_country_fields(location: Optional[str]):
     """
     Retourne (country_code, country_name) à partir de location via le classifier.
     """
+    from storage.classifier import normalize_country_from_location
     info = normalize_country_from_location(location or "")
     if not info:
         return None, None
     return info["code"], info["name"]
 
-def save_job(job: JobPosting):
-    with _get_connection() as conn:
-        cursor = conn.cursor()
-        posted_date_iso = (job.posted or datetime.now(timezone.utc)).isoformat()
+_INSERT_JOB = """
+    INSERT INTO jobs (
+        id, title, company, location, link, posted, source, keyword,
+        category, contract_type, country_code, country_name,
+        first_seen, last_seen
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT DO NOTHING
+    RETURNING id
+"""
 
-        # Enrichissement pays à l'insertion
-        cc, cn = _enrich_country_fields(job.location)
+# Offres déjà connues revues par un crawl : rafraîchies et rouvertes si elles avaient été fermées.
+# Un seul UPDATE pour tout le lot : une ligne retrouvée plusieurs fois (même offre sous deux
+# mots-clés, nouvel ID sur un lien connu) n'est comptée qu'une fois ; `last_seen IS NOT ?`
+# exclut les lignes insérées par ce même lot.
+_TOUCH_JOBS = """
+    UPDATE jobs
+       SET last_seen = ?1, seen_count = seen_count + 1, closed_at = NULL
+     WHERE last_seen IS NOT ?1
+       AND (id IN (SELECT value FROM json_each(?2)) OR link IN (SELECT value FROM json_each(?3)))
+"""
 
-        cursor.execute(
-            """
-            INSERT INTO jobs (
-                id, title, company, location, link, posted, source, keyword,
-                category, contract_type, country_code, country_name
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                job.id, job.title, job.company, job.location, job.link,
-                posted_date_iso, job.source, job.keyword,
-                job.category, job.contract_type, cc, cn
+def _job_row(job: JobPosting, seen_at: str) -> tuple:
+    posted_date_iso = (job.posted or datetime.now(timezone.utc)).isoformat()
+    # Enrichissement pays à l'insertion
+    cc, cn = _enrich_country_fields(job.location)
+    return (
+        job.id, job.title, job.company, job.location, job.link,
+        posted_date_iso, job.source, job.keyword,
+        job.category, job.contract_type, cc, cn,
+        seen_at, seen_at
+    )
+
+def save_jobs(jobs: list[JobPosting]) -> list[JobPosting]:
+    """
+    Upsert d'un lot en une seule transaction (executemany) : les nouvelles offres sont
+    insérées (first_seen = last_seen = maintenant), les offres connues voient leur
+    last_seen / seen_count rafraîchis (une fois par lot) et leur closed_at effacé.
+    La dédup (id ou lien, y compris à l'intérieur du lot) se fait sur le seen-set en
+    mémoire, sans requête par offre ; ON CONFLICT DO NOTHING reste le filet de sécurité.
+    Le seen-set ne reçoit les offres insérées qu'une fois la transaction validée.
+    Retourne les offres réellement insérées, dans l'ordre du lot.
+    """
+    seen = seen_jobs()
+    batch = SeenJobs()
+    fresh: list[JobPosting] = []
+    known: list[JobPosting] = []
+    for job in jobs:
+        if seen.is_known(job.id, job.link) or batch.is_known(job.id, job.link):
+            known.append(job)
+            continue
+        batch.add(job.id, job.link)
+        fresh.append(job)
+    if not jobs:
+        return []
+
+    now = datetime.now(timezone.utc).isoformat()
+    with _get_connection() as conn:
+        # RETURNING : une ligne ignorée par ON CONFLICT (écriture concurrente) ne revient pas
+        inserted = [job for job in fresh if conn.execute(_INSERT_JOB, _job_row(job, now)).fetchone()]
+        # Lignes ignorées exclues : l'upsert réécrirait l'entrée de l'offre déjà en base
+        conn.executemany(_FTS_UPSERT, [_fts_row(job.id, job.title, job.company, job.location) for job in inserted])
+        # Quasi-doublons (autre source, autre mot-clé…) : marqués pour ne notifier qu'une fois
+        for job in inserted:
+            job.duplicate_of = near_dup.index_job(
+                conn, job_id=job.id, title=job.title, company=job.company, location=job.location,
+                posted_ts=int((job.posted or datetime.now(timezone.utc)).timestamp()),
             )
-        )
-        conn.commit()
+        if known:
+            conn.execute(_TOUCH_JOBS, (now, json.dumps([job.id for job in known]), json.dumps([job.link for job in known])))
+    # Après le commit seulement : un lot annulé ne doit pas passer pour déjà enregistré
+    for job in inserted:
+        seen.add(job.id, job.link)
+    if len(inserted) != len(fresh):
+        print(f"⚠️ {len(fresh) - len(inserted)} offre(s) déjà en base malgré le seen-set (écriture concurrente ?).")
+    return inserted
+
+def save_job(job: JobPosting):
+    save_jobs([job])
 
 # ------- Optionnel : backfill sur l'historique (sans fichier séparé) -------
 
 def backfill_countries(*, append_country_to_location: bool = False) -> int:
     """
-    Parcourt les jobs dont country_code est NULL/'' et remplit country_code/country_name
-    à partir de 'location'. Si append_country_to_location=True, ajoute le nom canonique
-    du pays entre parenthèses dans 'location' quand pertinent.
+    Remplit country_code/country_name des jobs où ils sont NULL/'' à partir de 'location'.
+    Si append_country_to_location=True, ajoute aussi le nom canonique du pays entre
+    parenthèses dans 'location' quand pertinent.
+    Délègue au retraitement par tranches de storage/reprocess.py.
 
     Retourne le nombre de lignes mises à jour.
     """
-    with _get_connection() as conn:
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT id, location FROM jobs
-            WHERE country_code IS NULL OR country_code = ''
-        """)
-        rows = cur.fetchall()
-
-        updated = 0
-        for job_id, location in rows:
-            cc, cn = _enrich_country_fields(location)
-            if not cc:
-                continue
-
-            cur.execute("""
-                UPDATE jobs
-                   SET country_code = ?, country_name = ?
-                 WHERE id = ?
-            """, (cc, cn, job_id))
-
-            if append_country_to_location:
-                new_loc = maybe_append_country(location or "")
-                if new_loc and new_loc != (location or ""):
-                    cur.execute("UPDATE jobs SET location = ? WHERE id = ?", (new_loc, job_id))
-
-            updated += 1
-
-        conn.commit()
-        print(f"🔁 Backfill pays terminé — {updated} ligne(s) enrichie(s).")
-        return updated
+    from storage.reprocess import reprocess
+    updated = reprocess("country+location" if append_country_to_location else "country", only_missing=True)
+    print(f"🔁 Backfill pays terminé — {updated} ligne(s) enrichie(s).")
+    return updated
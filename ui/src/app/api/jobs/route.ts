@@ -48,7 +48,7 @@ const COL_MAP: Record<string, string> = {
   title: "title",
   company: "company",
   location: "location",
-  posted: "posted",
+  posted: "posted_ts",
   source: "source",
   category: "category",
   contract_type: "contract_type",
@@ -75,6 +75,23 @@ function norm(s: string) {
     .toLowerCase();
 }
 
+/**
+ * Requête FTS5 pour jobs_fts : texte replié comme à l'export (accents, casse),
+ * un terme préfixe par mot, tous requis. null si rien d'indexable.
+ */
+function ftsQuery(raw: string, column?: string): string | null {
+  const terms = raw
+    .normalize("NFD")
+    .replace(/\p{Diacritic}/gu, "")
+    .toLowerCase()
+    .split(/[^\p{L}\p{N}]+/u)
+    .filter(Boolean)
+    .map((t) => `"${t}"*`);
+  if (!terms.length) return null;
+  const expr = terms.join(" ");
+  return column ? `${column} : (${expr})` : expr;
+}
+
 /** Re-formate un libellé en “DB style” (espace EN DASH espace) si c’est un couple. */
 function toDbDash(s: string) {
   return s.replace(/\s*[–—-]\s*/g, " — ");
@@ -113,6 +130,7 @@ export async function GET(request: NextRequest) {
     // ---------- Filtres ----------
     const banks = sp.getAll("bank");                 // ex: ["BARCLAYS", "DB"]
     const keyword = sp.get("keyword") || "";         // texte titre
+    const q = sp.get("q") || "";                     // texte titre + entreprise + lieu
     const hours = sp.get("hours");                   // fenêtre de fraîcheur (heures)
     const categoriesRaw = sp.getAll("category");     // ex: ["Markets — Sales", "Markets"]
     const contractTypes = sp.getAll("contractType"); // ex: ["cdi","stage"]
@@ -124,6 +142,8 @@ export async function GET(request: NextRequest) {
     const countries = sp.getAll("country").map((c) => c.trim().toUpperCase()).filter(Boolean);
     const continents = sp.getAll("continent").map((c) => c.trim().toLowerCase()).filter(Boolean);
     const hasCountryParam = sp.get("hasCountry");
+    // ?includeClosed=true : inclut les offres fermées (absentes du dernier crawl complet)
+    const includeClosed = sp.get("includeClosed") === "true";
 
     // ---------- Pagination & tri ----------
     const limit = clampInt(sp.get("limit"), 20, 1, 200);
@@ -132,29 +152,42 @@ export async function GET(request: NextRequest) {
     const sortByRaw = (sp.get("sortBy") || "posted").toLowerCase();
     const sortDirRaw = (sp.get("sortDir") || (sortByRaw === "posted" ? "desc" : "asc")).toLowerCase();
 
-    const sortCol = COL_MAP[sortByRaw] ?? "posted";
+    const sortCol = COL_MAP[sortByRaw] ?? "posted_ts";
     const sortDir = sortDirRaw === "asc" ? "ASC" : "DESC";
 
     // ---------- WHERE ----------
     const where: string[] = [];
     const whereParams: (string | number)[] = [];
 
+    // Offres ouvertes par défaut (index partiel idx_jobs_open_posted)
+    if (!includeClosed) {
+      where.push(`closed_at IS NULL`);
+    }
+
     if (banks.length > 0) {
       const placeholders = banks.map(() => "?").join(", ");
       where.push(`source IN (${placeholders})`);
       whereParams.push(...banks.map((b) => b.toUpperCase()));
     }
 
-    if (keyword.trim()) {
-      where.push(`LOWER(title) LIKE LOWER(?)`);
-      whereParams.push(`%${keyword}%`);
+    // Mots-clés via l'index plein texte jobs_fts (rowid aligné sur jobs), plus de LIKE '%…%'
+    const keywordMatch = ftsQuery(keyword, "title");
+    if (keywordMatch) {
+      where.push(`rowid IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)`);
+      whereParams.push(keywordMatch);
+    }
+
+    const qMatch = ftsQuery(q);
+    if (qMatch) {
+      where.push(`rowid IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)`);
+      whereParams.push(qMatch);
     }
 
     if (hours && !isNaN(Number(hours))) {
       const dateLimit = new Date();
       dateLimit.setHours(dateLimit.getHours() - parseInt(hours, 10));
-      where.push(`posted >= ?`);
-      whereParams.push(dateLimit.toISOString());
+      where.push(`posted_ts >= ?`);
+      whereParams.push(Math.floor(dateLimit.getTime() / 1000));
     }
 
     if (categoriesRaw.length > 0) {
@@ -212,11 +245,11 @@ export async function GET(request: NextRequest) {
         : `${sortCol} ${sortDir}`;
 
     // Fallback stable
-    const fallback = sortCol === "posted" ? `, id DESC` : `, posted DESC`;
+    const fallback = sortCol === "posted_ts" ? `, id DESC` : `, posted_ts DESC`;
 
     // Total
     const countSql = selectSql.replace(
-      /^SELECT.+FROM jobs/i,
+      /^SELECT.+?FROM jobs/i,
       "SELECT COUNT(*) AS total FROM jobs"
     );
     const totalRow = db.prepare(countSql).get(whereParams) as { total: number };
@@ -13,54 +13,7 @@ const WEEKDAYS_FR = ["Dim", "Lun", "Mar", "Mer", "Jeu", "Ven", "Sam"];
 type HistoryRow = { day: string; count: number };
 type WeekdayRow = { dow: string; count: number };
 
-function bucketContractType(raw: string | null | undefined): string {
-  if (!raw) return "Autres";
-
-  const t = raw.toLowerCase();
-
-  // Canonique de ta normalize_contract_type
-  if (t === "cdi") return "CDI";
-  if (t === "cdd") return "CDD";
-  if (t === "stage") return "Stage";
-  if (t === "alternance") return "Alternance";
-  if (t === "freelance") return "Freelance";
-  if (t === "vie") return "VIE";
-  if (t === "non-specifie") return "Non spécifié";
-
-  if (t.includes("permanent") || t.includes("full time") || t.includes("full-time"))
-    return "CDI";
-
-  if (
-    t.includes("temporary") ||
-    t.includes("fixed term") ||
-    t.includes("interim") ||
-    t.includes("fixed-term")
-  )
-    return "CDD";
-
-  if (
-    t.includes("intern") ||
-    t.includes("stage") ||
-    t.includes("stagiaire") ||
-    t.includes("trainee")
-  )
-    return "Stage";
-
-  if (
-    t.includes("apprenti") ||
-    t.includes("alternance") ||
-    t.includes("apprenticeship") ||
-    t.includes("work study")
-  )
-    return "Alternance";
-
-  if (t.includes("vie")) return "VIE";
-
-  if (t.includes("freelance") || t.includes("independant") || t.includes("contractor"))
-    return "Freelance";
-
-  return "Autres";
-}
+// Agrégats précalculés par le collector (stats_* dans la réplique, cf. storage/export.py)
 
 export async function GET() {
   // NOTE: type un peu sale mais identique à ce que tu avais
@@ -71,19 +24,16 @@ export async function GET() {
 
     // 1) Top sources
     const topBanksStmt = db.prepare(`
-      SELECT source AS bank, COUNT(*) AS count
-      FROM jobs
-      GROUP BY source
+      SELECT source AS bank, count
+      FROM stats_by_source
       ORDER BY count DESC
     `);
     const topBanksRows = topBanksStmt.all() as { bank: string; count: number }[];
 
     // 2) Historique offres / jour
     const historyStmt = db.prepare(`
-      SELECT date(posted) AS day, COUNT(*) AS count
-      FROM jobs
-      WHERE posted IS NOT NULL AND posted != ''
-      GROUP BY date(posted)
+      SELECT day, count
+      FROM stats_daily
       ORDER BY day ASC
     `);
     const historyRows = historyStmt.all() as HistoryRow[];
@@ -91,10 +41,9 @@ export async function GET() {
     // 3) Dernière activité par source
     const healthStmt = db.prepare(`
       SELECT source AS bank,
-             MAX(posted) AS last_seen,
-             COUNT(*) AS total
-      FROM jobs
-      GROUP BY source
+             last_posted AS last_seen,
+             count AS total
+      FROM stats_by_source
       ORDER BY last_seen DESC
     `);
     const healthRows = healthStmt.all() as {
@@ -105,30 +54,27 @@ export async function GET() {
 
     // 4) Total
     const totalStmt = db.prepare(`
-      SELECT COUNT(*) AS total
-      FROM jobs
+      SELECT COALESCE(SUM(count), 0) AS total
+      FROM stats_by_source
     `);
     const totalRow = totalStmt.get() as { total: number } | undefined;
 
-    // 5) Types de contrat (raw)
+    // 5) Types de contrat, déjà regroupés en libellés côté Python
     const contractStmt = db.prepare(`
-      SELECT COALESCE(contract_type, 'non-specifie') AS contract_type,
-             COUNT(*) AS count
-      FROM jobs
-      GROUP BY contract_type
+      SELECT label, count
+      FROM stats_by_contract_group
       ORDER BY count DESC
     `);
     const contractRows = contractStmt.all() as {
-      contract_type: string;
+      label: string;
       count: number;
     }[];
 
     // 6) Volume par jour de la semaine
     const weekdayStmt = db.prepare(`
-      SELECT strftime('%w', posted) AS dow, COUNT(*) AS count
-      FROM jobs
-      WHERE posted IS NOT NULL AND posted != ''
-      GROUP BY strftime('%w', posted)
+      SELECT strftime('%w', day) AS dow, SUM(count) AS count
+      FROM stats_daily
+      GROUP BY dow
       ORDER BY dow ASC
     `);
     const weekdayRows = weekdayStmt.all() as WeekdayRow[];
@@ -165,17 +111,11 @@ export async function GET() {
       bestDayDate = best.day;
     }
 
-    // ======= Agrégation contrats (pour donut) =======
-    const contractBuckets: Record<string, number> = {};
-
-    contractRows.forEach((row) => {
-      const bucket = bucketContractType(row.contract_type);
-      contractBuckets[bucket] = (contractBuckets[bucket] || 0) + Number(row.count || 0);
-    });
-
-    const contractGroups = Object.entries(contractBuckets)
-      .map(([label, value]) => ({ label, value }))
-      .sort((a, b) => b.value - a.value);
+    // ======= Contrats (pour donut) =======
+    const contractGroups = contractRows.map((r) => ({
+      label: r.label,
+      value: Number(r.count || 0),
+    }));
 
     const totalContracts = contractGroups.reduce((acc, c) => acc + c.value, 0) || 1;
 
@@ -41,11 +41,17 @@ export function getJobs(searchParams?: { [key: string]: string | string[] | unde
     const contractTypes = queryParams.getAll("contractType");
     const limit = parseInt(queryParams.get("limit") || "25", 10);
     const offset = parseInt(queryParams.get("offset") || "0", 10);
+    // Comme /api/jobs : offres fermées exclues sauf ?includeClosed=true
+    const includeClosed = queryParams.get("includeClosed") === "true";
     
     let query = `SELECT * FROM jobs`;
     const conditions: string[] = [];
     const params: (string | number)[] = [];
 
+    // Offres ouvertes par défaut (index partiel idx_jobs_open_posted)
+    if (!includeClosed) {
+      conditions.push("closed_at IS NULL");
+    }
     if (banks.length > 0) {
       conditions.push(`source IN (${banks.map(() => "?").join(", ")})`);
       params.push(...banks.map(b => b.toUpperCase()));
@@ -67,7 +73,7 @@ export function getJobs(searchParams?: { [key: string]: string | string[] | unde
       query += " WHERE " + conditions.join(" AND ");
     }
 
-    query += " ORDER BY posted DESC LIMIT ? OFFSET ?";
+    query += " ORDER BY posted_ts DESC LIMIT ? OFFSET ?";
     params.push(limit, offset);
 
     const stmt = db.prepare(query);